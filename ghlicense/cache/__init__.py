@@ -0,0 +1,10 @@
+"""Persistent scan cache module."""
+from ghlicense.cache.scan_cache import ScanCache, DEFAULT_CACHE_PATH, DEFAULT_CACHE_TTL
+from ghlicense.cache.validators import ValidatorCache
+
+__all__ = [
+    "ScanCache",
+    "ValidatorCache",
+    "DEFAULT_CACHE_PATH",
+    "DEFAULT_CACHE_TTL",
+]
@@ -0,0 +1,137 @@
+"""On-disk cache of per-repo scan results."""
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.expanduser("~/.gh-license/scan-cache.sqlite3")
+# Cached results older than this are rescanned even if the repo did not change
+DEFAULT_CACHE_TTL = 7 * 24 * 3600
+# Seconds a connection waits for another connection's write to finish
+BUSY_TIMEOUT = 30
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a cache database shared by several connections and processes.
+
+    The database runs in WAL mode and every statement commits on its own,
+    so no connection holds a write lock between two writes; a writer waits
+    up to BUSY_TIMEOUT seconds for another one to finish. With WAL, a
+    commit does not fsync, which keeps a write per repo cheap.
+    """
+    db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class ScanCache:
+    """SQLite cache of scan results keyed by repo, revision and strategy.
+
+    A repo's revision is its default-branch head commit SHA or its last push
+    time; as long as it is unchanged and the entry is younger than the TTL,
+    the stored result is reused instead of scanning the repo again. The
+    detection strategies look for different files, so a result is only
+    reused by a scan with the strategy that produced it.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_CACHE_TTL) -> None:
+        """ScanCache class constructor
+
+        Keyword arguments:
+        path -- Path of the SQLite database (default ~/.gh-license/scan-cache.sqlite3).
+        ttl -- Maximum age in seconds of a reusable entry, 0 for no limit (default 7 days).
+        """
+        if os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self.path: str = path
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self._db = connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scan_results ("
+            " namespace TEXT NOT NULL,"
+            " full_name TEXT NOT NULL,"
+            " revision TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " scanned_at REAL NOT NULL,"
+            " strategy TEXT NOT NULL DEFAULT '',"
+            " PRIMARY KEY (namespace, full_name))"
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(scan_results)")]
+        if "strategy" not in columns:
+            # Entries of older versions have no strategy and are never reused
+            try:
+                self._db.execute("ALTER TABLE scan_results ADD COLUMN strategy TEXT NOT NULL DEFAULT ''")
+            except sqlite3.OperationalError:
+                # Another process added it first
+                pass
+
+    def get(self, namespace: str, full_name: str, revision: Optional[str],
+            strategy: str = "probe") -> Optional[Any]:
+        """Return the cached result for a repo, or None on a miss.
+
+        Keyword arguments:
+        namespace -- The provider the repo belongs to.
+        full_name -- The name of the repo.
+        revision -- The repo's current head SHA or push time (None never hits).
+        strategy -- The detection strategy of the scan (default "probe").
+        """
+        row = None
+        if revision is not None:
+            row = self._db.execute(
+                "SELECT result, scanned_at FROM scan_results"
+                " WHERE namespace = ? AND full_name = ? AND revision = ? AND strategy = ?",
+                (namespace, full_name, revision, strategy),
+            ).fetchone()
+        if row is None or (self.ttl and time.time() - row[1] > self.ttl):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, namespace: str, full_name: str, revision: Optional[str], result: Any,
+            strategy: str = "probe") -> None:
+        """Store the result of scanning a repo at a revision with a strategy.
+
+        Results for repos without a revision are not cached.
+        """
+        if revision is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO scan_results"
+            " (namespace, full_name, revision, result, scanned_at, strategy) VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, full_name, revision, json.dumps(result), time.time(), strategy),
+        )
+
+    def invalidate(self, namespace: Optional[str] = None, owner: Optional[str] = None) -> int:
+        """Drop cached entries and return how many were removed.
+
+        Keyword arguments:
+        namespace -- Only drop entries of this provider (default all).
+        owner -- Only drop repos of this user/organisation (default all).
+        """
+        query = "DELETE FROM scan_results WHERE 1 = 1"
+        params = []
+        if namespace is not None:
+            query += " AND namespace = ?"
+            params.append(namespace)
+        if owner is not None:
+            query += " AND full_name LIKE ?"
+            params.append(owner.replace("%", r"\%").replace("_", r"\_") + "/%")
+            query += " ESCAPE '\\'"
+        return self._db.execute(query, params).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        """Return the entry count and this session's hit/miss counters."""
+        entries = self._db.execute("SELECT COUNT(*) FROM scan_results").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
@@ -0,0 +1,107 @@
+"""On-disk store of HTTP validators for conditional requests."""
+import os
+import json
+import time
+import logging
+import http.client
+from typing import Mapping, Optional, Tuple
+
+from ghlicense.cache.scan_cache import DEFAULT_CACHE_PATH, connect
+
+logger = logging.getLogger(__name__)
+
+# Response headers kept with a cached response; the listings read their
+# page count from Link and X-Total-Pages
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link", "X-Total-Pages")
+
+
+class ValidatorCache:
+    """SQLite store of ETag / Last-Modified validators and cached responses.
+
+    The pool sends the stored validators as If-None-Match / If-Modified-Since
+    and, on a 304 Not Modified, replays the stored response. On GitHub a 304
+    does not count against the API rate limit.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH) -> None:
+        """ValidatorCache class constructor
+
+        Keyword arguments:
+        path -- Path of the SQLite database (default ~/.gh-license/scan-cache.sqlite3).
+        """
+        if os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self.path: str = path
+        self.revalidated: int = 0
+        self._db = connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS http_validators ("
+            " request TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " status INTEGER NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " stored_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def request_key(method: str, url: str, headers: Optional[Mapping[str, str]] = None) -> str:
+        """Return the key identifying a request (method, URL and byte range)."""
+        key = f"{method} {url}"
+        if headers and "Range" in headers:
+            key += f" {headers['Range']}"
+        return key
+
+    def conditional_headers(self, key: str) -> dict:
+        """Return the If-None-Match / If-Modified-Since headers for a request."""
+        row = self._db.execute(
+            "SELECT etag, last_modified FROM http_validators WHERE request = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return {}
+        headers = {}
+        if row[0]:
+            headers["If-None-Match"] = row[0]
+        if row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def load(self, key: str) -> Optional[Tuple[int, http.client.HTTPMessage, bytes]]:
+        """Return the stored (status, headers, body) of a request, if any."""
+        row = self._db.execute(
+            "SELECT status, headers, body FROM http_validators WHERE request = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        headers = http.client.HTTPMessage()
+        for name, value in json.loads(row[1]).items():
+            headers[name] = value
+        self.revalidated += 1
+        return row[0], headers, row[2]
+
+    def store(self, key: str, status: int, headers: http.client.HTTPMessage, body: bytes) -> None:
+        """Remember a response carrying an ETag or Last-Modified validator."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        kept = {name: headers[name] for name in STORED_HEADERS if headers.get(name)}
+        self._db.execute(
+            "INSERT OR REPLACE INTO http_validators VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, etag, last_modified, status, json.dumps(kept), body, time.time()),
+        )
+
+    def clear(self) -> None:
+        """Drop every stored validator."""
+        self._db.execute("DELETE FROM http_validators")
+
+    def prune(self, max_age: float) -> int:
+        """Drop the validators stored more than max_age seconds ago and return how many were removed."""
+        return self._db.execute(
+            "DELETE FROM http_validators WHERE stored_at < ?", (time.time() - max_age,)
+        ).rowcount
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
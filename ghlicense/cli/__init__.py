@@ -8,7 +8,7 @@ import logging
 import asyncio
 
 from ghlicense.cli.parser import PARSER, parse_args
-from ghlicense.cli.commands import args_scan, args_license, print_license_list
+from ghlicense.cli.commands import args_scan, args_batch_scan, args_license, print_license_list
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,8 @@ def main():
 
     if args.scan:
         asyncio.run(args_scan(args))
+    elif args.batch:
+        asyncio.run(args_batch_scan(args))
     elif args.licenselist:
         print_license_list(licenses_path)
     elif args.license:
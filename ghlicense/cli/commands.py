@@ -3,7 +3,7 @@
 This module re-exports command handlers from functions.py for use in the CLI module.
 """
 
-from ghlicense.scanner import args_scan
+from ghlicense.scanner import args_scan, args_batch_scan
 from ghlicense.functions import args_license, print_license_list
 
-__all__ = ["args_scan", "args_license", "print_license_list"]
\ No newline at end of file
+__all__ = ["args_scan", "args_batch_scan", "args_license", "print_license_list"]
\ No newline at end of file
@@ -30,6 +30,11 @@ ENABLED_PROVIDERS_STR = ", ".join(ENABLED_PROVIDERS)
 ERR_PROVIDERS_TXT = f"(errored providers: {DISABLED_PROVIDERS_STR})"
 
 PARSER.add_argument("--scan", help="Scan repo of the user, arguments: [User_nick]", action="store")
+PARSER.add_argument(
+    "--batch",
+    help="Scan every account listed in a file (or - for stdin), one provider:user per line",
+    action="store",
+)
 PARSER.add_argument("--license", help="Download a license file, arguments: [License_name]", nargs="?", const=True)
 PARSER.add_argument("--licenselist", "--license-list", help="Show licenses available", action="store_true")
 PARSER.add_argument(
@@ -39,7 +44,84 @@ PARSER.add_argument(
     default="github",
 )
 PARSER.add_argument("--show", help="Filter by license status (all/licensed/unlicensed)", action="store", default="all", choices=["all", "licensed", "unlicensed"])
-PARSER.add_argument("--report", help="The report filename for scan (optional)", action="store")
+PARSER.add_argument("--report", help="The report filename for scan, or the summary filename for batch (optional)", action="store")
+PARSER.add_argument("--format", help="Report format (md/json/jsonl/csv), the batch summary stays Markdown", action="store", default="md", choices=["md", "json", "jsonl", "csv"])
+PARSER.add_argument(
+    "--concurrency",
+    help="Repos scanned concurrently, shared by all accounts in batch mode (default 4)",
+    action="store",
+    type=int,
+    default=4,
+)
+PARSER.add_argument(
+    "--concurrency-mode",
+    help="fixed: always --concurrency scans at once; adaptive: grow/shrink the number of\n"
+    "concurrent scans (AIMD) from latency, 429s and the remaining rate limit",
+    action="store",
+    default="fixed",
+    choices=["fixed", "adaptive"],
+)
+PARSER.add_argument("--min-concurrency", help="Smallest adaptive window (default 1)", action="store", type=int, default=1)
+PARSER.add_argument("--max-concurrency", help="Largest adaptive window (default 32)", action="store", type=int, default=32)
+PARSER.add_argument(
+    "--target-latency",
+    help="Slowest response in seconds still considered healthy by the adaptive mode (default 2)",
+    action="store",
+    type=float,
+    default=2.0,
+)
+PARSER.add_argument(
+    "--max-connections",
+    help="Keep-alive connections per host used by the scan (default: the scan concurrency, at least 4)",
+    action="store",
+    type=int,
+)
+PARSER.add_argument(
+    "--probe",
+    help="How license files are checked: head (HEAD, ranged GET fallback), range (1-byte GET) or get",
+    action="store",
+    default="head",
+    choices=["head", "range", "get"],
+)
+PARSER.add_argument(
+    "--strategy",
+    help="License detection: probe (request each candidate file), listing (one root listing per repo)\n"
+    "or graphql (GitHub only, batched lookup, needs GITHUB_TOKEN)",
+    action="store",
+    default="probe",
+    choices=["probe", "listing", "graphql"],
+)
+PARSER.add_argument(
+    "--no-cache",
+    help="Scan every repo again instead of reusing results of unchanged repos",
+    dest="cache",
+    action="store_false",
+)
+PARSER.add_argument(
+    "--cache-ttl",
+    help="Maximum age in seconds of reusable cached results, 0 for no limit (default 7 days)",
+    action="store",
+    type=int,
+    default=7 * 24 * 3600,
+)
+PARSER.add_argument("--clear-cache", help="Drop the cached results of the scanned user and the stored HTTP responses first", action="store_true")
+PARSER.add_argument("--cache-stats", help="Show scan cache statistics after the scan", action="store_true")
+PARSER.add_argument("--resume", help="Resume an interrupted scan from its checkpoint journal, "
+                    "scanning only the repos it is missing", action="store_true")
+PARSER.add_argument("--workers", help="Worker processes the repos of an account are sharded across "
+                    "(default 1, each one has its own --concurrency)", action="store", type=int, default=1)
+PARSER.add_argument("--queue", help="Scan through a work queue shared with workers on other machines: "
+                    "an SQLite file or a redis:// URL", action="store")
+PARSER.add_argument("--role", help="With --queue, coordinator lists the repos and writes the report, "
+                    "worker scans the queued repos", action="store", default="coordinator",
+                    choices=["coordinator", "worker"])
+PARSER.add_argument("--lease-timeout", help="Seconds a worker holds the repos it claimed before they "
+                    "are handed to another worker (default 300)", action="store", type=float, default=300.0)
+PARSER.add_argument("--skip-archived", help="Leave archived repositories out of the scan", action="store_true")
+PARSER.add_argument("--visibility", help="Only scan repositories of this visibility (internal is GitLab only)",
+                    action="store", choices=["public", "internal", "private"])
+PARSER.add_argument("--base-url", help="Web URL of a self-hosted GitHub Enterprise or GitLab instance "
+                    "to scan instead of the public host", action="store")
 PARSER.add_argument("--origin", help="The origin of the git repo (optional)", action="store")
 PARSER.add_argument("args", nargs=REMAINDER)
 
@@ -52,12 +134,34 @@ def parse_args():
         # This allows test collection to work
         class DefaultArgs:
             scan = None
+            batch = None
             license = None
             licenselist = False
             provider = "github"
             report = None
             origin = None
             show = "all"
+            format = "md"
+            concurrency = 4
+            concurrency_mode = "fixed"
+            min_concurrency = 1
+            max_concurrency = 32
+            target_latency = 2.0
+            max_connections = None
+            probe = "head"
+            strategy = "probe"
+            cache = True
+            cache_ttl = 7 * 24 * 3600
+            clear_cache = False
+            cache_stats = False
+            resume = False
+            workers = 1
+            queue = None
+            role = "coordinator"
+            lease_timeout = 300.0
+            skip_archived = False
+            visibility = None
+            base_url = None
             args = []
 
         return DefaultArgs()
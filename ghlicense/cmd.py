@@ -16,7 +16,7 @@ ARGS = parse_args()
 current_directory = os.path.dirname(os.path.abspath(__file__))
 licenses_path = os.path.join(current_directory, "licenses.json")
 
-from ghlicense.scanner import args_scan
+from ghlicense.scanner import args_scan, args_batch_scan
 from ghlicense.functions import print_license_list, args_license
 
 
@@ -36,6 +36,8 @@ def main() -> None:
 
     if ARGS.scan:
         asyncio.run(args_scan(ARGS))
+    elif ARGS.batch:
+        asyncio.run(args_batch_scan(ARGS))
     elif ARGS.licenselist:
         print_license_list(licenses_path)
     elif ARGS.license:
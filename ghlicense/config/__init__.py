@@ -3,10 +3,12 @@ from ghlicense.config.storage import (
     save_last_used_licenses,
     load_last_used_licenses,
     pick_license_from_last_used,
+    load_tokens,
 )
 
 __all__ = [
     "save_last_used_licenses",
     "load_last_used_licenses",
     "pick_license_from_last_used",
+    "load_tokens",
 ]
\ No newline at end of file
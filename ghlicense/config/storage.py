@@ -6,6 +6,8 @@ from configparser import ConfigParser
 
 logger = logging.getLogger(__name__)
 
+CONFIG_FILE_PATH = "~/.gh-license/config.ini"
+
 
 def save_last_used_licenses(last_used_licenses):
     """Saves the most recently uses licenses in the config file. If no config
@@ -16,7 +18,7 @@ def save_last_used_licenses(last_used_licenses):
         in order of most recently used first.
     """
     config = ConfigParser()
-    config_file_path = os.path.expanduser("~/.gh-license/config.ini")
+    config_file_path = os.path.expanduser(CONFIG_FILE_PATH)
     config.read(config_file_path)
 
     # make the dirs if necessary.
@@ -39,7 +41,7 @@ def load_last_used_licenses():
         List of license names (most recent first), or empty list
     """
     config = ConfigParser()
-    if not config.read(os.path.expanduser("~/.gh-license/config.ini")):
+    if not config.read(os.path.expanduser(CONFIG_FILE_PATH)):
         return []
     try:
         return config["lastUsed"]["lastUsedLicenses"].split(",")
@@ -47,6 +49,36 @@ def load_last_used_licenses():
         return []
 
 
+def load_tokens(provider_name, instance=None):
+    """Returns the API tokens configured for a provider, environment first.
+
+    Tokens are read from <PROVIDER>_TOKEN and the comma-separated
+    <PROVIDER>_TOKENS environment variables (e.g. GITHUB_TOKEN), then from
+    the comma-separated provider key of the [tokens] section of the config
+    file. A self-hosted instance only reads its own key (e.g.
+    gitlab@gitlab.example.com): neither the variables nor the provider key,
+    which hold tokens of the public host. Duplicates are dropped.
+
+    Args:
+        provider_name: The provider the tokens are for, e.g. github
+        instance: Name of a self-hosted instance of the provider (optional)
+
+    Returns:
+        List of tokens, or empty list
+    """
+    self_hosted = instance and instance != provider_name
+    values = []
+    if not self_hosted:
+        prefix = provider_name.upper()
+        values = [os.environ.get(f"{prefix}_TOKEN", ""), os.environ.get(f"{prefix}_TOKENS", "")]
+    # Instance names may hold a port, only "=" separates keys from values
+    config = ConfigParser(delimiters=("=",))
+    if config.read(os.path.expanduser(CONFIG_FILE_PATH)):
+        values.append(config.get("tokens", instance if self_hosted else provider_name, fallback=""))
+    tokens = [token.strip() for value in values for token in value.split(",")]
+    return list(dict.fromkeys(token for token in tokens if token))
+
+
 def pick_license_from_last_used(last_used_licenses, licenses_path):
     """Assumes the user did not select a license. Presents them with
     their most recently used licenses from last_used_licenses and allows
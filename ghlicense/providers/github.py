@@ -1,36 +1,87 @@
 """Github provider"""
 import asyncio
+import json
 import logging
+import urllib.error
+import urllib.parse
 
 from ghlicense import repobase
+from ghlicense.config import load_tokens
+from ghlicense.utils.pagination import iter_pages
 from ghlicense.utils.retry import async_retry, RateLimitError
+from ghlicense.utils.tokens import TokenPool
 
-# By default, assume that this Github provider can be registered.
+WEB_BASE_URL = 'https://github.com'
+# github.com serves raw files from its CDN, GitHub Enterprise Server from /raw/
+RAW_BASE_URL = 'https://raw.githubusercontent.com'
+API_BASE_URL = 'https://api.github.com'
+GRAPHQL_URL = API_BASE_URL + '/graphql'
+# Repositories requested per REST listing page (the API maximum)
+PAGE_SIZE = 100
+# Repositories per GraphQL page; the root tree makes each node fairly heavy
+GRAPHQL_PAGE_SIZE = 50
+
+LICENSE_LOOKUP_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER, isFork: false) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        nameWithOwner
+        isFork
+        isArchived
+        visibility
+        licenseInfo { key name spdxId }
+        defaultBranchRef { name target { oid } }
+        object(expression: "HEAD:") { ... on Tree { entries { name } } }
+      }
+    }
+  }
+}
+"""
+
+# Every request goes through the shared HTTP session, so this provider has no
+# third-party dependency and can always be registered.
 PROVIDER_PLUGIN_LOADED = True
 
-try:
-    # Attempt to import the github module to interact with Github.com
-    from github import Github
-except ImportError:
-    # If the module failed to import, then this github provider can NOT be registered.
-    PROVIDER_PLUGIN_LOADED = False
+
+class GraphQLError(Exception):
+    """Exception raised when the GitHub GraphQL API can not answer a query."""
 
 
 class GitHubProvider(repobase.Provider):
     """Derived a GithubProvider from repobase.Provider."""
 
-    def __init__(self, username):
-        """Initialise the GithubProvider using the github module.
+    def __init__(self, username, base_url=None):
+        """Initialise the GithubProvider.
 
-        A handle to the github user is obtained by calling
-        github.get_user(username)
+        No request is made here, the account is only looked up by the listing.
 
         Keyword arguments:
         username -- The Github username.
+        base_url -- The web URL of a GitHub Enterprise Server, e.g.
+                    https://github.example.com (default github.com).
         """
         super().__init__(username)
-        self.github = Github()
-        self.user = self.github.get_user(username)
+        self.username = username
+        if base_url:
+            self.web_url = base_url.rstrip('/')
+            self.api_url = self.web_url + '/api/v3'
+            self.graphql_url = self.web_url + '/api/graphql'
+        else:
+            self.web_url, self.api_url, self.graphql_url = WEB_BASE_URL, API_BASE_URL, GRAPHQL_URL
+        # API requests are spread over every configured token (GITHUB_TOKEN,
+        # GITHUB_TOKENS or the config file)
+        self.tokens = TokenPool(load_tokens("github", repobase.instance_name("github", base_url)))
+
+    @property
+    def token(self):
+        """The first API token, None when the requests are anonymous."""
+        return self.tokens.first()
+
+    @token.setter
+    def token(self, token):
+        self.tokens = TokenPool([token] if token else [])
 
     def get_repos(self):
         """Wrapper around github.get_repos() - only source repositories by default."""
@@ -48,38 +99,179 @@ class GitHubProvider(repobase.Provider):
             return loop.run_until_complete(self.get_repos_async())
 
     async def get_repos_async(self):
-        """Async wrapper around github.get_repos() - only source repositories by default."""
+        """Collect the source repositories, listing the pages concurrently (see iter_repos)."""
+        return [repo async for repo in self.iter_repos()]
+
+    async def iter_repos(self):
+        """Yield source repositories page by page through the provider's session.
+
+        The Link rel="last" header of the first page gives the page count,
+        so the remaining pages are fetched concurrently.
+        """
+        async def fetch_page(page):
+            url = (self.api_url + '/users/' + urllib.parse.quote(self.username, safe='')
+                   + f'/repos?type=source&per_page={PAGE_SIZE}&page={page}')
+            response = await self._get(url)
+            return json.loads(response.body), response.headers
+
+        async for repos in iter_pages(fetch_page, PAGE_SIZE):
+            for data in repos:
+                if self._listed(data.get("archived", False), data.get("visibility", "public")):
+                    yield self._repo_from_rest(data)
+
+    def _listed(self, archived, visibility):
+        """Return whether a repo passes the archived and visibility filters.
+
+        The listing of another user can not be filtered by the API, so both
+        listing strategies filter client-side. GraphQL spells visibilities
+        in upper case (PUBLIC, PRIVATE, INTERNAL), REST in lower case.
+        """
+        if self.skip_archived and archived:
+            return False
+        return not self.visibility or visibility.lower() == self.visibility
+
+    async def _get(self, url):
+        """GET a REST API URL through the session and return the response.
+
+        The session paces the request to the shared rate limit budget; an
+        exhausted quota raises RateLimitError, retried once the quota resets.
+        """
+        @async_retry(max_retries=5, base_delay=1)
+        async def _get():
+            response = await self.session.request("GET", url, headers={"Accept": "application/vnd.github+json"},
+                                                  credentials=self.tokens)
+            if response.status == 429 or (response.status == 403
+                                          and response.headers.get("X-RateLimit-Remaining") == "0"):
+                raise RateLimitError(f"GitHub rate limit ({response.status})", response=response)
+            return response
+
+        response = await _get()
+        if response.status != 200:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+        return response
+
+    def _repo_from_rest(self, data):
+        """Build a Repo from a REST API repository object."""
+        branch = data.get("default_branch") or "master"
+        raw_base_url = self.raw_content_url(data["full_name"], branch)
+        repo_url = self.web_url + '/' + data["full_name"]
+        return repobase.Repo(data["full_name"], raw_base_url, repo_url, branch, data.get("fork", False),
+                             revision=data.get("pushed_at"))
+
+    def raw_content_url(self, full_name, branch, path=""):
+        """Return the raw.githubusercontent.com URL of a file (/raw/ on GitHub Enterprise)."""
+        ref = urllib.parse.quote(branch, safe='/') + '/' + urllib.parse.quote(path)
+        if self.web_url == WEB_BASE_URL:
+            return RAW_BASE_URL + '/' + full_name + '/' + ref
+        return self.web_url + '/' + full_name + '/raw/' + ref
+
+    async def list_root_files(self, repo, pool):
+        """List the root directory of a repo with a single git trees API call."""
+        url = (self.api_url + '/repos/' + repo.full_name + '/git/trees/'
+               + urllib.parse.quote(repo.default_branch, safe=''))
+        response = await pool.request("GET", url, headers={"Accept": "application/vnd.github+json"},
+                                      credentials=self.tokens)
+        # 404: unknown branch, 409: empty repository
+        if response.status in (404, 409):
+            return []
+        if response.status != 200:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+        return [entry["path"] for entry in json.loads(response.body).get("tree", [])]
+
+    async def iter_repos_graphql(self, pool, page_size=GRAPHQL_PAGE_SIZE):
+        """Yield repos with their license and root listing through GraphQL.
+
+        One query returns up to page_size repos, so a large account costs a
+        few dozen requests instead of several per repo. The yielded Repo
+        objects carry root_files and license_spdx, so scanning them needs no
+        further requests.
+
+        Raises GraphQLError when GraphQL is unavailable (e.g. no GITHUB_TOKEN).
+        """
+        if not self.tokens:
+            raise GraphQLError("the GitHub GraphQL API requires a token, set GITHUB_TOKEN")
+
+        cursor = None
+        while True:
+            data = await self._graphql(pool, LICENSE_LOOKUP_QUERY,
+                                       {"login": self.username, "first": page_size, "after": cursor})
+            owner = data.get("repositoryOwner")
+            if owner is None:
+                raise GraphQLError(f"unknown GitHub account '{self.username}'")
+            connection = owner["repositories"]
+            for node in connection["nodes"]:
+                if self._listed(node.get("isArchived", False), node.get("visibility") or "PUBLIC"):
+                    yield self._repo_from_graphql(node)
+            if not connection["pageInfo"]["hasNextPage"]:
+                return
+            cursor = connection["pageInfo"]["endCursor"]
+
+    async def _graphql(self, pool, query, variables):
+        """Run a GraphQL query and return its data."""
         @async_retry(max_retries=5, base_delay=1)
-        async def _fetch_repos():
-            return await asyncio.to_thread(self._fetch_repos_sync)
-
-        repos_data = await _fetch_repos()
-        repos = []
-        for g_repo in repos_data:
-            raw_base_url = 'https://github.com/' + g_repo.full_name + '/blob/' + g_repo.default_branch + '/'
-            repo_url = 'https://github.com/' + g_repo.full_name
-            repos.append(repobase.Repo(g_repo.full_name, raw_base_url, repo_url,
-                                       g_repo.default_branch, g_repo.fork))
-        return repos
-
-    def _fetch_repos_sync(self):
-        """Synchronous fetch of repos."""
-        return list(self.user.get_repos(type="source"))
+        async def _post():
+            response = await pool.request(
+                "POST", self.graphql_url,
+                headers={"Content-Type": "application/json"},
+                body=json.dumps({"query": query, "variables": variables}).encode(),
+                credentials=self.tokens)
+            if response.status == 429 or (response.status == 403
+                                          and response.headers.get("X-RateLimit-Remaining") == "0"):
+                raise RateLimitError(f"GraphQL rate limit ({response.status})", response=response)
+            return response
+
+        response = await _post()
+        if response.status != 200:
+            raise GraphQLError(f"GraphQL request failed with HTTP {response.status}")
+        payload = json.loads(response.body)
+        if payload.get("errors"):
+            raise GraphQLError("; ".join(error.get("message", "") for error in payload["errors"]))
+        return payload["data"]
+
+    def _repo_from_graphql(self, node):
+        """Build a Repo from a GraphQL repository node."""
+        full_name = node["nameWithOwner"]
+        branch_ref = node.get("defaultBranchRef") or {}
+        branch = branch_ref.get("name") or "master"
+        tree = node.get("object") or {}
+        license_info = node.get("licenseInfo") or {}
+        raw_base_url = self.raw_content_url(full_name, branch)
+        repo_url = self.web_url + '/' + full_name
+        return repobase.Repo(full_name, raw_base_url, repo_url, branch, node["isFork"],
+                             root_files=[entry["name"] for entry in tree.get("entries", [])],
+                             license_spdx=license_info.get("spdxId"),
+                             revision=(branch_ref.get("target") or {}).get("oid"))
+
 
     def get_license_info(self, repo_name):
+        """Return the license GitHub detected for a repo, None if none or on error."""
         try:
-            repo = self.github.get_repo(repo_name)
-            license_info = repo.get_license()
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running event loop - create a new one
+            loop = asyncio.new_event_loop()
+            try:
+                return loop.run_until_complete(self.get_license_info_async(repo_name))
+            finally:
+                loop.close()
+        else:
+            # There's a running loop - use it
+            return loop.run_until_complete(self.get_license_info_async(repo_name))
+
+    async def get_license_info_async(self, repo_name):
+        """Fetch a repo's license through the session (see get_license_info)."""
+        try:
+            response = await self._get(self.api_url + '/repos/' + repo_name + '/license')
+            license_info = json.loads(response.body).get("license")
             if license_info:
                 return {
-                    "name": license_info.name,
-                    "spdx_id": license_info.spdx_id,
-                    "key": license_info.key,
+                    "name": license_info.get("name"),
+                    "spdx_id": license_info.get("spdx_id"),
+                    "key": license_info.get("key"),
                 }
         except Exception as e:
             logging.debug(f"Failed to get license info for {repo_name}: {e}")
         return None
 
-
 # Register this Github repo provider with ghlicense
 repobase.register_provider("github", GitHubProvider, PROVIDER_PLUGIN_LOADED)
@@ -1,35 +1,70 @@
 """Gitlab provider"""
 import asyncio
+import json
+import urllib.error
+import urllib.parse
 
 from ghlicense import repobase
+from ghlicense.config import load_tokens
+from ghlicense.utils.pagination import iter_pages, last_page, next_link
+from ghlicense.utils.tokens import TokenPool
 from ghlicense.utils.retry import async_retry, RateLimitError
 
-# By default, assume that this Github provider can be registered.
+WEB_BASE_URL = 'https://gitlab.com'
+# Projects requested per listing page (the API maximum)
+PAGE_SIZE = 100
+# GitLab license keys (from licensee) whose SPDX identifier is not simply upper-case
+LICENSE_KEY_SPDX = {
+    "apache-2.0": "Apache-2.0",
+    "artistic-2.0": "Artistic-2.0",
+    "bsd-2-clause": "BSD-2-Clause",
+    "bsd-3-clause": "BSD-3-Clause",
+    "bsd-3-clause-clear": "BSD-3-Clause-Clear",
+    "bsd-4-clause": "BSD-4-Clause",
+    "lppl-1.3c": "LPPL-1.3c",
+    "mulanpsl-2.0": "MulanPSL-2.0",
+    "ofl-1.1": "OFL-1.1",
+    "postgresql": "PostgreSQL",
+    "unlicense": "Unlicense",
+    "vim": "Vim",
+    "wtfpl": "WTFPL",
+    "zlib": "Zlib",
+    "other": "NOASSERTION",
+}
+
+# Every request goes through the shared HTTP session, so this provider has no
+# third-party dependency and can always be registered.
 PROVIDER_PLUGIN_LOADED = True
 
-try:
-    # Attempt to import the gitlab module to interact with Github.com
-    import gitlab
-except ImportError:
-    # If the module failed to import, then this gitlab provider can NOT be registered.
-    PROVIDER_PLUGIN_LOADED = False
+
+def license_spdx(key):
+    """Return the SPDX identifier of a GitLab license key, None for no license."""
+    if not key:
+        return None
+    return LICENSE_KEY_SPDX.get(key, key.upper())
 
 
 class GitLabProvider(repobase.Provider):
     """Derived a GitLabProvider from repobase.Provider."""
 
-    def __init__(self, username):
-        """Initialise the GithubProvider using the gitlab module.
+    def __init__(self, username, base_url=None):
+        """Initialise the GitLabProvider.
 
-        A handle to the gitlab user is obtained by calling
-        gitlab.get_user(username)
+        No request is made here, the user or group is only looked up by
+        the listing.
 
         Keyword arguments:
-        username -- The Github username.
+        username -- The GitLab username, or the path of a group or subgroup.
+        base_url -- The web URL of a self-hosted GitLab instance, e.g.
+                    https://gitlab.example.com (default gitlab.com).
         """
         super().__init__(username)
-        self.gitlab = gitlab.Gitlab()
-        self.user = self.gitlab.users.list(username=username)[0]
+        self.username = username
+        self.web_url = base_url.rstrip('/') if base_url else WEB_BASE_URL
+        self.api_url = self.web_url + '/api/v4'
+        # API requests are spread over every configured token (GITLAB_TOKEN,
+        # GITLAB_TOKENS or the config file)
+        self.tokens = TokenPool(load_tokens("gitlab", repobase.instance_name("gitlab", base_url)))
 
     def get_repos(self):
         """Wrapper around gitlab.get_repos() - only source repositories by default."""
@@ -47,25 +82,134 @@ class GitLabProvider(repobase.Provider):
             return loop.run_until_complete(self.get_repos_async())
 
     async def get_repos_async(self):
-        """Async wrapper around gitlab.get_repos() - only source repositories by default."""
+        """Collect the owned source projects, listing the pages concurrently (see iter_repos)."""
+        return [repo async for repo in self.iter_repos()]
+
+    async def iter_repos(self):
+        """Yield owned source projects page by page through the provider's session.
+
+        The account is scanned as a user first, and as a group with all its
+        subgroups when no such user exists (or the path names a subgroup).
+        Archived and visibility filters are applied by the API. Listings are
+        requested with keyset pagination and walked through the Link
+        rel="next" header; when GitLab answers with offset pagination
+        instead, the X-Total-Pages header lets the remaining pages be
+        fetched concurrently.
+        """
+        url = self._projects_url("groups" if "/" in self.username else "users")
+        try:
+            response = await self._get(url)
+        except urllib.error.HTTPError as error:
+            if error.code != 404 or "/" in self.username:
+                raise
+            url = self._projects_url("groups")
+            response = await self._get(url)
+
+        if last_page(response.headers) is None:
+            while True:
+                for repo in self._source_repos(json.loads(response.body)):
+                    yield repo
+                next_url = next_link(response.headers)
+                if not next_url:
+                    return
+                response = await self._get(next_url)
+
+        async def fetch_page(page):
+            page_response = await self._get(url + f'&page={page}')
+            return json.loads(page_response.body), page_response.headers
+
+        first = (json.loads(response.body), response.headers)
+        async for projects in iter_pages(fetch_page, PAGE_SIZE, first=first):
+            for repo in self._source_repos(projects):
+                yield repo
+
+    def _projects_url(self, owner_kind):
+        """Return the first projects listing URL of a user or group, with the server-side filters.
+
+        Keyword arguments:
+        owner_kind -- "users" or "groups".
+        """
+        # license=true returns the license GitLab detected, so those projects need no probe
+        params = {"per_page": PAGE_SIZE, "pagination": "keyset", "order_by": "id", "sort": "asc",
+                  "license": "true"}
+        if owner_kind == "users":
+            params["owned"] = "true"
+        else:
+            # Projects of the subgroups, but not those shared with the group
+            params.update(include_subgroups="true", with_shared="false")
+        if self.skip_archived:
+            params["archived"] = "false"
+        if self.visibility:
+            params["visibility"] = self.visibility
+        return (self.api_url + f'/{owner_kind}/' + urllib.parse.quote(self.username, safe='')
+                + '/projects?' + urllib.parse.urlencode(params))
+
+    def _source_repos(self, projects):
+        """Build the Repos of a listing page, without the forks.
+
+        The API can not leave forks out, so they are dropped here; this is
+        also why the listing does not ask for the simple representation,
+        which lacks forked_from_project.
+        """
+        return [self._repo_from_rest(data) for data in projects if not data.get('forked_from_project')]
+
+    async def _get(self, url):
+        """GET a REST API URL through the session and return the response.
+
+        The session paces the request to the shared rate limit budget; a 429
+        raises RateLimitError, retried after Retry-After or the quota reset.
+        """
         @async_retry(max_retries=5, base_delay=1)
-        async def _fetch_repos():
-            return await asyncio.to_thread(self._fetch_repos_sync)
-
-        repos_data = await _fetch_repos()
-        repos = []
-        for g_repo in repos_data:
-            if hasattr(g_repo, 'forked_project') and g_repo.forked_project:
-                continue
-            raw_base_url = 'https://gitlab.com/' + g_repo.path_with_namespace + '/blob/' + g_repo.default_branch + '/'
-            repo_url = 'https://gitlab.com/' + g_repo.path_with_namespace
-            repos.append(repobase.Repo(g_repo.path_with_namespace, raw_base_url, repo_url,
-                                       g_repo.default_branch, False))
-        return repos
-
-    def _fetch_repos_sync(self):
-        """Synchronous fetch of repos."""
-        return self.user.projects.list(owned=True, include_subgroups=False)
+        async def _get():
+            response = await self.session.request("GET", url, credentials=self.tokens)
+            if response.status == 429:
+                raise RateLimitError(f"GitLab rate limit ({response.status})", response=response)
+            return response
+
+        response = await _get()
+        if response.status != 200:
+            raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+        return response
+
+    def raw_content_url(self, full_name, branch, path=""):
+        """Return the /-/raw/ URL of a file, /blob/ would render the HTML page."""
+        return (self.web_url + '/' + full_name + '/-/raw/' + urllib.parse.quote(branch, safe='/') + '/'
+                + urllib.parse.quote(path))
+
+    async def list_root_files(self, repo, pool):
+        """List the root directory of a repo through the repository tree API.
+
+        A root with more than PAGE_SIZE entries spans several pages, followed
+        through the Link header.
+        """
+        url = (self.api_url + '/projects/' + urllib.parse.quote(repo.full_name, safe='')
+               + f'/repository/tree?per_page={PAGE_SIZE}&ref=' + urllib.parse.quote(repo.default_branch, safe=''))
+        names = []
+        while url:
+            response = await pool.request("GET", url, credentials=self.tokens)
+            # 404: empty repository or unknown ref
+            if response.status == 404:
+                return []
+            if response.status != 200:
+                raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+            names.extend(entry["name"] for entry in json.loads(response.body))
+            url = next_link(response.headers)
+        return names
+
+    def _repo_from_rest(self, data):
+        """Build a Repo from a REST API project object."""
+        branch = data.get('default_branch') or 'master'
+        raw_base_url = self.raw_content_url(data['path_with_namespace'], branch)
+        repo_url = self.web_url + '/' + data['path_with_namespace']
+        license_info = data.get('license') or {}
+        license_file = None
+        if license_info.get('key') and data.get('license_url'):
+            # e.g. https://gitlab.com/group/project/-/blob/main/LICENSE
+            license_file = data['license_url'].rsplit('/', 1)[-1] or None
+        return repobase.Repo(data['path_with_namespace'], raw_base_url, repo_url, branch, False,
+                             revision=data.get('last_activity_at'),
+                             license_spdx=license_spdx(license_info.get('key')),
+                             license_file=license_file)
 
 
 # Register this Github repo provider with ghlicense
@@ -1,9 +1,13 @@
 """Load providers"""
 import sys
+import asyncio
 import logging
+import urllib.parse
 from abc import ABCMeta, abstractmethod
 
-from typing import Dict, List, Tuple, Type
+from typing import AsyncIterator, Dict, List, Tuple, Type
+
+from ghlicense.utils.http import HTTPPool
 # List of current successfully registered i.e. "active" providers.
 # These are sources of repos i.e. public repository hosts.
 PROVIDERS: Dict[str, Type["Provider"] | None] = {}
@@ -19,6 +23,10 @@ class Repo:
         repo_url: str,
         default_branch: str = "master",
         fork: bool = False,
+        root_files: List[str] | None = None,
+        license_spdx: str | None = None,
+        revision: str | None = None,
+        license_file: str | None = None,
     ) -> None:
         """Repo class constructor
 
@@ -28,23 +36,99 @@ class Repo:
         repo_url -- The URL link to the public repo's homepage.
         default_branch -- The branch to check (default "master").
         fork --  Whether the repo is a fork of another repo (default False).
+        root_files -- Root directory listing, when the provider already
+                      fetched it while listing repos (default None).
+        license_spdx -- License detected by the provider, when known (default None).
+        revision -- Head commit SHA or last push time, identifies the repo
+                    state for the scan cache (default None).
+        license_file -- Name of the license file the provider detected
+                        license_spdx in, when known (default None).
         """
         self.full_name: str = full_name
         self.raw_base_url: str = raw_base_url
         self.repo_url: str = repo_url
         self.default_branch: str = default_branch
         self.fork: bool = fork
+        self.root_files: List[str] | None = root_files
+        self.license_spdx: str | None = license_spdx
+        self.revision: str | None = revision
+        self.license_file: str | None = license_file
+
+    def raw_url(self, path: str) -> str:
+        """Return the URL of the raw content of a file in the repo.
+
+        Keyword arguments:
+        path -- The path of the file, relative to the repo root.
+        """
+        return self.raw_base_url + urllib.parse.quote(path)
 
 
 class Provider(metaclass=ABCMeta):
+    # Set through the session property
+    _session: HTTPPool | None = None
+    # Listing filters, applied by the API where it supports them
+    skip_archived: bool = False
+    visibility: str | None = None
+
     @abstractmethod
     def __init__(self, username: str) -> None:
         pass
 
+    @property
+    def session(self) -> HTTPPool:
+        """The pooled keep-alive transport of every request of the provider.
+
+        The scanner assigns its shared HTTPPool, so the repo listing, the
+        root listings and the license probes all reuse the same connections.
+        A provider used on its own creates a private pool on first use.
+        """
+        if self._session is None:
+            self._session = HTTPPool()
+        return self._session
+
+    @session.setter
+    def session(self, session: HTTPPool) -> None:
+        self._session = session
+
     @abstractmethod
     def get_repos(self) -> List[Repo]:
         pass
 
+    async def iter_repos(self) -> AsyncIterator[Repo]:
+        """Yield the repos of the user as their listing pages arrive.
+
+        Providers override this to yield page by page, so scanning can
+        start before the whole listing has been fetched. The default
+        implementation fetches the full listing first.
+        """
+        for repo in await asyncio.to_thread(self.get_repos):
+            yield repo
+
+    def raw_content_url(self, full_name: str, branch: str, path: str = "") -> str:
+        """Return the URL serving the raw content of a file, not its HTML page.
+
+        With an empty path this is the raw base URL of the repo, which the
+        scanner appends the probed file names to.
+
+        Keyword arguments:
+        full_name -- The name of the repo, e.g. "owner/repo".
+        branch -- The branch to read the file from.
+        path -- The path of the file, relative to the repo root (default "").
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not build raw content URLs")
+
+    async def list_root_files(self, repo: Repo, pool) -> List[str]:
+        """Return the file names in the root directory of a repo.
+
+        Providers supporting the single-listing scan strategy fetch the
+        listing with one API request through the shared HTTPPool.
+
+        Keyword arguments:
+        repo -- The repo to list.
+        pool -- The HTTPPool used for the request.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support root listings")
+
 def register_provider(
     name: str,
     provider_class: Type["Provider"] | None,
@@ -83,6 +167,36 @@ def get_provider(name: str) -> Type["Provider"]:
     sys.exit(1)
 
 
+def create_provider(name: str, username: str, base_url: str | None = None) -> "Provider":
+    """Create the provider of an account, on a self-hosted instance when base_url is set.
+
+    Keyword arguments:
+    name -- Name of the provider.
+    username -- The user or organisation.
+    base_url -- The web URL of a self-hosted instance (default the public host).
+    """
+    provider_class = get_provider(name)
+    if base_url:
+        return provider_class(username, base_url=base_url)  # type: ignore[call-arg]
+    return provider_class(username)
+
+
+def instance_name(name: str, base_url: str | None = None) -> str:
+    """Return the name of a provider instance, e.g. "gitlab@gitlab.example.com".
+
+    The public host of a provider is named after the provider alone. The
+    name keeps the scan cache, journals and work queues of instances apart.
+
+    Keyword arguments:
+    name -- Name of the provider.
+    base_url -- The web URL of a self-hosted instance (default the public host).
+    """
+    if not base_url:
+        return name
+    parsed = urllib.parse.urlsplit(base_url)
+    return f"{name}@{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+
 def get_providers() -> Tuple[List[str], List[str]]:
     """Returns a pair of dicts of providers.
 
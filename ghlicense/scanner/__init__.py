@@ -5,10 +5,21 @@ from ghlicense.scanner.repo_scan import (
     loop_repo_scan,
     args_scan,
 )
+from ghlicense.scanner.detect import is_license_file, find_license_file
+from ghlicense.scanner.result import ScanResult, ScanStatus
+from ghlicense.scanner.scheduler import FairScheduler
+from ghlicense.scanner.batch import args_batch_scan, parse_batch_entries
 
 __all__ = [
     "print_license_status",
     "update_progress_bar",
     "loop_repo_scan",
     "args_scan",
+    "is_license_file",
+    "find_license_file",
+    "ScanResult",
+    "ScanStatus",
+    "FairScheduler",
+    "args_batch_scan",
+    "parse_batch_entries",
 ]
\ No newline at end of file
@@ -0,0 +1,158 @@
+"""Batch scanning of many accounts in one event loop."""
+import sys
+import time
+import asyncio
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from ghlicense import repobase
+from ghlicense.scanner.repo_scan import scan_account, open_scan_resources, close_scan_resources, default_report_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUMMARY_FILE_NAME = "batch-license-summary.md"
+
+
+def parse_batch_entries(lines: Iterable[str], default_provider: str,
+                        default_base_url: Optional[str] = None) -> List[Tuple[str, str, Optional[str]]]:
+    """Parse "provider:user@base_url" lines into (provider, user, base_url) entries.
+
+    Blank lines and "#" comments are ignored, a line without a provider
+    uses default_provider, one without "@base_url" uses default_base_url
+    (None for the public host) and duplicate entries are dropped.
+    """
+    entries = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        account, separator, base_url = line.partition("@")
+        if not separator:
+            base_url = default_base_url
+        provider, separator, username = account.partition(":")
+        if not separator:
+            provider, username = default_provider, account
+        entry = (provider.strip(), username.strip(), base_url.strip() if base_url else None)
+        if entry not in entries:
+            entries.append(entry)
+    return entries
+
+
+def read_batch_file(path: str, default_provider: str,
+                    default_base_url: Optional[str] = None) -> List[Tuple[str, str, Optional[str]]]:
+    """Read the batch entries from a file, or from stdin when path is "-"."""
+    if path == "-":
+        return parse_batch_entries(sys.stdin, default_provider, default_base_url)
+    with open(path, "r", encoding="UTF-8") as batch_file:
+        return parse_batch_entries(batch_file, default_provider, default_base_url)
+
+
+def write_summary(summary_file_name, accounts):
+    """Write the combined Markdown summary of a batch scan.
+
+    Args:
+        summary_file_name: Path of the summary file
+        accounts: List of (provider, user, report_file_name, counts) tuples,
+            counts being None for accounts that failed
+    """
+    totals = {"licensed": 0, "unlicensed": 0, "forked": 0, "unknown": 0, "total": 0}
+    with open(summary_file_name, "w", encoding="UTF-8") as summary_file:
+        summary_file.write("# License Scan Summary\n\n")
+        summary_file.write(f"**Scan Date:** {time.strftime('%c')}\n")
+        summary_file.write(f"**Accounts:** {len(accounts)}\n\n")
+        summary_file.write("---\n\n")
+
+        summary_file.write("## Accounts\n\n")
+        summary_file.write("| Account | Provider | With License | Without License | Forked without License "
+                           "| Unknown | Total | Report |\n")
+        summary_file.write("|---------|----------|--------------|-----------------|------------------------"
+                           "|---------|-------|--------|\n")
+        failed = []
+        for provider, username, report_file_name, counts in accounts:
+            if counts is None:
+                failed.append(f"{provider}:{username}")
+                summary_file.write(f"| {username} | {provider} | - | - | - | - | - | failed |\n")
+                continue
+            for key in totals:
+                totals[key] += counts[key]
+            summary_file.write(f"| {username} | {provider} | {counts['licensed']} | {counts['unlicensed']} "
+                               f"| {counts['forked']} | {counts['unknown']} | {counts['total']} "
+                               f"| [{report_file_name}]({report_file_name}) |\n")
+
+        summary_file.write("\n## Statistics\n\n")
+        summary_file.write("| Metric | Count |\n")
+        summary_file.write("|--------|-------|\n")
+        summary_file.write(f"| Repos with License | {totals['licensed']} |\n")
+        summary_file.write(f"| Repos without License | {totals['unlicensed']} |\n")
+        summary_file.write(f"| Forked without License | {totals['forked']} |\n")
+        summary_file.write(f"| Repos with Unknown Status | {totals['unknown']} |\n")
+        summary_file.write(f"| Total Repos | {totals['total']} |\n")
+        summary_file.write(f"| Failed Accounts | {len(failed)} |\n")
+
+        if failed:
+            summary_file.write("\n## Failed Accounts\n\n")
+            for account in failed:
+                summary_file.write(f"- {account}\n")
+
+
+async def args_batch_scan(ARGS):
+    """The batch command - scan many accounts in one event loop.
+
+    Every account writes its own report. The accounts of each provider
+    instance (the public host or a self-hosted one) share one connection
+    pool and one concurrency budget, split fairly between them, so a slow
+    instance can not starve the others. All instances share the cache.
+
+    Args:
+        ARGS: Command line arguments with the args_scan attributes plus:
+            - batch: file of "provider:user" or "provider:user@base_url"
+              lines, or "-" for stdin
+            - report: optional summary filename
+    """
+    entries = []
+    for provider, username, base_url in read_batch_file(ARGS.batch, ARGS.provider,
+                                                        getattr(ARGS, 'base_url', None)):
+        if not repobase.PROVIDERS.get(provider):
+            logger.error(f"Skipping {provider}:{username}, provider '{provider}' is not available")
+            continue
+        entries.append((provider, username, base_url))
+    if not entries:
+        logger.error("No accounts to scan in the batch list")
+        return
+
+    summary_file_name = ARGS.report or DEFAULT_SUMMARY_FILE_NAME
+    # One pool and scheduler per instance, the caches are opened once
+    instances = {}
+    shared_caches = None
+    for provider, _, base_url in entries:
+        instance = repobase.instance_name(provider, base_url)
+        if instance not in instances:
+            pool, cache, validators, scheduler = open_scan_resources(ARGS, shared_caches)
+            shared_caches = (cache, validators)
+            instances[instance] = (pool, scheduler)
+
+    async def scan_entry(provider, username, base_url):
+        """Scan one account, recording a failure instead of aborting the batch."""
+        instance = repobase.instance_name(provider, base_url)
+        pool, scheduler = instances[instance]
+        report_file_name = default_report_name(username, provider, getattr(ARGS, 'format', 'md'), base_url)
+        try:
+            counts = await scan_account(ARGS, provider, username, report_file_name, pool, scheduler, shared_caches[0],
+                                        base_url=base_url)
+        except Exception as e:
+            logger.error(f"Scan of {instance}:{username} failed: {e}")
+            await scheduler.unregister(f"{instance}:{username}")
+            counts = None
+        return instance, username, report_file_name, counts
+
+    try:
+        accounts = await asyncio.gather(*(scan_entry(*entry) for entry in entries))
+    finally:
+        # The shared caches are closed with the last instance
+        for pool, scheduler in list(instances.values())[:-1]:
+            close_scan_resources(ARGS, pool, None, None, scheduler)
+        pool, scheduler = list(instances.values())[-1]
+        close_scan_resources(ARGS, pool, *shared_caches, scheduler)
+
+    write_summary(summary_file_name, accounts)
+    logger.info(f'Batch summary written to "{summary_file_name}"')
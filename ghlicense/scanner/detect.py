@@ -0,0 +1,35 @@
+"""License file name matching for root directory listings."""
+import re
+from typing import Iterable, List, Optional
+
+# LICENSE, LICENCE, UNLICENSE and COPYING in any case, bare or followed by
+# qualifiers (LICENSE-MIT, LICENSE-APACHE-2.0, COPYING.LESSER) and a
+# documentation extension (LICENSE.md, LICENSE-MIT.txt). Dotted qualifiers
+# are upper case, so source files such as license.go or copying.c do not match.
+LICENSE_NAME_PATTERN = re.compile(
+    r"^(?i:(?:un)?licen[cs]e|copying)"
+    r"(?:[-_][A-Za-z0-9+]+(?:\.\d+\+?)*|\.[A-Z][A-Z0-9]*)*"
+    r"(?i:\.(?:md|markdown|txt|rst))?$"
+)
+
+
+def is_license_file(name: str) -> bool:
+    """Return whether a root-level file name looks like a license file."""
+    return bool(LICENSE_NAME_PATTERN.match(name))
+
+
+def find_license_file(names: Iterable[str], preferred: List[str]) -> Optional[str]:
+    """Pick the license file from a directory listing.
+
+    Names from the preferred list win in their given order, otherwise the
+    alphabetically first license-like name is returned (None if there is none).
+
+    Keyword arguments:
+    names -- File names found in the repo root.
+    preferred -- Candidate license file names, most common first.
+    """
+    matches = sorted(name for name in names if is_license_file(name))
+    for candidate in preferred:
+        if candidate in matches:
+            return candidate
+    return matches[0] if matches else None
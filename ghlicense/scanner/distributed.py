@@ -0,0 +1,166 @@
+"""Scanning one account through a work queue shared by several machines."""
+import os
+import socket
+import asyncio
+import logging
+
+from ghlicense import repobase
+from ghlicense.scanner.repo_scan import (
+    _iter_scan_repos,
+    _scan_repo,
+    close_scan_resources,
+    license_file_candidates,
+    open_scan_resources,
+    probe_retry_policy,
+    update_progress_bar,
+    worker_args,
+)
+from ghlicense.scanner.result import ScanResult
+from ghlicense.workqueue import DEFAULT_CLAIM_SIZE, DEFAULT_LEASE_TIMEOUT, open_work_queue
+
+logger = logging.getLogger(__name__)
+
+# Repos pushed to the queue per write
+PUSH_BATCH_SIZE = 500
+# Seconds between polls of the queue while there is nothing to do
+QUEUE_POLL_INTERVAL = 2.0
+
+
+def repo_payload(repo):
+    """Return the queue payload of a repo, the keyword arguments of its Repo."""
+    return dict(vars(repo))
+
+
+async def coordinate_scan(ARGS, user, pool, journal, work_queue):
+    """List an account's repos into a work queue and journal the workers' results.
+
+    Repos already in the journal are not queued. Without --resume the
+    queue's leftovers from an earlier run are dropped first. Returns once
+    every queued repo has a result.
+
+    Args:
+        ARGS: Command line arguments (see args_scan) for the scan options
+        user: Provider instance listing the repos
+        pool: HTTPPool used by the listing
+        journal: ScanJournal of the account
+        work_queue: WorkQueue shared with the workers
+    """
+    strategy = getattr(ARGS, 'strategy', None) or "probe"
+    if not getattr(ARGS, 'resume', False):
+        await asyncio.to_thread(work_queue.clear)
+    listed = False
+
+    async def feed():
+        """Push the listed repos to the queue in batches."""
+        nonlocal listed
+        batch = []
+        async for repo in _iter_scan_repos(user, pool, strategy):
+            if journal.is_done(repo.full_name):
+                continue
+            batch.append((repo.full_name, repo_payload(repo)))
+            if len(batch) >= PUSH_BATCH_SIZE:
+                await asyncio.to_thread(work_queue.push, batch)
+                batch = []
+        await asyncio.to_thread(work_queue.push, batch)
+        await asyncio.to_thread(work_queue.seal)
+        listed = True
+
+    async def collect():
+        """Journal the results until the listing is done and nothing is outstanding."""
+        position = 0
+        count_current = 0
+        while True:
+            # Checked before reading the results, so none completed meanwhile is missed
+            finished = listed and await asyncio.to_thread(work_queue.outstanding) == 0
+            rows = await asyncio.to_thread(work_queue.results, position)
+            for position, data in rows:
+                result = ScanResult.from_dict(data)
+                if not journal.is_done(result.repo):
+                    journal.record(result)
+                    count_current += 1
+                    update_progress_bar(count_current, None)
+            if finished:
+                return
+            if not rows:
+                await asyncio.sleep(QUEUE_POLL_INTERVAL)
+
+    logger.info(f"Queued the repos of {journal.account}, waiting for the workers' results")
+    tasks = [asyncio.create_task(feed()), asyncio.create_task(collect())]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def run_queue_worker(ARGS, provider_name, username, work_queue, worker=None):
+    """Scan the repos claimed from a work queue until it is sealed and drained.
+
+    Args:
+        ARGS: Command line arguments (see args_scan) for the scan options
+        provider_name: Repository provider of the account
+        username: The user or organisation being scanned
+        work_queue: WorkQueue shared with the coordinator
+        worker: Name of this worker (default host name and process id)
+
+    Returns:
+        Number of repos scanned by this worker
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    lease = getattr(ARGS, 'lease_timeout', None) or DEFAULT_LEASE_TIMEOUT
+    probe_mode = getattr(ARGS, 'probe', None) or "head"
+    strategy = getattr(ARGS, 'strategy', None) or "probe"
+    license_files = license_file_candidates()
+    retry_policy = probe_retry_policy()
+    base_url = getattr(ARGS, 'base_url', None)
+    namespace = repobase.instance_name(provider_name, base_url)
+    account = f"{namespace}:{username}"
+
+    # The coordinator clears the cache, see worker_args
+    pool, cache, validators, scheduler = open_scan_resources(worker_args(ARGS))
+    user = None
+    if strategy == "listing":
+        user = repobase.create_provider(provider_name, username, base_url)
+        user.session = pool
+    scheduler.register(account)
+    scanned = 0
+
+    async def scan(key, payload):
+        """Scan one claimed repo and complete it with its result."""
+        async with scheduler.slot(account):
+            result = await _scan_repo(repobase.Repo(**payload), namespace, user, pool, cache,
+                                      license_files, probe_mode, strategy, retry_policy)
+        await asyncio.to_thread(work_queue.complete, key, result.to_dict())
+
+    try:
+        while True:
+            items = await asyncio.to_thread(work_queue.claim, worker, DEFAULT_CLAIM_SIZE, lease)
+            if not items:
+                # Repos leased by other workers may still come back when their lease expires
+                if await asyncio.to_thread(work_queue.sealed) and \
+                        await asyncio.to_thread(work_queue.outstanding) == 0:
+                    break
+                await asyncio.sleep(QUEUE_POLL_INTERVAL)
+                continue
+            await asyncio.gather(*(scan(key, payload) for key, payload in items))
+            scanned += len(items)
+            update_progress_bar(scanned, None)
+    finally:
+        await scheduler.unregister(account)
+        close_scan_resources(ARGS, pool, cache, validators, scheduler)
+    logger.info(f"Worker {worker} scanned {scanned} repos of {account}")
+    return scanned
+
+
+async def args_queue_worker(ARGS):
+    """The scan command in the worker role - scan repos queued by a coordinator.
+
+    Args:
+        ARGS: Command line arguments (see args_scan) with queue set
+    """
+    namespace = repobase.instance_name(ARGS.provider, getattr(ARGS, 'base_url', None))
+    work_queue = open_work_queue(ARGS.queue, f"{namespace}:{ARGS.scan}")
+    try:
+        await run_queue_worker(ARGS, ARGS.provider, ARGS.scan, work_queue)
+    finally:
+        work_queue.close()
@@ -0,0 +1,108 @@
+"""Append-only checkpoint journal of per-repo scan results."""
+import os
+import json
+import logging
+from typing import Iterator, List, Set
+
+from ghlicense.scanner.result import ScanResult, ScanStatus
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 2
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def journal_path(report_file_name: str) -> str:
+    """Return the journal path kept next to a report file."""
+    return os.path.splitext(report_file_name)[0] + JOURNAL_SUFFIX
+
+
+class ScanJournal:
+    """JSONL journal recording each repo's result as soon as it is scanned.
+
+    The first line names the scanned account; every other line holds one
+    repo's ScanResult. Lines are flushed as they are written, so a scan killed by
+    a network drop or Ctrl-C loses at most the repos still in flight, and a
+    resumed scan only has to scan the repos missing from the journal. Only
+    the repo names are kept in memory; results are read back from the file.
+    """
+
+    def __init__(self, path: str, account: str, resume: bool = False) -> None:
+        """ScanJournal class constructor
+
+        Keyword arguments:
+        path -- The journal file.
+        account -- The "provider:user" account the journal belongs to.
+        resume -- Keep the results of an earlier run of the same account (default False).
+        """
+        self.path: str = path
+        self.account: str = account
+        self.done: Set[str] = set()
+        previous = self._load() if resume else []
+        if previous:
+            logger.info(f"Resuming from {self.path}: {len(previous)} repos already scanned")
+        # A resumed journal is rewritten, dropping incomplete results and cut lines
+        self._file = open(self.path, "w", encoding="UTF-8")
+        self._write({"journal": JOURNAL_VERSION, "account": self.account})
+        for entry in previous:
+            self.done.add(entry["repo"])
+            self._write(entry)
+
+    def _load(self) -> List[dict]:
+        """Read the complete results of an earlier run of the same account."""
+        entries = []
+        try:
+            with open(self.path, "r", encoding="UTF-8") as journal_file:
+                header = json.loads(journal_file.readline() or "{}")
+                if header.get("journal") != JOURNAL_VERSION or header.get("account") != self.account:
+                    logger.warning(f"Ignoring {self.path}, it is not a journal of {self.account}")
+                    return []
+                for entry in self._entries(journal_file):
+                    # Repos whose status was unknown are scanned again
+                    if entry.get("status") != ScanStatus.UNKNOWN.value:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            logger.warning(f"Ignoring unreadable journal {self.path}")
+        return entries
+
+    @staticmethod
+    def _entries(journal_file) -> Iterator[dict]:
+        """Yield the result lines of an open journal, skipping cut lines."""
+        for line in journal_file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line of a killed scan may be cut short
+                continue
+            if "repo" in entry:
+                yield entry
+
+    def _write(self, entry: dict) -> None:
+        """Append one line and flush it to disk."""
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def is_done(self, full_name: str) -> bool:
+        """Return whether a repo's result is already journaled."""
+        return full_name in self.done
+
+    def record(self, result: ScanResult) -> None:
+        """Append a repo's result to the journal."""
+        self.done.add(result.repo)
+        self._write(result.to_dict())
+
+    def results(self) -> Iterator[ScanResult]:
+        """Stream the result of every journaled repo back from the file."""
+        self._file.flush()
+        with open(self.path, "r", encoding="UTF-8") as journal_file:
+            journal_file.readline()
+            for entry in self._entries(journal_file):
+                yield ScanResult.from_dict(entry)
+
+    def close(self, remove: bool = False) -> None:
+        """Close the journal, deleting it once the report no longer needs it."""
+        self._file.close()
+        if remove:
+            os.remove(self.path)
@@ -1,11 +1,34 @@
 """Repository scanning functionality."""
 import sys
+import argparse
 import time
 import logging
 import asyncio
-import urllib.request
 import urllib.error
+import urllib.parse
 from ghlicense import repobase
+from ghlicense.cache import ScanCache, ValidatorCache, DEFAULT_CACHE_TTL
+from ghlicense.scanner.detect import find_license_file
+from ghlicense.scanner.journal import ScanJournal, journal_path
+from ghlicense.scanner.report import open_report, report_extension, status_line
+from ghlicense.scanner.result import ScanResult, ScanStatus
+from ghlicense.scanner.scheduler import FairScheduler, DEFAULT_SCAN_CONCURRENCY
+from ghlicense.utils.http import HTTPPool, DEFAULT_MAX_CONNECTIONS_PER_HOST
+from ghlicense.utils.ratelimit import BUDGETS
+from ghlicense.utils.retry import (
+    async_retry,
+    RateLimitError,
+    TransientError,
+    RetryPolicy,
+    RetryBudget,
+    CircuitBreaker,
+)
+from ghlicense.utils.concurrency import (
+    AdaptiveLimiter,
+    DEFAULT_MIN_CONCURRENCY,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_TARGET_LATENCY,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +42,15 @@ def print_license_status(msg):
 
 
 def update_progress_bar(current, total):
-    """Display a progressbar using ASCII characters alongwith the status."""
+    """Display a progressbar using ASCII characters alongwith the status.
+
+    While the total is not known yet (None) an indeterminate counter is shown.
+    """
+    if not total:
+        sys.stdout.write("|" + "." * (current % 40) + " " * (40 - current % 40))
+        sys.stdout.write(f" | Scanned {current} repos, still listing... \r")
+        sys.stdout.flush()
+        return
     sys.stdout.write("|")
     sys.stdout.write("#" * int(current * 40 / total))
     sys.stdout.write("-" * (40 - int(current * 40 / total)))
@@ -27,61 +58,286 @@ def update_progress_bar(current, total):
     sys.stdout.flush()
 
 
-def _fetch_license_file(url):
-    """Synchronous function to fetch a license file (runs in executor)."""
-    urllib.request.urlretrieve(url)
+# How a license file is probed: a bodyless HEAD, a single-byte ranged GET,
+# or a full GET of the file
+PROBE_MODES = ("head", "range", "get")
+# Statuses returned by hosts that refuse HEAD requests
+HEAD_BLOCKED_CODES = (403, 405, 501)
+# "probe" requests each candidate file, "listing" reads the repo root once,
+# "graphql" prefetches licenses and root listings while listing the repos
+SCAN_STRATEGIES = ("probe", "listing", "graphql")
+# Statuses meaning the probed file does not exist
+MISSING_CODES = (404, 410)
+# Probe retries: attempts per file, seconds per file, and retries per scan
+PROBE_ATTEMPTS = 3
+PROBE_DEADLINE = 20.0
+PROBE_RETRY_BUDGET = 500
+# Scan tasks of one account alive at once, the listing waits beyond that
+MAX_PENDING_SCANS = 1000
+
+
+def probe_retry_policy():
+    """Return the retry policy for one scan's license probes.
+
+    Jittered so probes that failed together do not retry together, bounded per
+    file and per scan, and failing fast once a host keeps failing.
+    """
+    return RetryPolicy(max_retries=PROBE_ATTEMPTS, base_delay=0.5, max_delay=5.0, jitter="full",
+                       deadline=PROBE_DEADLINE, budget=RetryBudget(PROBE_RETRY_BUDGET),
+                       breaker=CircuitBreaker())
+
+
+def _probe_host(url, *args, **kwargs):
+    """Return the host a probe URL belongs to, the key of its circuit."""
+    return urllib.parse.urlsplit(url).netloc
+
+
+async def _fetch_license_file(url, pool, probe_mode="head"):
+    """Check that a license file exists through the shared connection pool.
+
+    200 and 206 mean found and are returned. 429 raises RateLimitError and
+    5xx TransientError, both retryable; any other status raises
+    urllib.error.HTTPError. In "head" mode a host refusing HEAD is retried
+    with a ranged GET.
+    """
+    if probe_mode == "head":
+        response = await pool.request("HEAD", url)
+        if response.status in HEAD_BLOCKED_CODES:
+            response = await pool.request("GET", url, headers={"Range": "bytes=0-0"})
+    elif probe_mode == "range":
+        response = await pool.request("GET", url, headers={"Range": "bytes=0-0"})
+    else:
+        response = await pool.request("GET", url)
+    if response.status in (200, 206):
+        return response.status
+    if response.status == 429:
+        raise RateLimitError(f"429 Too Many Requests: {url}", response=response)
+    if response.status >= 500:
+        raise TransientError(f"{response.status} {response.reason}: {url}", response=response)
+    raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+
+
+async def _iter_scan_repos(user, pool, strategy):
+    """Yield the repos to scan page by page, using GraphQL when requested.
+
+    A GraphQL failure falls back to the provider's REST listing, skipping
+    the repos GraphQL already yielded.
+    """
+    seen = set()
+    if strategy == "graphql":
+        try:
+            async for repo in user.iter_repos_graphql(pool):
+                seen.add(repo.full_name)
+                yield repo
+            return
+        except Exception as e:
+            logger.warning(f"GraphQL lookup unavailable ({e}), falling back to the REST scan")
+    async for repo in user.iter_repos():
+        if repo.full_name not in seen:
+            yield repo
+
+
+async def _find_license_in_listing(repo, license_files, repo_provider, pool):
+    """Return the license file name found in the repo root listing, or None."""
+    names = await repo_provider.list_root_files(repo, pool)
+    return find_license_file(names, license_files)
 
 
-async def loop_repo_scan(repo, license_files, repo_provider=None):
+async def loop_repo_scan(repo, license_files, repo_provider=None, pool=None, probe_mode="head",
+                         strategy="probe", retry_policy=None):
     """Scan a single repository for license files (async version).
     
     Args:
         repo: Repository object with raw_base_url, repo_url, full_name, and fork attributes
         license_files: List of license file names to check
-        
+        pool: Shared HTTPPool used for the probes (the provider's session, or a
+            private pool, if None)
+        probe_mode: One of PROBE_MODES, how each candidate file is requested
+        repo_provider: Provider instance, required by the "listing" strategy
+        strategy: One of SCAN_STRATEGIES; "listing" falls back to probes on errors.
+            Repos whose root_files or license were prefetched by the provider need no request.
+        retry_policy: RetryPolicy of the probes (a private probe_retry_policy() if None)
+
+    A probe that still fails after its retries (429, 5xx, timeouts) or gets
+    any other unexpected status leaves the repo unknown instead of missing.
+
     Returns:
-        Tuple of (output_string, count_license, count_no_license, count_forked)
+        ScanResult of the repo
     """
-    license_url = repo.raw_base_url
-    repo_url = repo.repo_url
-    to_print = ""
-    count_license = 0
-    count_no_license = 0
-    count_forked = 0
+    if pool is None and isinstance(repo_provider, repobase.Provider):
+        pool = repo_provider.session
+    if pool is None:
+        async with HTTPPool() as own_pool:
+            return await loop_repo_scan(repo, license_files, repo_provider, own_pool, probe_mode, strategy,
+                                        retry_policy)
+    if retry_policy is None:
+        retry_policy = probe_retry_policy()
 
-    # Look for a License file in the root directory of the repo
-    for license_file in license_files:
-        missing = True
+    started = time.monotonic()
+    found_file = None
+    probe_files = license_files
+    if repo.root_files is not None:
+        # The provider already listed the repo root while enumerating repos
+        found_file = find_license_file(repo.root_files, license_files)
+        probe_files = []
+    elif repo.license_spdx:
+        # The provider detected the license while listing repos
+        found_file = repo.license_file
+        probe_files = []
+    elif strategy == "listing" and repo_provider is not None:
         try:
-            # Run synchronous urllib request in executor to avoid blocking
-            await asyncio.to_thread(_fetch_license_file, license_url + license_file)
-        except urllib.error.HTTPError as err:
-            if err.code == 404:
-                missing = True
-        except Exception:
-            # Other errors (connection issues, timeouts) also mean missing
-            missing = True
+            found_file = await _find_license_in_listing(repo, license_files, repo_provider, pool)
+        except Exception as e:
+            logger.debug(f"Root listing failed for {repo.full_name}, probing files instead: {e}")
         else:
-            license_status = f"✓ Found: {license_url}{license_file}"
-            print_license_status(license_status)
-            to_print += f"Repo: {repo.full_name}\nURL: {repo_url} \n"
-            to_print += f"{license_status} \n"
-            missing = False
-            count_license += 1
-            break
-
-    if missing:
-        license_status = "✗ Missing the license, this repo is proprietary!"
-        print_license_status(license_status)
-        to_print += f"Repo: {repo.full_name}\nURL: {repo_url} \n"
-        to_print += f"{license_status} \n"
-        count_no_license += 1
-        if repo.fork:
-            to_print += " ! Is a fork, check the original or create a PR!\n"
-            count_forked += 1
-
-    to_print += "\n"
-    return to_print, count_license, count_no_license, count_forked
+            # The listing is authoritative, no file needs probing
+            probe_files = []
+
+    # Look for a License file in the root directory of the repo
+    probe = async_retry(policy=retry_policy, host=_probe_host)(_fetch_license_file)
+    probe_error = None
+    http_status = None
+    for license_file in probe_files:
+        try:
+            http_status = await probe(repo.raw_url(license_file), pool, probe_mode)
+        except urllib.error.HTTPError as e:
+            http_status = e.code
+            if e.code not in MISSING_CODES:
+                probe_error = f"HTTP {e.code}"
+            continue
+        except Exception as e:
+            # Retries exhausted, deadline reached or circuit open: the file may still exist
+            http_status = getattr(getattr(e, 'response', None), 'status', None)
+            probe_error = str(e) or type(e).__name__
+            continue
+        found_file = license_file
+        break
+
+    result = ScanResult(repo.full_name, repo.repo_url, ScanStatus.UNLICENSED, spdx_id=repo.license_spdx,
+                        fork=repo.fork, http_status=http_status)
+    if found_file is not None:
+        result.status = ScanStatus.LICENSED
+        result.license_file = found_file
+        result.license_url = repo.raw_url(found_file)
+    elif repo.license_spdx:
+        result.status = ScanStatus.LICENSED
+    elif probe_error is not None:
+        result.status = ScanStatus.UNKNOWN
+        result.detail = probe_error
+    result.latency = time.monotonic() - started
+    print_license_status(status_line(result))
+    return result
+
+
+def license_file_candidates():
+    """Return the license file names probed in each repo, most common first."""
+    license_base_name = "license"
+    # This is ordered by the most common extensions
+    license_extensions = ["", ".md", ".txt"]
+    license_files = []
+
+    # This is ordered like this because most license file names are in full caps
+    for license_name in [license_base_name.upper(), license_base_name]:
+        license_files.extend([license_name + extension for extension in license_extensions])
+    return license_files
+
+
+def default_report_name(username, provider_name, report_format="md", base_url=None):
+    """Return the default report file name of an account.
+
+    A self-hosted instance's host is part of the name, so the same account
+    name on two instances gets two reports; a GitLab subgroup path does not
+    create directories.
+    """
+    name = f"{username}-{provider_name}"
+    if base_url:
+        name += "-" + repobase.instance_name(provider_name, base_url).split("@", 1)[1]
+    name = name.replace("/", "-").replace(":", "-")
+    return f"{name}-license-report{report_extension(report_format)}"
+
+
+def open_scan_resources(ARGS, shared_caches=None):
+    """Create the connection pool, caches and scheduler shared by every scanned account.
+
+    Args:
+        ARGS: Command line arguments (see args_scan) for the scan options
+        shared_caches: (cache, validators) of another provider instance to
+            reuse instead of opening new ones (default None)
+
+    Returns:
+        Tuple of (pool, cache, validators, scheduler); the caches are None when disabled
+    """
+    # Results of repos unchanged since a previous scan are reused, and
+    # requests for changed ones are sent conditionally (ETag / Last-Modified)
+    cache = None
+    validators = None
+    if shared_caches is not None:
+        cache, validators = shared_caches
+    elif getattr(ARGS, 'cache', False):
+        cache_ttl = getattr(ARGS, 'cache_ttl', None)
+        cache = ScanCache(ttl=DEFAULT_CACHE_TTL if cache_ttl is None else cache_ttl)
+        validators = ValidatorCache(cache.path)
+        # Stored responses are not scoped to a user, --clear-cache drops them
+        # all; otherwise they expire with the scan results
+        if getattr(ARGS, 'clear_cache', False):
+            validators.clear()
+        elif cache.ttl:
+            validators.prune(cache.ttl)
+
+    # The number of concurrent scans is either fixed or driven by an AIMD
+    # window that reacts to latency, 429s and the remaining rate limit quota
+    concurrency = getattr(ARGS, 'concurrency', None) or DEFAULT_SCAN_CONCURRENCY
+    limiter = None
+    ceiling = concurrency
+    if getattr(ARGS, 'concurrency_mode', None) == "adaptive":
+        limiter = AdaptiveLimiter(
+            initial=concurrency,
+            minimum=getattr(ARGS, 'min_concurrency', None) or DEFAULT_MIN_CONCURRENCY,
+            maximum=getattr(ARGS, 'max_concurrency', None) or DEFAULT_MAX_CONCURRENCY,
+            target_latency=getattr(ARGS, 'target_latency', None) or DEFAULT_TARGET_LATENCY,
+        )
+        ceiling = limiter.maximum
+    scheduler = FairScheduler(concurrency, limiter)
+
+    # One keep-alive pool for the whole scan, shared by every probe; by default
+    # it allows as many connections per host as repos can be scanned at once
+    max_connections = getattr(ARGS, 'max_connections', None) or max(DEFAULT_MAX_CONNECTIONS_PER_HOST, ceiling)
+    pool = HTTPPool(max_connections_per_host=max_connections, validators=validators, limiter=limiter)
+    return pool, cache, validators, scheduler
+
+
+def worker_args(ARGS):
+    """Return a copy of the scan arguments for a worker, which can be sent to another process.
+
+    The parent (or the coordinator) clears the cache once before the workers
+    start, so a worker never clears it while the others write to it.
+    """
+    args = argparse.Namespace(**{name: getattr(ARGS, name) for name in dir(ARGS) if not name.startswith('_')})
+    args.clear_cache = False
+    return args
+
+
+def close_scan_resources(ARGS, pool, cache, validators, scheduler=None):
+    """Close the resources created by open_scan_resources."""
+    stats = pool.stats()
+    logger.info(f"HTTP pool: {stats['requests']} requests, {stats['opened']} connections opened, "
+                f"{stats['reused']} reused")
+    pool.close()
+    if scheduler is not None and scheduler.limiter is not None:
+        logger.info(f"Adaptive concurrency window: {scheduler.limiter.limit} "
+                    f"(peak {scheduler.limiter.peak})")
+    for budget in BUDGETS.values():
+        if budget.waited:
+            logger.info(f"Paced {budget.name} to its rate limit: waited {budget.waited:.1f}s, "
+                        f"{budget.remaining} of {budget.limit} requests left")
+    if cache:
+        if getattr(ARGS, 'cache_stats', False):
+            stats = cache.stats()
+            logger.info(f"Scan cache: {stats['hits']} hits, {stats['misses']} misses, "
+                        f"{stats['entries']} entries in {cache.path}")
+            logger.info(f"Conditional requests answered 304 Not Modified: {validators.revalidated}")
+        cache.close()
+        validators.close()
 
 
 async def args_scan(ARGS):
@@ -92,19 +348,45 @@ async def args_scan(ARGS):
             - scan: username to scan
             - provider: repository provider (github, bitbucket, gitlab)
             - report: optional report filename
+            - format: optional report format (md, json, jsonl or csv)
+            - max_connections: optional keep-alive connections per host
+            - probe: optional probe mode (head, range or get)
+            - strategy: optional detection strategy (probe, listing or graphql)
+            - cache: optional, reuse results of unchanged repos from the scan cache
+            - cache_ttl: optional maximum age in seconds of cached results
+            - clear_cache: optional, drop this user's cached results and the stored HTTP responses first
+            - cache_stats: optional, log cache statistics after the scan
+            - concurrency: optional number of repos scanned concurrently
+              (the starting window in adaptive mode)
+            - concurrency_mode: optional, fixed or adaptive
+            - min_concurrency / max_concurrency: optional adaptive window bounds
+            - target_latency: optional slowest healthy response in adaptive mode
+            - resume: optional, reuse the journal of an interrupted scan and
+              scan only the repos missing from it
+            - workers: optional number of worker processes the repos are
+              sharded across (1 scans in this process)
+            - queue: optional work queue (SQLite file or redis:// URL) the
+              repos are scanned through by separate workers
+            - role: optional, coordinator (list the repos and write the
+              report) or worker (scan the queued repos)
+            - lease_timeout: optional seconds a worker holds claimed repos
+            - skip_archived: optional, leave archived repos out of the listing
+            - visibility: optional, only list repos of this visibility
+            - base_url: optional web URL of a self-hosted GitHub Enterprise
+              or GitLab instance
     """
-    # Initialise specified repo provider
-    # (or use the default provider, if one is not specified)
-    repo_provider = repobase.get_provider(ARGS.provider)
-
-    # Obtain the username passed on the cmd-line in "scan" mode
-    user = repo_provider(ARGS.scan)
+    if getattr(ARGS, 'queue', None) and getattr(ARGS, 'role', None) == "worker":
+        # Imported here, the distributed module builds on this one
+        from ghlicense.scanner.distributed import args_queue_worker
+        await args_queue_worker(ARGS)
+        return
 
     # Create the specified license report file
     # (or use the default license report file name, if one is not specified)
     report_file_name = "default"
     if ARGS.report is None:
-        report_file_name = f"{ARGS.scan}-{ARGS.provider}-license-report.md"
+        report_file_name = default_report_name(ARGS.scan, ARGS.provider, getattr(ARGS, 'format', 'md'),
+                                               getattr(ARGS, 'base_url', None))
         logger.info(f' No report file name found, using default "{report_file_name}"')
     else:
         # Ensure .md extension
@@ -112,115 +394,166 @@ async def args_scan(ARGS):
             report_file_name += '.md'
         report_file_name = ARGS.report
 
-    # Start scanning user's public repos (Markdown format)
-    with open(report_file_name, "w", encoding="UTF-8") as report_file:
-        # Markdown header
-        report_file.write(f"# License Scan Report: {ARGS.scan}\n\n")
-        report_file.write(f"**Provider:** {ARGS.provider}\n")
-        report_file.write(f"**Scan Date:** {time.strftime('%c')}\n")
-        report_file.write(f"**Filter:** {ARGS.show if hasattr(ARGS, 'show') and ARGS.show else 'all'}\n\n")
-        report_file.write("---\n\n")
-        
-        # Track license status for filtering
-        licensed_repos = []
-        unlicensed_repos = []
-        
-        repos = list(user.get_repos())
-        count_total = len(repos)
-        count_current = 0
-        count_license = 0
-        count_no_license = 0
-        count_forked = 0
-
-        license_base_name = "license"
-        # This is ordered by the most common extensions
-        license_extensions = ["", ".md", ".txt"]
-        license_files = []
-
-        # This is ordered like this because most license file names are in full caps
-        for license_name in [license_base_name.upper(), license_base_name]:
-            license_files.extend([license_name + extension for extension in license_extensions])
-
-        to_print = ''
-        # For each repo found
-        logger.info('Downloading Repository list')
-
-        # Process repos concurrently using asyncio.gather
-        # Using a semaphore to limit concurrent requests (avoid rate limiting)
-        semaphore = asyncio.Semaphore(4)  # Match previous ThreadPool(processes=4)
-
-        async def scan_with_progress(repo):
-            """Scan a single repo with semaphore control and progress updates."""
-            nonlocal count_current, count_license, count_no_license, count_forked, licensed_repos, unlicensed_repos
-            async with semaphore:
-                logger.info(repo.full_name)
-                count_current += 1
-                result = await loop_repo_scan(repo, license_files)
-                _to_print, _count_license, _count_no_license, _count_forked = result
-                update_progress_bar(count_current, count_total)
-                # Track repos by license status for filtering
-                if _count_license > 0:
-                    licensed_repos.append(_to_print)
-                elif _count_no_license > 0:
-                    unlicensed_repos.append(_to_print)
-                return result
-
-        # Create tasks for all repos
-        tasks = [scan_with_progress(repo) for repo in repos]
-        results = await asyncio.gather(*tasks)
-
-        # Aggregate results
-        for _to_print, _count_license, _count_no_license, _count_forked in results:
-            to_print += _to_print
-            count_license += _count_license
-            count_no_license += _count_no_license
-            count_forked += _count_forked
-
-        # Filter repos based on --show option
-        show_filter = ARGS.show if hasattr(ARGS, 'show') and ARGS.show else "all"
-        
-        if show_filter == "all":
-            report_file.write("## All Repositories\n\n")
-        elif show_filter == "licensed":
-            report_file.write("## Licensed Repositories\n\n")
-        elif show_filter == "unlicensed":
-            report_file.write("## Unlicensed Repositories\n\n")
-        
-        
-        # Filter and aggregate output
-        filtered_output = ""
-        if show_filter == "all":
-            filtered_output = to_print
-        elif show_filter == "licensed":
-            for repo_content in licensed_repos:
-                filtered_output += repo_content
-        elif show_filter == "unlicensed":
-            for repo_content in unlicensed_repos:
-                filtered_output += repo_content
-        
-        report_file.write(filtered_output)
-        
-        unlicensed_urls = []
-        for repo_content in unlicensed_repos:
-            for line in repo_content.split('\n'):
-                if line.startswith("URL: "):
-                    url = line[5:].strip()
-                    unlicensed_urls.append(f"- [{url}]({url})")
-                    break
-        
-        # Statistics section in markdown table format
-        report_file.write("\n## Statistics\n\n")
-        report_file.write("| Metric | Count |\n")
-        report_file.write("|--------|-------|\n")
-        report_file.write(f"| Repos with License | {count_license} |\n")
-        report_file.write(f"| Repos without License | {count_no_license} |\n")
-        report_file.write(f"| Forked without License | {count_forked} |\n")
-        report_file.write(f"| Total Repos | {count_no_license + count_license} |\n")
-        
-        # Clickable URLs section
-        if unlicensed_urls:
-            report_file.write("\n## Unlicensed Repositories (Click to Visit)\n\n")
-            for url_line in unlicensed_urls:
-                report_file.write(f"{url_line}\n")
-        
-        report_file.close()
+    pool, cache, validators, scheduler = open_scan_resources(ARGS)
+    try:
+        await scan_account(ARGS, ARGS.provider, ARGS.scan, report_file_name, pool, scheduler, cache,
+                           base_url=getattr(ARGS, 'base_url', None))
+    finally:
+        close_scan_resources(ARGS, pool, cache, validators, scheduler)
+
+
+async def scan_account(ARGS, provider_name, username, report_file_name, pool, scheduler, cache=None,
+                       base_url=None):
+    """Scan all public repos of one account and write its report.
+
+    Args:
+        ARGS: Command line arguments (see args_scan) for the scan options
+        provider_name: Repository provider of the account
+        username: The user or organisation to scan
+        report_file_name: Path of the report to write, in the --format format
+        pool: HTTPPool of the account's provider instance
+        scheduler: FairScheduler handing out the instance's scan slots
+        cache: Optional ScanCache
+        base_url: Web URL of a self-hosted provider instance (default the public host)
+
+    Returns:
+        Dict with the licensed, unlicensed, forked, unknown and total repo counts
+    """
+    # Initialise specified repo provider, on its self-hosted instance if any;
+    # the provider lists the repos through the scan's pool, which also sends
+    # the probes
+    user = repobase.create_provider(provider_name, username, base_url)
+    user.session = pool
+    user.skip_archived = getattr(ARGS, 'skip_archived', False)
+    user.visibility = getattr(ARGS, 'visibility', None)
+
+    # Cache entries, journals and work queues of each instance are kept apart
+    namespace = repobase.instance_name(provider_name, base_url)
+    if cache and getattr(ARGS, 'clear_cache', False):
+        removed = cache.invalidate(namespace, username)
+        logger.info(f"Cleared {removed} cached results for {username}")
+
+    # Every result is journaled as soon as it is known, so an interrupted scan
+    # can be resumed; the report is then streamed from the journal
+    account = f"{namespace}:{username}"
+    journal = ScanJournal(journal_path(report_file_name), account, resume=getattr(ARGS, 'resume', False))
+    workers = getattr(ARGS, 'workers', None) or 1
+    try:
+        if getattr(ARGS, 'queue', None):
+            # Imported here, the distributed module builds on this one
+            from ghlicense.scanner.distributed import coordinate_scan
+            from ghlicense.workqueue import open_work_queue
+            work_queue = open_work_queue(ARGS.queue, account)
+            try:
+                await coordinate_scan(ARGS, user, pool, journal, work_queue)
+            finally:
+                work_queue.close()
+        elif workers > 1:
+            # Imported here, the shard module builds on this one
+            from ghlicense.scanner.shard import scan_sharded
+            await scan_sharded(ARGS, provider_name, username, user, pool, journal, workers, base_url)
+        else:
+            await _scan_repos(ARGS, namespace, user, pool, scheduler, cache, journal)
+    except BaseException:
+        journal.close()
+        raise
+
+    # Filter repos based on --show option
+    show_filter = ARGS.show if hasattr(ARGS, 'show') and ARGS.show else "all"
+    extra_stats = []
+    if scheduler.limiter is not None:
+        extra_stats = [("Concurrency Window", scheduler.limiter.limit),
+                       ("Peak Concurrency Window", scheduler.limiter.peak)]
+    report_format = getattr(ARGS, 'format', 'md')
+    with open_report(report_format, report_file_name, username, namespace, show_filter) as report:
+        report.add_all(journal.results())
+        counts = report.finish(extra_stats)
+    journal.close(remove=True)
+
+    if counts["unknown"]:
+        logger.warning(f"{counts['unknown']} repos of {username} could not be checked, rescan to retry them")
+    return counts
+
+
+def _cached_result(cache, namespace, repo, strategy):
+    """Return the cached ScanResult of an unchanged repo scanned with the strategy, or None."""
+    cached = cache.get(namespace, repo.full_name, repo.revision, strategy) if cache else None
+    if cached is None:
+        return None
+    try:
+        return ScanResult.from_dict(cached)
+    except ValueError:
+        # Written by an older version, scan the repo again
+        return None
+
+
+async def _scan_repo(repo, namespace, user, pool, cache, license_files, probe_mode, strategy, retry_policy):
+    """Return the ScanResult of one repo, from the scan cache when it is unchanged.
+
+    namespace is the provider instance (see repobase.instance_name) the
+    cached results are kept under.
+    """
+    result = _cached_result(cache, namespace, repo, strategy)
+    if result is None:
+        result = await loop_repo_scan(repo, license_files, user, pool=pool,
+                                      probe_mode=probe_mode, strategy=strategy,
+                                      retry_policy=retry_policy)
+        # Unknown results are not cached, so the next scan retries just those
+        if cache and result.status is not ScanStatus.UNKNOWN:
+            cache.put(namespace, repo.full_name, repo.revision, result.to_dict(), strategy)
+    return result
+
+
+async def _scan_repos(ARGS, namespace, user, pool, scheduler, cache, journal):
+    """Scan the repos of an account missing from its journal, journaling each result."""
+    probe_mode = getattr(ARGS, 'probe', None) or "head"
+    strategy = getattr(ARGS, 'strategy', None) or "probe"
+
+    # Unknown until the provider has listed every page
+    count_total = None
+    count_current = 0
+
+    license_files = license_file_candidates()
+    # One retry budget and set of host circuits for the whole account
+    retry_policy = probe_retry_policy()
+
+    # For each repo found
+    logger.info('Downloading Repository list')
+
+    # Process repos concurrently using asyncio.gather, with the number of
+    # concurrent scans bounded by the scheduler (avoid rate limiting)
+    account = journal.account
+    scheduler.register(account)
+
+    async def scan_with_progress(repo):
+        """Scan a single repo with scheduler control and progress updates."""
+        nonlocal count_current
+        async with scheduler.slot(account):
+            logger.info(repo.full_name)
+            count_current += 1
+            result = await _scan_repo(repo, namespace, user, pool, cache, license_files,
+                                      probe_mode, strategy, retry_policy)
+            journal.record(result)
+            update_progress_bar(count_current, count_total)
+
+    # Start scanning each repo as soon as its listing page arrives,
+    # skipping the repos a resumed scan already has in its journal. At most
+    # MAX_PENDING_SCANS tasks exist at once, finished ones are dropped
+    pending = set()
+    count_listed = 0
+    try:
+        async for repo in _iter_scan_repos(user, pool, strategy):
+            if journal.is_done(repo.full_name):
+                continue
+            if len(pending) >= MAX_PENDING_SCANS:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            pending.add(asyncio.create_task(scan_with_progress(repo)))
+            count_listed += 1
+        count_total = count_listed
+        await asyncio.gather(*pending)
+    finally:
+        for task in pending:
+            task.cancel()
+        await scheduler.unregister(account)
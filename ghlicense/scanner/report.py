@@ -0,0 +1,229 @@
+"""Streaming report writers (Markdown, JSON, JSON Lines and CSV)."""
+import csv
+import json
+import time
+import shutil
+import tempfile
+import datetime
+from typing import Any, Dict, Iterable, Tuple, Type
+
+from ghlicense.scanner.result import ScanResult, ScanStatus
+
+# Heading of the repo section for each --show filter
+SECTION_TITLES = {
+    "all": "## All Repositories",
+    "licensed": "## Licensed Repositories",
+    "unlicensed": "## Unlicensed Repositories",
+}
+
+# Columns of the machine-readable formats, in order; new ones are only appended
+REPORT_FIELDS = ("repo", "url", "status", "license_file", "spdx_id", "fork", "scanned_at")
+
+
+def status_line(result: ScanResult) -> str:
+    """Return the one-line license status of a result."""
+    if result.status is ScanStatus.LICENSED:
+        if result.license_url:
+            return f"✓ Found: {result.license_url}"
+        return f"✓ Found: {result.spdx_id} license detected by the provider"
+    if result.status is ScanStatus.UNKNOWN:
+        return f"? Unknown: the license could not be checked ({result.detail}), rescan to retry"
+    return "✗ Missing the license, this repo is proprietary!"
+
+
+def render_markdown(result: ScanResult) -> str:
+    """Return the Markdown block of a result in the report."""
+    text = f"Repo: {result.repo}\nURL: {result.url} \n{status_line(result)} \n"
+    if result.status is ScanStatus.UNLICENSED and result.fork:
+        text += " ! Is a fork, check the original or create a PR!\n"
+    return text + "\n"
+
+
+def report_record(result: ScanResult) -> Dict[str, Any]:
+    """Return the REPORT_FIELDS record of a result for the machine-readable formats."""
+    return {
+        "repo": result.repo,
+        "url": result.url,
+        "status": result.status.value,
+        "license_file": result.license_file,
+        "spdx_id": result.spdx_id,
+        "fork": result.fork,
+        "scanned_at": datetime.datetime.fromtimestamp(result.scanned_at, datetime.timezone.utc).isoformat(),
+    }
+
+
+class ReportWriter:
+    """Base of the report writers, fed one result at a time.
+
+    Results are written as soon as they are added and the statistics are
+    plain counters, so memory use stays flat however many repos the account
+    has. Every result is counted; only those matching the --show filter are
+    written.
+    """
+
+    def __init__(self, report_file_name: str, username: str, provider_name: str,
+                 show_filter: str = "all") -> None:
+        """ReportWriter class constructor
+
+        Keyword arguments:
+        report_file_name -- Path of the report to write.
+        username -- The scanned user or organisation.
+        provider_name -- The repository provider of the account.
+        show_filter -- "all", "licensed" or "unlicensed" (default "all").
+        """
+        self.username: str = username
+        self.provider_name: str = provider_name
+        self.show_filter: str = show_filter
+        self.counts: Dict[str, int] = {"licensed": 0, "unlicensed": 0, "forked": 0, "unknown": 0, "total": 0}
+        self._report_file = open(report_file_name, "w", encoding="UTF-8", newline="")
+        self.start()
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """Write what comes before the first result."""
+
+    def write(self, result: ScanResult) -> None:
+        """Write one result that matches the filter."""
+        raise NotImplementedError
+
+    def write_end(self, extra_stats: Iterable[Tuple[str, object]]) -> None:
+        """Write what comes after the last result."""
+
+    def add(self, result: ScanResult) -> None:
+        """Add one repo's result to the report."""
+        self.counts[result.status.value] += 1
+        self.counts["total"] += 1
+        if result.status is ScanStatus.UNLICENSED and result.fork:
+            self.counts["forked"] += 1
+        if self.show_filter == "all" or self.show_filter == result.status.value:
+            self.write(result)
+
+    def add_all(self, results: Iterable[ScanResult]) -> None:
+        """Add every result of an iterable."""
+        for result in results:
+            self.add(result)
+
+    def finish(self, extra_stats: Iterable[Tuple[str, object]] = ()) -> Dict[str, int]:
+        """Complete the report and return the counts.
+
+        Keyword arguments:
+        extra_stats -- Additional (metric, value) rows of the statistics.
+        """
+        self.write_end(extra_stats)
+        return dict(self.counts)
+
+    def close(self) -> None:
+        """Close the report file."""
+        self._report_file.close()
+
+
+class MarkdownReport(ReportWriter):
+    """Markdown license report.
+
+    The clickable links of unlicensed repos come after the statistics, so
+    they are spooled to a temporary file until the end.
+    """
+
+    def start(self) -> None:
+        self._unlicensed_urls = tempfile.TemporaryFile("w+", encoding="UTF-8")
+        # Markdown header
+        self._report_file.write(f"# License Scan Report: {self.username}\n\n")
+        self._report_file.write(f"**Provider:** {self.provider_name}\n")
+        self._report_file.write(f"**Scan Date:** {time.strftime('%c')}\n")
+        self._report_file.write(f"**Filter:** {self.show_filter}\n\n")
+        self._report_file.write("---\n\n")
+        if self.show_filter in SECTION_TITLES:
+            self._report_file.write(f"{SECTION_TITLES[self.show_filter]}\n\n")
+
+    def add(self, result: ScanResult) -> None:
+        if result.status is ScanStatus.UNLICENSED:
+            self._unlicensed_urls.write(f"- [{result.url}]({result.url})\n")
+        super().add(result)
+
+    def write(self, result: ScanResult) -> None:
+        self._report_file.write(render_markdown(result))
+
+    def write_end(self, extra_stats: Iterable[Tuple[str, object]]) -> None:
+        # Statistics section in markdown table format
+        self._report_file.write("\n## Statistics\n\n")
+        self._report_file.write("| Metric | Count |\n")
+        self._report_file.write("|--------|-------|\n")
+        self._report_file.write(f"| Repos with License | {self.counts['licensed']} |\n")
+        self._report_file.write(f"| Repos without License | {self.counts['unlicensed']} |\n")
+        self._report_file.write(f"| Forked without License | {self.counts['forked']} |\n")
+        self._report_file.write(f"| Repos with Unknown Status | {self.counts['unknown']} |\n")
+        self._report_file.write(f"| Total Repos | {self.counts['total']} |\n")
+        for metric, value in extra_stats:
+            self._report_file.write(f"| {metric} | {value} |\n")
+
+        # Clickable URLs section
+        if self.counts["unlicensed"]:
+            self._report_file.write("\n## Unlicensed Repositories (Click to Visit)\n\n")
+            self._unlicensed_urls.seek(0)
+            shutil.copyfileobj(self._unlicensed_urls, self._report_file)
+
+    def close(self) -> None:
+        self._unlicensed_urls.close()
+        super().close()
+
+
+class JSONLinesReport(ReportWriter):
+    """One REPORT_FIELDS JSON object per line, nothing else."""
+
+    def write(self, result: ScanResult) -> None:
+        self._report_file.write(json.dumps(report_record(result)) + "\n")
+
+
+class JSONReport(ReportWriter):
+    """A JSON document with the account, the results array and the statistics.
+
+    The array is streamed one record at a time, the statistics follow it.
+    """
+
+    def start(self) -> None:
+        self._report_file.write(f'{{"account": {json.dumps(self.username)}, '
+                                f'"provider": {json.dumps(self.provider_name)}, "results": [')
+        self._separator = "\n"
+
+    def write(self, result: ScanResult) -> None:
+        self._report_file.write(self._separator + json.dumps(report_record(result)))
+        self._separator = ",\n"
+
+    def write_end(self, extra_stats: Iterable[Tuple[str, object]]) -> None:
+        statistics = {**self.counts, **{metric: value for metric, value in extra_stats}}
+        self._report_file.write(f'\n], "statistics": {json.dumps(statistics)}}}\n')
+
+
+class CSVReport(ReportWriter):
+    """CSV with a header row of REPORT_FIELDS, ready for columnar loading."""
+
+    def start(self) -> None:
+        self._writer = csv.DictWriter(self._report_file, fieldnames=REPORT_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, result: ScanResult) -> None:
+        self._writer.writerow(report_record(result))
+
+
+REPORT_FORMATS: Dict[str, Type[ReportWriter]] = {
+    "md": MarkdownReport,
+    "json": JSONReport,
+    "jsonl": JSONLinesReport,
+    "csv": CSVReport,
+}
+
+
+def report_extension(report_format: str) -> str:
+    """Return the file extension of a report format."""
+    return "." + report_format
+
+
+def open_report(report_format: str, report_file_name: str, username: str, provider_name: str,
+                show_filter: str = "all") -> ReportWriter:
+    """Return the writer of a report format (one of REPORT_FORMATS)."""
+    return REPORT_FORMATS[report_format](report_file_name, username, provider_name, show_filter)
@@ -0,0 +1,64 @@
+"""Structured per-repo scan results."""
+import time
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class ScanStatus(str, Enum):
+    """Outcome of scanning one repo."""
+
+    LICENSED = "licensed"
+    UNLICENSED = "unlicensed"
+    # The license could not be checked (retries exhausted, unexpected status)
+    UNKNOWN = "unknown"
+
+
+@dataclass(slots=True)
+class ScanResult:
+    """The result of scanning one repo, rendered into reports separately.
+
+    Keyword arguments:
+    repo -- The repo's full name.
+    url -- The repo's web URL.
+    status -- The ScanStatus of the repo.
+    license_file -- Name of the matched license file (default None).
+    license_url -- URL of the matched license file (default None).
+    spdx_id -- License detected by the provider (default None).
+    fork -- Whether the repo is a fork (default False).
+    latency -- Seconds spent scanning the repo (default 0).
+    http_status -- Status of the response that decided the result (default None).
+    detail -- Why the status is unknown (default None).
+    scanned_at -- Unix time of the scan (default now).
+    """
+
+    repo: str
+    url: str
+    status: ScanStatus
+    license_file: Optional[str] = None
+    license_url: Optional[str] = None
+    spdx_id: Optional[str] = None
+    fork: bool = False
+    latency: float = 0.0
+    http_status: Optional[int] = None
+    detail: Optional[str] = None
+    scanned_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a JSON-serialisable dict."""
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScanResult":
+        """Build a result from a dict made by to_dict.
+
+        Raises ValueError for anything else, e.g. an old cache payload.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Not a scan result: {data!r}")
+        try:
+            return cls(**{**data, "status": ScanStatus(data["status"])})
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Not a scan result: {e}") from e
@@ -0,0 +1,71 @@
+"""Concurrency budget shared fairly between scanned accounts."""
+import asyncio
+import contextlib
+import logging
+from typing import AsyncIterator, Dict
+
+logger = logging.getLogger(__name__)
+
+# Repos scanned concurrently when no budget is given
+DEFAULT_SCAN_CONCURRENCY = 4
+
+
+class FairScheduler:
+    """Hand out scan slots from one global budget, fairly across accounts.
+
+    Each active account may hold at most an equal share of the budget, so a
+    huge organisation can not starve the small accounts scanned alongside it.
+    Shares are recomputed as accounts finish, so the whole budget stays in use.
+    """
+
+    def __init__(self, budget: int = DEFAULT_SCAN_CONCURRENCY, limiter=None) -> None:
+        """FairScheduler class constructor
+
+        Keyword arguments:
+        budget -- Total number of repos scanned concurrently (default 4).
+        limiter -- AdaptiveLimiter whose window replaces the fixed budget (default None).
+        """
+        self._budget: int = max(1, budget)
+        self.limiter = limiter
+        self._in_flight: Dict[str, int] = {}
+        self._total: int = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def budget(self) -> int:
+        """Total number of concurrent slots, the adaptive window if there is one."""
+        if self.limiter is not None:
+            return self.limiter.limit
+        return self._budget
+
+    def register(self, account: str) -> None:
+        """Declare an account that will request slots."""
+        self._in_flight.setdefault(account, 0)
+
+    async def unregister(self, account: str) -> None:
+        """Remove a finished account, giving its share to the others."""
+        async with self._condition:
+            self._in_flight.pop(account, None)
+            self._condition.notify_all()
+
+    def share(self) -> int:
+        """Return the number of slots each active account may hold."""
+        return max(1, -(-self.budget // max(1, len(self._in_flight))))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, account: str) -> AsyncIterator[None]:
+        """Hold one scan slot for an account for the duration of the block."""
+        self.register(account)
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._total < self.budget and self._in_flight[account] < self.share())
+            self._in_flight[account] += 1
+            self._total += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._total -= 1
+                if account in self._in_flight:
+                    self._in_flight[account] -= 1
+                self._condition.notify_all()
@@ -0,0 +1,204 @@
+"""Scanning one account's repos across worker processes."""
+import queue
+import zlib
+import asyncio
+import logging
+import multiprocessing
+
+from ghlicense import repobase
+# Registers the providers in a spawned worker
+import ghlicense.providers  # noqa: F401
+from ghlicense.scanner.repo_scan import (
+    MAX_PENDING_SCANS,
+    _iter_scan_repos,
+    _scan_repo,
+    close_scan_resources,
+    license_file_candidates,
+    open_scan_resources,
+    probe_retry_policy,
+    update_progress_bar,
+    worker_args,
+)
+from ghlicense.scanner.result import ScanResult
+
+logger = logging.getLogger(__name__)
+
+# Repos waiting in each worker's queue, the listing waits beyond that
+SHARD_QUEUE_SIZE = 500
+# Seconds between checks that the other side of a queue is still alive
+QUEUE_POLL_INTERVAL = 1.0
+
+
+def shard_of(full_name: str, workers: int) -> int:
+    """Return the worker a repo belongs to, stable across runs and processes."""
+    return zlib.crc32(full_name.encode("UTF-8")) % workers
+
+
+def _context():
+    """Return the multiprocessing context of the workers.
+
+    Workers are spawned rather than forked, the parent already runs an event
+    loop and the connection pool's threads.
+    """
+    return multiprocessing.get_context("spawn")
+
+
+async def _scan_shard(ARGS, provider_name, username, repo_queue, result_queue):
+    """Scan the repos received on repo_queue until None, sending back each result."""
+    probe_mode = getattr(ARGS, 'probe', None) or "head"
+    strategy = getattr(ARGS, 'strategy', None) or "probe"
+    license_files = license_file_candidates()
+    retry_policy = probe_retry_policy()
+    base_url = getattr(ARGS, 'base_url', None)
+    namespace = repobase.instance_name(provider_name, base_url)
+    account = f"{namespace}:{username}"
+
+    # Every worker has its own connection pool, scan cache connection and
+    # concurrency budget
+    pool, cache, validators, scheduler = open_scan_resources(ARGS)
+    user = None
+    if strategy == "listing":
+        user = repobase.create_provider(provider_name, username, base_url)
+        user.session = pool
+    scheduler.register(account)
+
+    async def scan(repo):
+        """Scan one repo within the worker's concurrency budget."""
+        async with scheduler.slot(account):
+            result = await _scan_repo(repo, namespace, user, pool, cache, license_files,
+                                      probe_mode, strategy, retry_policy)
+        result_queue.put(("result", None, result.to_dict()))
+
+    pending = set()
+    try:
+        while True:
+            try:
+                repo = await asyncio.to_thread(repo_queue.get, True, QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if repo is None:
+                break
+            if len(pending) >= MAX_PENDING_SCANS:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            pending.add(asyncio.create_task(scan(repo)))
+        await asyncio.gather(*pending)
+    finally:
+        for task in pending:
+            task.cancel()
+        await scheduler.unregister(account)
+        close_scan_resources(ARGS, pool, cache, validators, scheduler)
+
+
+def _run_worker(ARGS, provider_name, username, shard, repo_queue, result_queue):
+    """Entry point of a worker process, reporting how it ended on result_queue."""
+    try:
+        asyncio.run(_scan_shard(ARGS, provider_name, username, repo_queue, result_queue))
+    except Exception as e:
+        result_queue.put(("error", shard, f"{type(e).__name__}: {e}"))
+    else:
+        result_queue.put(("done", shard, None))
+
+
+async def _put(work_queue, item, process):
+    """Put an item on a worker's bounded queue, failing if the worker is gone."""
+    while True:
+        try:
+            return await asyncio.to_thread(work_queue.put, item, True, QUEUE_POLL_INTERVAL)
+        except queue.Full:
+            if not process.is_alive():
+                raise RuntimeError(f"Scan worker {process.name} exited with code {process.exitcode}")
+
+
+async def scan_sharded(ARGS, provider_name, username, user, pool, journal, workers, base_url=None):
+    """Scan the repos of an account missing from its journal across worker processes.
+
+    The repos are listed here and sharded by the CRC32 of their full name,
+    so a repo always goes to the same worker. Each worker runs its own event
+    loop, connection pool and --concurrency slots, which spreads the TLS and
+    parsing work over several CPUs. Results are sent back and journaled
+    here, so the report and its totals are built exactly as for a scan in
+    one process, and --resume works the same way.
+
+    Args:
+        ARGS: Command line arguments (see args_scan) for the scan options
+        provider_name: Repository provider of the account
+        username: The user or organisation to scan
+        user: Provider instance listing the repos
+        pool: HTTPPool used by the listing
+        journal: ScanJournal of the account
+        workers: Number of worker processes
+        base_url: Web URL of a self-hosted provider instance (default the public host)
+    """
+    strategy = getattr(ARGS, 'strategy', None) or "probe"
+    context = _context()
+    shard_args = worker_args(ARGS)
+    # A batch scans accounts of several instances with the same arguments
+    shard_args.base_url = base_url
+    repo_queues = [context.Queue(SHARD_QUEUE_SIZE) for _ in range(workers)]
+    result_queue = context.Queue()
+    processes = []
+    for shard in range(workers):
+        process = context.Process(target=_run_worker, name=f"shard-{shard}",
+                                  args=(shard_args, provider_name, username, shard,
+                                        repo_queues[shard], result_queue))
+        process.daemon = True
+        processes.append(process)
+
+    # Unknown until the provider has listed every page
+    count_total = None
+
+    async def feed():
+        """List the repos and hand each one to its worker."""
+        nonlocal count_total
+        count_listed = 0
+        async for repo in _iter_scan_repos(user, pool, strategy):
+            if journal.is_done(repo.full_name):
+                continue
+            shard = shard_of(repo.full_name, workers)
+            await _put(repo_queues[shard], repo, processes[shard])
+            count_listed += 1
+        count_total = count_listed
+        for shard in range(workers):
+            await _put(repo_queues[shard], None, processes[shard])
+
+    async def collect():
+        """Journal the workers' results until every worker is done."""
+        count_current = 0
+        running = set(range(workers))
+        exited = set()
+        while running:
+            try:
+                kind, shard, payload = await asyncio.to_thread(result_queue.get, True, QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                # A worker gone without saying so is given one more poll for
+                # its last messages to arrive
+                dead = {shard for shard in running if processes[shard].exitcode is not None}
+                if dead & exited:
+                    shard = min(dead & exited)
+                    raise RuntimeError(f"Scan worker {shard} exited with code {processes[shard].exitcode}")
+                exited = dead
+                continue
+            if kind == "result":
+                journal.record(ScanResult.from_dict(payload))
+                count_current += 1
+                update_progress_bar(count_current, count_total)
+            elif kind == "error":
+                raise RuntimeError(f"Scan worker {shard} failed: {payload}")
+            else:
+                running.discard(shard)
+
+    logger.info(f"Scanning with {workers} worker processes")
+    for process in processes:
+        process.start()
+    tasks = [asyncio.create_task(feed()), asyncio.create_task(collect())]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
@@ -1,4 +1,11 @@
 """Utility modules for ghlicense."""
-from ghlicense.utils.retry import async_retry, RateLimitError
+from ghlicense.utils.retry import (
+    async_retry, RateLimitError, TransientError, CircuitOpenError, RetryPolicy, RetryBudget, CircuitBreaker,
+)
+from ghlicense.utils.http import HTTPPool, HTTPResponse
+from ghlicense.utils.concurrency import AdaptiveLimiter
+from ghlicense.utils.ratelimit import RateLimitBudget, get_budget
+from ghlicense.utils.tokens import TokenPool
 
-__all__ = ['async_retry', 'RateLimitError']
\ No newline at end of file
+__all__ = ['async_retry', 'RateLimitError', 'TransientError', 'CircuitOpenError', 'RetryPolicy',
+           'RetryBudget', 'CircuitBreaker', 'HTTPPool', 'HTTPResponse', 'AdaptiveLimiter', 'RateLimitBudget', 'get_budget', 'TokenPool']
@@ -0,0 +1,87 @@
+"""Adaptive (AIMD) concurrency control driven by response health."""
+import time
+import logging
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 32
+# Responses slower than this (seconds) count as a congestion signal
+DEFAULT_TARGET_LATENCY = 2.0
+# Back off when less than this fraction of the rate limit quota is left
+DEFAULT_QUOTA_FLOOR = 0.1
+DECREASE_FACTOR = 0.5
+# Minimum seconds between two decreases, so one burst of errors halves once
+DECREASE_COOLDOWN = 1.0
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease concurrency window.
+
+    Every healthy response grows the window by 1/window, i.e. by about one
+    slot per window's worth of successes. A 429, an exhausted quota, a
+    remaining quota below the floor or a response slower than the target
+    latency halves it.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = DEFAULT_MIN_CONCURRENCY,
+                 maximum: int = DEFAULT_MAX_CONCURRENCY,
+                 target_latency: float = DEFAULT_TARGET_LATENCY,
+                 quota_floor: float = DEFAULT_QUOTA_FLOOR) -> None:
+        """AdaptiveLimiter class constructor
+
+        Keyword arguments:
+        initial -- Starting window (default 4).
+        minimum -- Smallest window (default 1).
+        maximum -- Largest window (default 32).
+        target_latency -- Slowest healthy response in seconds (default 2).
+        quota_floor -- Fraction of the rate limit kept in reserve (default 0.1).
+        """
+        self.minimum: int = max(1, minimum)
+        self.maximum: int = max(self.minimum, maximum)
+        self.window: float = float(min(max(initial, self.minimum), self.maximum))
+        self.target_latency: float = target_latency
+        self.quota_floor: float = quota_floor
+        self.peak: int = self.limit
+        self._last_decrease: float = 0.0
+
+    @property
+    def limit(self) -> int:
+        """The number of concurrent requests currently allowed."""
+        return int(self.window)
+
+    def record(self, latency: float, status: int, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Feed the outcome of one response into the controller.
+
+        Keyword arguments:
+        latency -- Seconds the request took.
+        status -- HTTP status of the response.
+        headers -- Response headers, read for X-RateLimit-Remaining/Limit.
+        """
+        if self._is_congested(latency, status, headers or {}):
+            self._decrease()
+        elif status < 500:
+            self.window = min(self.maximum, self.window + 1.0 / self.window)
+            self.peak = max(self.peak, self.limit)
+
+    def _is_congested(self, latency, status, headers) -> bool:
+        """Return whether a response signals overload or quota pressure."""
+        if status == 429 or status >= 500 or latency > self.target_latency:
+            return True
+        remaining = headers.get("X-RateLimit-Remaining") or headers.get("RateLimit-Remaining")
+        limit = headers.get("X-RateLimit-Limit") or headers.get("RateLimit-Limit")
+        try:
+            remaining, limit = int(remaining), int(limit)
+        except (TypeError, ValueError):
+            return False
+        return remaining == 0 or (limit > 0 and remaining / limit < self.quota_floor)
+
+    def _decrease(self) -> None:
+        """Halve the window, at most once per cooldown period."""
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.window = max(float(self.minimum), self.window * DECREASE_FACTOR)
+        logger.debug(f"Concurrency window reduced to {self.limit}")
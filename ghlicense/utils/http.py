@@ -0,0 +1,249 @@
+"""Pooled keep-alive HTTP client shared by the scanner."""
+import gzip
+import time
+import asyncio
+import http.client
+import logging
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from ghlicense.utils.ratelimit import get_budget
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+MAX_REDIRECTS = 5
+# Hosts a scan keeps busy at once (API, GraphQL, raw content, redirects); the
+# pool's threads cover the connection limit of each, started on demand
+EXECUTOR_HOSTS = 4
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+USER_AGENT = "gh-license"
+
+# Errors raised when a server silently dropped an idle keep-alive connection
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class HTTPResponse:
+    """A fully read HTTP response."""
+
+    def __init__(self, url: str, status: int, reason: str,
+                 headers: http.client.HTTPMessage, body: bytes) -> None:
+        """HTTPResponse class constructor
+
+        Keyword arguments:
+        url -- The URL that produced this response (after redirects).
+        status -- The HTTP status code.
+        reason -- The HTTP reason phrase.
+        headers -- The response headers (case-insensitive mapping).
+        body -- The response body.
+        """
+        self.url: str = url
+        self.status: int = status
+        self.reason: str = reason
+        self.headers: http.client.HTTPMessage = headers
+        self.body: bytes = body
+
+
+class HTTPPool:
+    """Keep-alive connection pool with a bounded set of connections per host.
+
+    Connections are standard library ``http.client`` connections which are
+    reused across requests to the same scheme/host/port, so a scan pays the
+    TCP and TLS handshake once per connection instead of once per probe.
+    The blocking socket I/O runs in the pool's own worker threads, as many as
+    its connections, to keep the event loop free.
+    Every request draws from the shared rate limit budget of its host, or of
+    its token when sent with a TokenPool. Full
+    GET responses are requested gzip-compressed and decompressed transparently.
+    The opened, reused and requests counters help tune the pool size.
+    """
+
+    def __init__(self, max_connections_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+                 timeout: float = DEFAULT_TIMEOUT, validators=None, limiter=None) -> None:
+        """HTTPPool class constructor
+
+        Keyword arguments:
+        max_connections_per_host -- Concurrent connections allowed per host (default 4).
+        timeout -- Socket timeout in seconds for each connection (default 10).
+        validators -- ValidatorCache used for conditional GET/HEAD requests (default None).
+        limiter -- AdaptiveLimiter fed with the latency and status of every response (default None).
+        """
+        self.max_connections_per_host: int = max(1, max_connections_per_host)
+        self.timeout: float = timeout
+        self.validators = validators
+        self.limiter = limiter
+        self.opened: int = 0
+        self.reused: int = 0
+        self.requests: int = 0
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._limits: Dict[Tuple[str, str], asyncio.Semaphore] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> "HTTPPool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the connections opened and reused and the requests sent."""
+        return {"opened": self.opened, "reused": self.reused, "requests": self.requests}
+
+    def close(self) -> None:
+        """Close every idle connection held by the pool and stop its threads."""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def request(self, method: str, url: str,
+                      headers: Optional[Mapping[str, str]] = None,
+                      body: Optional[bytes] = None,
+                      follow_redirects: bool = True,
+                      credentials=None) -> HTTPResponse:
+        """Send a request and return the fully read response.
+
+        Keyword arguments:
+        method -- The HTTP method.
+        url -- The absolute URL to request.
+        headers -- Extra request headers (default None).
+        body -- The request body (default None).
+        follow_redirects -- Whether to follow 3xx redirects (default True).
+        credentials -- TokenPool authenticating the request, its tokens' budgets
+                       replace the host's (default None). Redirects to another
+                       host are sent without it.
+        """
+        response = await self._send(method, url, headers, body, credentials)
+        redirects = 0
+        while follow_redirects and response.status in REDIRECT_CODES and redirects < MAX_REDIRECTS:
+            location = response.headers.get("Location")
+            if not location:
+                break
+            next_url = urllib.parse.urljoin(url, location)
+            if urllib.parse.urlsplit(next_url).netloc != urllib.parse.urlsplit(url).netloc:
+                credentials = None
+            url = next_url
+            if response.status == 303:
+                method, body = "GET", None
+            redirects += 1
+            response = await self._send(method, url, headers, body, credentials)
+        return response
+
+    async def _send(self, method: str, url: str,
+                    headers: Optional[Mapping[str, str]],
+                    body: Optional[bytes], credentials=None) -> HTTPResponse:
+        """Send a single request on a pooled connection."""
+        parsed = urllib.parse.urlsplit(url)
+        key = (parsed.scheme, parsed.netloc)
+        target = parsed.path or "/"
+        if parsed.query:
+            target += "?" + parsed.query
+        request_headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive"}
+        if headers:
+            request_headers.update(headers)
+        # A byte range of a compressed body could not be decompressed
+        if method == "GET" and "Range" not in request_headers:
+            request_headers.setdefault("Accept-Encoding", "gzip")
+        validator_key = None
+        if self.validators is not None and method in ("GET", "HEAD"):
+            validator_key = self.validators.request_key(method, url, headers)
+            request_headers.update(self.validators.conditional_headers(validator_key))
+
+        semaphore = self._limits.get(key)
+        if semaphore is None:
+            semaphore = self._limits[key] = asyncio.Semaphore(self.max_connections_per_host)
+
+        if credentials is not None and len(credentials):
+            token, budget = await credentials.acquire(url)
+            request_headers.update(credentials.auth_headers(token))
+        else:
+            budget = get_budget(url)
+            await budget.acquire()
+        if self._executor is None:
+            # The default executor has min(32, CPUs + 4) threads, fewer than
+            # the connections a large --max-connections allows
+            self._executor = ThreadPoolExecutor(self.max_connections_per_host * EXECUTOR_HOSTS,
+                                                thread_name_prefix="ghlicense-http")
+        loop = asyncio.get_running_loop()
+        async with semaphore:
+            connection, reused = self._checkout(key)
+            self.requests += 1
+            try:
+                status, reason, response_headers, data, will_close, latency = await loop.run_in_executor(
+                    self._executor, self._perform, connection, method, target, request_headers, body)
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection, retry once on a fresh one
+                connection = self._new_connection(key)
+                try:
+                    status, reason, response_headers, data, will_close, latency = await loop.run_in_executor(
+                        self._executor, self._perform, connection, method, target, request_headers, body)
+                except Exception:
+                    connection.close()
+                    raise
+            except Exception:
+                connection.close()
+                raise
+            if will_close:
+                connection.close()
+            else:
+                self._idle.setdefault(key, []).append(connection)
+            budget.update(response_headers)
+            if self.limiter is not None:
+                self.limiter.record(latency, status, response_headers)
+
+        if validator_key is not None:
+            if status == 304:
+                cached = self.validators.load(validator_key)
+                if cached is not None:
+                    # Not modified: replay the response stored on the previous scan
+                    status, response_headers, data = cached
+                    reason = "Not Modified"
+            elif status in (200, 206):
+                self.validators.store(validator_key, status, response_headers, data)
+
+        return HTTPResponse(url, status, reason, response_headers, data)
+
+    def _checkout(self, key: Tuple[str, str]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return an idle connection for the host, or open a new one."""
+        idle = self._idle.get(key)
+        if idle:
+            self.reused += 1
+            return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _new_connection(self, key: Tuple[str, str]) -> http.client.HTTPConnection:
+        """Create a new connection for the scheme/host pair."""
+        scheme, netloc = key
+        self.opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    @staticmethod
+    def _perform(connection, method, target, headers, body):
+        """Blocking request/response cycle (runs in a worker thread).
+
+        The latency returned is the server's: from sending the request to
+        receiving the response headers, without the wait for a free thread.
+        """
+        started = time.monotonic()
+        connection.request(method, target, body=body, headers=headers)
+        response = connection.getresponse()
+        latency = time.monotonic() - started
+        data = response.read()
+        if data and response.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return response.status, response.reason, response.msg, data, response.will_close, latency
@@ -0,0 +1,88 @@
+"""Concurrent fetching of paginated API listings."""
+import asyncio
+import re
+import urllib.parse
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+# Listing pages requested at once once the page count is known; the pool's
+# per-host connection limit and the rate limit budgets still apply
+LISTING_CONCURRENCY = 8
+
+_LINK_RE = re.compile(r'<([^>]*)>\s*;\s*rel="?([^",;]+)"?')
+
+# fetch_page(page) returns the items of a page and the response headers
+PageFetcher = Callable[[int], Awaitable[Tuple[List[Any], Mapping[str, str]]]]
+
+
+def parse_link_header(value: Optional[str]) -> Dict[str, str]:
+    """Return the URLs of an RFC 8288 Link header by relation, e.g. {"last": url}."""
+    links = {}
+    for url, rels in _LINK_RE.findall(value or ""):
+        for rel in rels.split():
+            links[rel] = url
+    return links
+
+
+def next_link(headers: Mapping[str, str]) -> Optional[str]:
+    """Return the URL of the next page from the Link header, None on the last page."""
+    return parse_link_header(headers.get("Link")).get("next")
+
+
+def last_page(headers: Mapping[str, str]) -> Optional[int]:
+    """Return the number of pages of a listing from its first response.
+
+    GitHub links the last page in the Link header, GitLab sends the count
+    in X-Total-Pages (left out above 10,000 items). None when the headers
+    say nothing, e.g. for a single page.
+    """
+    last = parse_link_header(headers.get("Link")).get("last")
+    if last:
+        page = urllib.parse.parse_qs(urllib.parse.urlsplit(last).query).get("page")
+        if page and page[0].isdigit():
+            return int(page[0])
+    total = headers.get("X-Total-Pages")
+    if total and total.isdigit():
+        return int(total)
+    return None
+
+
+async def iter_pages(fetch_page: PageFetcher, page_size: int,
+                     concurrency: int = LISTING_CONCURRENCY,
+                     first: Optional[Tuple[List[Any], Mapping[str, str]]] = None) -> AsyncIterator[List[Any]]:
+    """Yield the pages of a listing in order, fetching them concurrently.
+
+    Page 1 is fetched alone; when its headers give the page count, the
+    remaining pages are fetched up to concurrency at a time. Otherwise the
+    pages are fetched one after another until a short page.
+
+    Keyword arguments:
+    fetch_page -- Coroutine function returning the items and headers of a page.
+    page_size -- The items requested per page.
+    concurrency -- The pages requested at once (default LISTING_CONCURRENCY).
+    first -- The items and headers of page 1 when already fetched (default None).
+    """
+    items, headers = first if first is not None else await fetch_page(1)
+    yield items
+    last = last_page(headers)
+    if last is None:
+        page = 1
+        while len(items) >= page_size:
+            page += 1
+            items, _ = await fetch_page(page)
+            yield items
+        return
+
+    pending: Deque[asyncio.Task] = deque()
+    next_page = 2
+    try:
+        while next_page <= last or pending:
+            while next_page <= last and len(pending) < concurrency:
+                pending.append(asyncio.create_task(fetch_page(next_page)))
+                next_page += 1
+            items, _ = await pending.popleft()
+            yield items
+    finally:
+        # The consumer stopped early or a page failed
+        for task in pending:
+            task.cancel()
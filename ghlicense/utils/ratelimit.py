@@ -0,0 +1,121 @@
+"""Shared rate limit budgets seeded from the providers' quota headers."""
+import time
+import asyncio
+import logging
+import urllib.parse
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Below this fraction of the quota, requests are spread evenly until the reset
+# instead of being sent as fast as possible
+DEFAULT_PACING_THRESHOLD = 0.2
+
+
+def _header(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    """Return the first of the given headers that holds a number."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+class RateLimitBudget:
+    """Token bucket mirroring one rate limit quota of a provider.
+
+    The bucket holds the requests remaining until the quota resets. It is
+    seeded and corrected from the X-RateLimit-* (GitHub) or RateLimit-*
+    (GitLab) response headers and drawn from before every request. While
+    plenty of quota is left requests go out freely; below the pacing
+    threshold they are spread evenly until the reset, and once it is empty
+    callers wait for the reset instead of running into 429s and backoff.
+    """
+
+    def __init__(self, name: str, pacing_threshold: float = DEFAULT_PACING_THRESHOLD) -> None:
+        """RateLimitBudget class constructor
+
+        Keyword arguments:
+        name -- The quota this bucket tracks (host, plus /graphql for GitHub GraphQL).
+        pacing_threshold -- Fraction of the limit below which requests are paced (default 0.2).
+        """
+        self.name: str = name
+        self.pacing_threshold: float = pacing_threshold
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.waited: float = 0.0
+        self._next_slot: float = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Correct the bucket from the quota headers of a response."""
+        limit = _header(headers, "X-RateLimit-Limit", "RateLimit-Limit")
+        remaining = _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset_at = _header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+        self.set_quota(limit, remaining, reset_at)
+
+    def set_quota(self, limit: Optional[float], remaining: Optional[float], reset_at: Optional[float]) -> None:
+        """Set the quota from already parsed values (None leaves a value unchanged)."""
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_at is not None:
+            self.reset_at = reset_at
+
+    async def acquire(self) -> None:
+        """Take one request from the budget, waiting if the quota requires it."""
+        if self.remaining is None:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            delay = self._delay(time.time())
+            if delay > 0:
+                logger.info(f"Rate limit budget for {self.name}: waiting {delay:.1f}s "
+                            f"({self.remaining} requests left)")
+                self.waited += delay
+                await asyncio.sleep(delay)
+            if self.remaining is not None and self.reset_at is not None and time.time() >= self.reset_at:
+                # The quota window rolled over, the next response reseeds it
+                self.remaining = self.limit
+            if self.remaining:
+                self.remaining -= 1
+
+    def _delay(self, now: float) -> float:
+        """Return how long the next request must wait."""
+        if self.reset_at is None or now >= self.reset_at:
+            return 0.0
+        if self.remaining <= 0:
+            return self.reset_at - now
+        if self.limit and self.remaining < self.limit * self.pacing_threshold:
+            interval = (self.reset_at - now) / self.remaining
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + interval
+            return slot - now
+        return 0.0
+
+
+# Budgets shared by every provider and scanner request in the process
+BUDGETS: Dict[str, RateLimitBudget] = {}
+
+
+def budget_key(url: str) -> str:
+    """Return the name of the quota a URL draws from."""
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.path.rstrip("/").endswith("/graphql"):
+        # GitHub meters GraphQL separately from the REST API
+        return parsed.netloc + "/graphql"
+    return parsed.netloc
+
+
+def get_budget(url: str) -> RateLimitBudget:
+    """Return the shared budget for the quota a URL draws from."""
+    key = budget_key(url)
+    if key not in BUDGETS:
+        BUDGETS[key] = RateLimitBudget(key)
+    return BUDGETS[key]
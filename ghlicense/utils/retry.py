@@ -1,11 +1,19 @@
 """Retry utilities with exponential backoff for API rate limiting."""
+import time
+import random
 import asyncio
 import functools
 import logging
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 logger = logging.getLogger(__name__)
 
+JITTER_MODES = ("none", "full", "decorrelated")
+DEFAULT_MAX_DELAY = 60.0
+# Consecutive failures that open a host's circuit, and how long it stays open
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_COOLDOWN = 30.0
+
 
 class RateLimitError(Exception):
     """Exception raised when API rate limit is exceeded."""
@@ -15,52 +23,228 @@ class RateLimitError(Exception):
         self.response = response
 
 
-def async_retry(max_retries: int = 5, base_delay: float = 1.0):
+class TransientError(Exception):
+    """Exception raised for failures worth retrying (5xx, dropped connections)."""
+
+    def __init__(self, message: str, response: Optional[Any] = None):
+        super().__init__(message)
+        self.response = response
+
+
+class CircuitOpenError(Exception):
+    """Exception raised when a host's circuit is open and calls fail fast."""
+
+
+# Errors a RetryPolicy retries besides rate limit errors
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (TransientError, TimeoutError, ConnectionError)
+
+
+class RetryBudget:
+    """Retries shared by every operation of one scan.
+
+    Once spent, operations fail on their first retryable error instead of
+    piling more load onto a provider that is already struggling.
+    """
+
+    def __init__(self, retries: int) -> None:
+        """RetryBudget class constructor
+
+        Keyword arguments:
+        retries -- Total number of retries allowed.
+        """
+        self.retries: int = retries
+        self.spent: int = 0
+
+    def spend(self) -> bool:
+        """Take one retry from the budget, returning False if none is left."""
+        if self.spent >= self.retries:
+            return False
+        self.spent += 1
+        return True
+
+
+class CircuitBreaker:
+    """Per-host circuit breaker.
+
+    After a number of consecutive failures the host's circuit opens and calls
+    fail immediately with CircuitOpenError. Once the cooldown has passed one
+    trial call is let through; its success closes the circuit again.
+    """
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown: float = DEFAULT_CIRCUIT_COOLDOWN) -> None:
+        """CircuitBreaker class constructor
+
+        Keyword arguments:
+        failure_threshold -- Consecutive failures that open the circuit (default 5).
+        cooldown -- Seconds the circuit stays open (default 30).
+        """
+        self.failure_threshold: int = max(1, failure_threshold)
+        self.cooldown: float = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        """Return whether a call to the host may go ahead."""
+        opened_at = self._opened_at.get(host)
+        if opened_at is None:
+            return True
+        if time.monotonic() - opened_at >= self.cooldown:
+            # Half-open: let one trial call through, a failure reopens the circuit
+            self._opened_at[host] = time.monotonic()
+            return True
+        return False
+
+    def is_open(self, host: str) -> bool:
+        """Return whether the host's circuit is currently open."""
+        return host in self._opened_at
+
+    def record_success(self, host: str) -> None:
+        """Close the host's circuit after a call the host answered."""
+        self._failures.pop(host, None)
+        self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        """Count a failed call, opening the circuit past the threshold."""
+        self._failures[host] = self._failures.get(host, 0) + 1
+        if self._failures[host] >= self.failure_threshold:
+            if host not in self._opened_at:
+                logger.warning(f"Circuit opened for {host} after {self._failures[host]} failures")
+            self._opened_at[host] = time.monotonic()
+
+
+class RetryPolicy:
+    """How async_retry spaces, bounds and short-circuits retries.
+
+    The default policy is the plain exponential backoff (1s, 2s, 4s...).
+    Jitter spreads the retries of concurrent calls that failed together: "full"
+    sleeps a random time up to the backoff, "decorrelated" grows a random delay
+    from the previous one. A deadline bounds the total time of one operation,
+    a RetryBudget bounds the retries of a whole scan, and a CircuitBreaker makes
+    calls to a failing host fail fast. Retry-After and an exhausted quota's
+    reset time always take precedence over the computed delay.
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0,
+                 max_delay: float = DEFAULT_MAX_DELAY, jitter: str = "none",
+                 deadline: Optional[float] = None, budget: Optional[RetryBudget] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_ERRORS) -> None:
+        """RetryPolicy class constructor
+
+        Keyword arguments:
+        max_retries -- Attempts per operation, the first one included (default 5).
+        base_delay -- Initial backoff in seconds (default 1).
+        max_delay -- Largest computed backoff in seconds (default 60).
+        jitter -- "none", "full" or "decorrelated" (default "none").
+        deadline -- Total seconds one operation may take, retries included (default None).
+        budget -- RetryBudget shared by the operations of a scan (default None).
+        breaker -- CircuitBreaker keyed by host (default None).
+        retry_on -- Exception types retried besides rate limit errors (default transient errors).
+        """
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"Unknown jitter mode: {jitter}")
+        self.max_retries: int = max_retries
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.jitter: str = jitter
+        self.deadline: Optional[float] = deadline
+        self.budget: Optional[RetryBudget] = budget
+        self.breaker: Optional[CircuitBreaker] = breaker
+        self.retry_on: Tuple[Type[BaseException], ...] = retry_on
+
+    def is_retryable(self, exception: Exception) -> bool:
+        """Return whether an exception is worth another attempt."""
+        return (isinstance(exception, (RateLimitError, *self.retry_on))
+                or _is_rate_limit_error(exception))
+
+    def next_delay(self, exception: Exception, attempt: int, previous: float) -> float:
+        """Return the delay before the next attempt.
+
+        Keyword arguments:
+        exception -- The error of the failed attempt.
+        attempt -- Zero-based number of the failed attempt.
+        previous -- The delay slept before the failed attempt (0 for the first).
+        """
+        server_delay = _server_delay(exception)
+        if server_delay is not None:
+            return server_delay
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter == "full":
+            return random.uniform(0, backoff)
+        if self.jitter == "decorrelated":
+            return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous) * 3))
+        return backoff
+
+
+def async_retry(max_retries: int = 5, base_delay: float = 1.0,
+                policy: Optional[RetryPolicy] = None,
+                host: Optional[Callable[..., str]] = None):
     """Decorator that retries async functions with exponential backoff.
 
     Handles HTTP 429 (Too Many Requests) and other rate limit errors.
     Exponential backoff: 1s, 2s, 4s, 8s, 16s for max_retries=5.
-    Respects Retry-After header if present in the response.
+    Respects Retry-After header if present in the response, and waits for the
+    quota reset when X-RateLimit-Remaining/RateLimit-Remaining is exhausted.
+
+    Passing a RetryPolicy adds jitter, a deadline, a retry budget and circuit
+    breaking, and also retries transient errors. The host callable receives
+    the call's arguments and names the circuit the call belongs to.
     """
+    if policy is None:
+        policy = RetryPolicy(max_retries, base_delay, max_delay=float("inf"), retry_on=())
+
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception = None
+            circuit = None
+            if host is not None and policy.breaker is not None:
+                circuit = host(*args, **kwargs)
+                if not policy.breaker.allow(circuit):
+                    raise CircuitOpenError(f"Circuit open for {circuit}, not calling {func.__name__}")
+            started = time.monotonic()
+            delay = 0.0
 
-            for attempt in range(max_retries):
+            for attempt in range(policy.max_retries):
                 try:
-                    return await func(*args, **kwargs)
-                except RateLimitError as e:
-                    last_exception = e
-                    if attempt == max_retries - 1:
-                        logger.error(f"Max retries ({max_retries}) exceeded for {func.__name__}")
-                        raise
-
-                    delay = _calculate_delay(e, attempt, base_delay)
-                    logger.warning(f"Rate limit hit for {func.__name__}, retry {attempt + 1}/{max_retries - 1} in {delay:.1f}s")
-                    await asyncio.sleep(delay)
+                    result = await func(*args, **kwargs)
                 except Exception as e:
-                    if _is_rate_limit_error(e):
-                        last_exception = RateLimitError(str(e))
-                        if attempt == max_retries - 1:
-                            logger.error(f"Max retries ({max_retries}) exceeded for {func.__name__}")
-                            raise last_exception
-
-                        delay = _calculate_delay(last_exception, attempt, base_delay)
-                        logger.warning(f"Rate limit error for {func.__name__}, retry {attempt + 1}/{max_retries - 1} in {delay:.1f}s")
-                        await asyncio.sleep(delay)
-                    else:
+                    if not policy.is_retryable(e):
+                        # The host answered, e.g. with a 404: not a failure of the host
+                        if circuit is not None:
+                            policy.breaker.record_success(circuit)
                         raise
-
-            if last_exception:
-                raise last_exception
+                    if circuit is not None:
+                        policy.breaker.record_failure(circuit)
+                    last_exception = e
+                    if not isinstance(e, (RateLimitError, *policy.retry_on)):
+                        last_exception = RateLimitError(str(e))
+                    if attempt == policy.max_retries - 1:
+                        logger.error(f"Max retries ({policy.max_retries}) exceeded for {func.__name__}")
+                        raise last_exception
+                    if circuit is not None and policy.breaker.is_open(circuit):
+                        raise last_exception
+                    delay = policy.next_delay(last_exception, attempt, delay)
+                    if policy.deadline is not None and time.monotonic() - started + delay > policy.deadline:
+                        logger.warning(f"Deadline of {policy.deadline:.1f}s reached for {func.__name__}")
+                        raise last_exception
+                    if policy.budget is not None and not policy.budget.spend():
+                        logger.warning(f"Retry budget exhausted, giving up on {func.__name__}")
+                        raise last_exception
+                    kind = "Rate limit hit" if isinstance(last_exception, RateLimitError) else "Transient error"
+                    logger.warning(f"{kind} for {func.__name__}, retry {attempt + 1}/{policy.max_retries - 1} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                else:
+                    if circuit is not None:
+                        policy.breaker.record_success(circuit)
+                    return result
 
         return wrapper
     return decorator
 
 
-def _calculate_delay(exception: RateLimitError, attempt: int, base_delay: float) -> float:
-    """Calculate delay for exponential backoff."""
+def _server_delay(exception: Exception) -> Optional[float]:
+    """Return the delay requested by the server's response headers, if any."""
     response = getattr(exception, 'response', None)
     if response and hasattr(response, 'headers'):
         retry_after = response.headers.get('Retry-After')
@@ -69,8 +253,20 @@ def _calculate_delay(exception: RateLimitError, attempt: int, base_delay: float)
                 return float(retry_after)
             except (ValueError, TypeError):
                 pass
+        return _quota_reset_delay(response.headers)
+    return None
+
 
-    return base_delay * (2 ** attempt)
+def _quota_reset_delay(headers) -> Optional[float]:
+    """Return the seconds until an exhausted rate limit quota resets, if known."""
+    remaining = headers.get('X-RateLimit-Remaining') or headers.get('RateLimit-Remaining')
+    reset_at = headers.get('X-RateLimit-Reset') or headers.get('RateLimit-Reset')
+    try:
+        if int(remaining) > 0:
+            return None
+        return max(0.0, float(reset_at) - time.time())
+    except (ValueError, TypeError):
+        return None
 
 
 def _is_rate_limit_error(exception: Exception) -> bool:
@@ -83,4 +279,4 @@ def _is_rate_limit_error(exception: Exception) -> bool:
         if hasattr(response, 'status') and response.status == 429:
             return True
 
-    return any(indicator in error_msg for indicator in rate_limit_indicators)
\ No newline at end of file
+    return any(indicator in error_msg for indicator in rate_limit_indicators)
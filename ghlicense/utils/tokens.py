@@ -0,0 +1,67 @@
+"""Pools of API tokens, each with its own rate limit quota."""
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ghlicense.utils.ratelimit import RateLimitBudget, budget_key
+
+
+class TokenPool:
+    """API tokens of one provider, each with its own rate limit budget.
+
+    Every request is sent with the token that has the most quota left for
+    the URL's quota (REST or GraphQL), and the response headers correct
+    that token's budget. Tokens whose quota was never seen are tried first.
+    A scan thus runs at the combined rate limit of all tokens, and only
+    waits once every token is exhausted.
+    """
+
+    def __init__(self, tokens: Iterable[str] = ()) -> None:
+        """TokenPool class constructor
+
+        Keyword arguments:
+        tokens -- The API tokens, duplicates and empty ones are dropped (default none).
+        """
+        self.tokens: List[str] = list(dict.fromkeys(token for token in tokens if token))
+        self._budgets: Dict[Tuple[str, str], RateLimitBudget] = {}
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def first(self) -> Optional[str]:
+        """Return the first token, for clients that take a single one."""
+        return self.tokens[0] if self.tokens else None
+
+    def budget(self, token: str, url: str) -> RateLimitBudget:
+        """Return the budget of a token for the quota a URL draws from."""
+        key = (token, budget_key(url))
+        if key not in self._budgets:
+            index = self.tokens.index(token) + 1
+            self._budgets[key] = RateLimitBudget(f"{key[1]} (token {index})")
+        return self._budgets[key]
+
+    def pick(self, url: str) -> str:
+        """Return the token with the most quota left for a URL."""
+        now = time.time()
+
+        def quota(token: str) -> float:
+            budget = self.budget(token, url)
+            if budget.remaining is None:
+                return float("inf")
+            if budget.reset_at is not None and now >= budget.reset_at:
+                # The quota window rolled over
+                return budget.limit or float("inf")
+            return budget.remaining
+
+        return max(self.tokens, key=quota)
+
+    async def acquire(self, url: str) -> Tuple[str, RateLimitBudget]:
+        """Pick a token for a request and take one request from its budget."""
+        token = self.pick(url)
+        budget = self.budget(token, url)
+        await budget.acquire()
+        return token, budget
+
+    @staticmethod
+    def auth_headers(token: str) -> Dict[str, str]:
+        """Return the request headers authenticating with a token."""
+        return {"Authorization": "Bearer " + token}
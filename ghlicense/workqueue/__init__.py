@@ -0,0 +1,37 @@
+"""Work queues distributing one scan across several workers."""
+import logging
+import sys
+
+from ghlicense.workqueue.base import WorkQueue, DEFAULT_LEASE_TIMEOUT, DEFAULT_CLAIM_SIZE
+from ghlicense.workqueue.sqlite import SQLiteWorkQueue
+from ghlicense.workqueue.redis import RedisWorkQueue, REDIS_AVAILABLE
+
+# URL schemes served by the Redis backend, anything else is an SQLite file
+REDIS_SCHEMES = ("redis://", "rediss://", "unix://")
+
+
+def open_work_queue(url: str, name: str) -> WorkQueue:
+    """Open the work queue at a redis:// URL or an SQLite file path.
+
+    Keyword arguments:
+    url -- A redis://, rediss:// or unix:// URL, or the path of an SQLite file
+           (optionally prefixed with sqlite://).
+    name -- The queue, e.g. the scanned account.
+    """
+    if url.startswith(REDIS_SCHEMES):
+        if not REDIS_AVAILABLE:
+            logging.error("Redis work queues need the redis package, install it or use an SQLite file.")
+            sys.exit(1)
+        return RedisWorkQueue.from_url(url, name)
+    return SQLiteWorkQueue(url.removeprefix("sqlite://"), name)
+
+
+__all__ = [
+    "WorkQueue",
+    "SQLiteWorkQueue",
+    "RedisWorkQueue",
+    "REDIS_AVAILABLE",
+    "DEFAULT_LEASE_TIMEOUT",
+    "DEFAULT_CLAIM_SIZE",
+    "open_work_queue",
+]
@@ -0,0 +1,65 @@
+"""Work queue shared by a scan coordinator and its workers."""
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Seconds a claimed repo stays with its worker before it is handed out again
+DEFAULT_LEASE_TIMEOUT = 300.0
+# Repos a worker claims at once
+DEFAULT_CLAIM_SIZE = 50
+
+
+class WorkQueue(metaclass=ABCMeta):
+    """Queue of repos to scan, and of their results, for one account.
+
+    The coordinator pushes every repo and then seals the queue. Workers claim
+    batches of repos, each under a lease, and complete them with their
+    results. A repo whose lease expires before it is completed, e.g. because
+    its worker crashed, is handed to the next worker that claims. Completing
+    a repo twice keeps the first result only.
+    """
+
+    @abstractmethod
+    def push(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Queue (key, payload) items, ignoring keys already queued."""
+
+    @abstractmethod
+    def seal(self) -> None:
+        """Declare that every item has been pushed."""
+
+    @abstractmethod
+    def sealed(self) -> bool:
+        """Return whether the coordinator has pushed every item."""
+
+    @abstractmethod
+    def claim(self, worker: str, count: int = DEFAULT_CLAIM_SIZE,
+              lease: float = DEFAULT_LEASE_TIMEOUT) -> List[Tuple[str, Dict[str, Any]]]:
+        """Lease up to count pending or expired items to a worker and return them.
+
+        Keyword arguments:
+        worker -- Name of the claiming worker.
+        count -- Most items returned (default 50).
+        lease -- Seconds before the items may be claimed again (default 300).
+        """
+
+    @abstractmethod
+    def complete(self, key: str, result: Dict[str, Any]) -> bool:
+        """Store an item's result, returning False if it was already completed."""
+
+    @abstractmethod
+    def results(self, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        """Return the (position, result) pairs stored after a position, in completion order.
+
+        Positions increase with each result; pass the last one seen to get
+        only the newer results.
+        """
+
+    @abstractmethod
+    def outstanding(self) -> int:
+        """Return the number of items not completed yet."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every item and result of the queue."""
+
+    def close(self) -> None:
+        """Release the backend's resources."""
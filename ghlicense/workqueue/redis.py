@@ -0,0 +1,137 @@
+"""Work queue stored in Redis, or any server speaking its protocol."""
+import json
+import time
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ghlicense.workqueue.base import WorkQueue, DEFAULT_CLAIM_SIZE, DEFAULT_LEASE_TIMEOUT
+
+# By default, assume that the Redis backend can be used.
+REDIS_AVAILABLE = True
+
+try:
+    # Attempt to import the redis client module
+    import redis
+except ImportError:
+    # If the module failed to import, only SQLite work queues can be used.
+    REDIS_AVAILABLE = False
+
+# Prefix of the keys of every queue
+KEY_PREFIX = "ghlicense:queue"
+
+# Queues the repos of ARGV (key, payload, key, payload...) that were never
+# pushed, so a repo is never stored without being queued.
+# KEYS: items hash, pending list
+PUSH_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    if redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+        redis.call('RPUSH', KEYS[2], ARGV[i])
+    end
+end
+"""
+
+# Requeues the expired leases, then pops up to ARGV[3] repos that are not done
+# and leases them until ARGV[2]. Redis runs a script atomically, so a repo is
+# never popped without being leased, nor leased by two workers.
+# KEYS: pending list, leases sorted set, done set; ARGV: now, lease expiry, count
+CLAIM_SCRIPT = """
+for _, key in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])) do
+    redis.call('ZREM', KEYS[2], key)
+    redis.call('RPUSH', KEYS[1], key)
+end
+local claimed = {}
+while #claimed < tonumber(ARGV[3]) do
+    local key = redis.call('LPOP', KEYS[1])
+    if not key then
+        break
+    end
+    if redis.call('SISMEMBER', KEYS[3], key) == 0 then
+        redis.call('ZADD', KEYS[2], ARGV[2], key)
+        table.insert(claimed, key)
+    end
+end
+return claimed
+"""
+
+# Marks repo ARGV[1] done with result ARGV[2] unless another worker did, and
+# drops its lease; a repo is never done without its result. Returns 1 for
+# the first completion. KEYS: done set, results list, leases sorted set
+COMPLETE_SCRIPT = """
+local first = redis.call('SADD', KEYS[1], ARGV[1])
+if first == 1 then
+    redis.call('RPUSH', KEYS[2], ARGV[2])
+end
+redis.call('ZREM', KEYS[3], ARGV[1])
+return first
+"""
+
+
+class RedisWorkQueue(WorkQueue):
+    """Work queue in Redis, for workers spread over several machines.
+
+    Plain list, hash, set and sorted set commands plus Lua scripts are used,
+    so any Redis-compatible server with scripting works. New repos wait in a
+    list; a claimed repo moves to a sorted set scored by its lease expiry,
+    from which expired repos are pushed back onto the list. Pushes, claims
+    and completions each run as one script, so a crash never leaves them
+    half done.
+    """
+
+    def __init__(self, client, name: str) -> None:
+        """RedisWorkQueue class constructor
+
+        Keyword arguments:
+        client -- A redis.Redis client created with decode_responses=True.
+        name -- The queue on the server, e.g. the scanned account.
+        """
+        self.client = client
+        self.name: str = name
+        prefix = f"{KEY_PREFIX}:{name}"
+        self._items = f"{prefix}:items"
+        self._pending = f"{prefix}:pending"
+        self._leases = f"{prefix}:leases"
+        self._done = f"{prefix}:done"
+        self._results = f"{prefix}:results"
+        self._sealed = f"{prefix}:sealed"
+        self._push = client.register_script(PUSH_SCRIPT)
+        self._claim = client.register_script(CLAIM_SCRIPT)
+        self._complete = client.register_script(COMPLETE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, name: str) -> "RedisWorkQueue":
+        """Connect to the server at a redis:// or rediss:// URL."""
+        return cls(redis.Redis.from_url(url, decode_responses=True), name)
+
+    def push(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        args = [value for key, payload in items for value in (key, json.dumps(payload))]
+        if args:
+            self._push(keys=[self._items, self._pending], args=args)
+
+    def seal(self) -> None:
+        self.client.set(self._sealed, "1")
+
+    def sealed(self) -> bool:
+        return self.client.get(self._sealed) == "1"
+
+    def claim(self, worker: str, count: int = DEFAULT_CLAIM_SIZE,
+              lease: float = DEFAULT_LEASE_TIMEOUT) -> List[Tuple[str, Dict[str, Any]]]:
+        now = time.time()
+        keys = self._claim(keys=[self._pending, self._leases, self._done], args=[now, now + lease, count])
+        if not keys:
+            return []
+        return [(key, json.loads(payload)) for key, payload in zip(keys, self.client.hmget(self._items, keys))]
+
+    def complete(self, key: str, result: Dict[str, Any]) -> bool:
+        return bool(self._complete(keys=[self._done, self._results, self._leases], args=[key, json.dumps(result)]))
+
+    def results(self, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        return [(position, json.loads(result))
+                for position, result in enumerate(self.client.lrange(self._results, after, -1), after + 1)]
+
+    def outstanding(self) -> int:
+        return self.client.hlen(self._items) - self.client.scard(self._done)
+
+    def clear(self) -> None:
+        self.client.delete(self._items, self._pending, self._leases, self._done, self._results, self._sealed)
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,136 @@
+"""Work queue stored in an SQLite file."""
+import os
+import json
+import time
+import sqlite3
+import threading
+import contextlib
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from ghlicense.workqueue.base import WorkQueue, DEFAULT_CLAIM_SIZE, DEFAULT_LEASE_TIMEOUT
+
+# Seconds a process waits for another one to release the database
+LOCK_TIMEOUT = 30.0
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """Work queue in an SQLite file, for workers on one machine.
+
+    Claims run in an immediate transaction, so two workers never lease the
+    same repo. Several accounts can share a file, each under its own name.
+    In WAL mode the processes share memory next to the file, so the file must
+    stay on a local disk: workers on other machines need the Redis queue.
+    """
+
+    def __init__(self, path: str, name: str) -> None:
+        """SQLiteWorkQueue class constructor
+
+        Keyword arguments:
+        path -- Path of the SQLite database.
+        name -- The queue within the database, e.g. the scanned account.
+        """
+        if os.path.dirname(path) and not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self.path: str = path
+        self.name: str = name
+        # Transactions are managed explicitly; the lock serialises the threads
+        # of this process, SQLite's own locking the other processes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=LOCK_TIMEOUT, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS work_items ("
+            " queue TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " state TEXT NOT NULL DEFAULT 'pending',"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " PRIMARY KEY (queue, key))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS work_results ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " queue TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " result TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS work_queues (queue TEXT PRIMARY KEY, sealed INTEGER NOT NULL)")
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Run the block in a write transaction, locking out the other workers."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def push(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        with self._transaction():
+            self._db.executemany(
+                "INSERT OR IGNORE INTO work_items (queue, key, payload) VALUES (?, ?, ?)",
+                ((self.name, key, json.dumps(payload)) for key, payload in items),
+            )
+
+    def seal(self) -> None:
+        with self._transaction():
+            self._db.execute("INSERT OR REPLACE INTO work_queues VALUES (?, 1)", (self.name,))
+
+    def sealed(self) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT sealed FROM work_queues WHERE queue = ?", (self.name,)).fetchone()
+        return bool(row and row[0])
+
+    def claim(self, worker: str, count: int = DEFAULT_CLAIM_SIZE,
+              lease: float = DEFAULT_LEASE_TIMEOUT) -> List[Tuple[str, Dict[str, Any]]]:
+        now = time.time()
+        with self._transaction():
+            rows = self._db.execute(
+                "SELECT key, payload FROM work_items WHERE queue = ?"
+                " AND (state = 'pending' OR (state = 'leased' AND lease_expires < ?))"
+                " ORDER BY rowid LIMIT ?",
+                (self.name, now, count),
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE work_items SET state = 'leased', worker = ?, lease_expires = ? WHERE queue = ? AND key = ?",
+                ((worker, now + lease, self.name, key) for key, _ in rows),
+            )
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def complete(self, key: str, result: Dict[str, Any]) -> bool:
+        with self._transaction():
+            updated = self._db.execute(
+                "UPDATE work_items SET state = 'done', lease_expires = NULL"
+                " WHERE queue = ? AND key = ? AND state != 'done'",
+                (self.name, key),
+            ).rowcount
+            if updated:
+                self._db.execute("INSERT INTO work_results (queue, key, result) VALUES (?, ?, ?)",
+                                 (self.name, key, json.dumps(result)))
+        return bool(updated)
+
+    def results(self, after: int = 0) -> List[Tuple[int, Dict[str, Any]]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, result FROM work_results WHERE queue = ? AND seq > ? ORDER BY seq",
+                (self.name, after),
+            ).fetchall()
+        return [(seq, json.loads(result)) for seq, result in rows]
+
+    def outstanding(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM work_items WHERE queue = ? AND state != 'done'",
+                                    (self.name,)).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._transaction():
+            for table in ("work_items", "work_results", "work_queues"):
+                self._db.execute(f"DELETE FROM {table} WHERE queue = ?", (self.name,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -42,26 +42,11 @@ def mock_repo():
 
 @pytest.fixture
 def mock_github_provider():
-    """Create a mock GitHub provider with mocked get_repos."""
+    """Create a GitHub provider for the account testuser."""
     from ghlicense.providers import github
 
-    with patch("ghlicense.providers.github.Github") as mock_github_class:
-        mock_github = MagicMock()
-        mock_github_class.return_value = mock_github
-
-        mock_user = MagicMock()
-        mock_github.get_user.return_value = mock_user
-
-        mock_repo = MagicMock()
-        mock_repo.full_name = "testuser/testrepo"
-        mock_repo.default_branch = "main"
-        mock_repo.fork = False
-        mock_user.get_repos.return_value = [mock_repo]
-
-        provider = github.GitHubProvider("testuser")
-        provider._github_mock = mock_github
-        provider._user_mock = mock_user
-        yield provider
+    # Requests go through provider.session, which the tests replace
+    yield github.GitHubProvider("testuser")
 
 
 67#QP|@pytest.fixture
@@ -98,23 +83,10 @@ def mock_bitbucket_provider():
 
 @pytest.fixture
 def mock_gitlab_provider():
-    """Create a mock GitLab provider with mocked get_repos."""
+    """Create a GitLab provider for the account testuser."""
     from ghlicense.providers import gitlab
 
-    with patch("ghlicense.providers.gitlab.gitlab.Gitlab") as mock_gl_class:
-        mock_gitlab = MagicMock()
-        mock_gl_class.return_value = mock_gitlab
-
-        mock_user = MagicMock()
-        mock_gitlab.users.list.return_value = [mock_user]
-
-        mock_project = MagicMock()
-        mock_project.path_with_namespace = "testuser/testrepo"
-        mock_project.default_branch = "main"
-        mock_user.projects.list.return_value = [mock_project]
-
-        provider = gitlab.GitLabProvider("testuser")
-        yield provider
+    yield gitlab.GitLabProvider("testuser")
 
 
 @pytest.fixture
@@ -0,0 +1,222 @@
+"""Tests for ghlicense.cache module."""
+import os
+import time
+
+from unittest.mock import patch
+
+from ghlicense.cache import ScanCache
+
+
+class TestScanCache:
+    """Tests for ScanCache."""
+
+    def test_hit_on_same_revision(self, temp_dir):
+        """Test a stored result is returned for an unchanged revision."""
+        cache = ScanCache(os.path.join(temp_dir, "cache.sqlite3"))
+        cache.put("github", "user/repo", "sha1", ["text", 1, 0, 0])
+        assert cache.get("github", "user/repo", "sha1") == ["text", 1, 0, 0]
+        assert cache.stats() == {"entries": 1, "hits": 1, "misses": 0}
+        cache.close()
+
+    def test_miss_on_new_revision(self, temp_dir):
+        """Test a changed revision is a miss."""
+        cache = ScanCache(os.path.join(temp_dir, "cache.sqlite3"))
+        cache.put("github", "user/repo", "sha1", ["text", 1, 0, 0])
+        assert cache.get("github", "user/repo", "sha2") is None
+        assert cache.misses == 1
+        cache.close()
+
+    def test_no_revision_is_not_cached(self, temp_dir):
+        """Test repos without a revision are never cached."""
+        cache = ScanCache(os.path.join(temp_dir, "cache.sqlite3"))
+        cache.put("github", "user/repo", None, ["text", 1, 0, 0])
+        assert cache.get("github", "user/repo", None) is None
+        assert cache.stats()["entries"] == 0
+        cache.close()
+
+    def test_expired_entry_is_a_miss(self, temp_dir):
+        """Test entries older than the TTL are not reused."""
+        cache = ScanCache(os.path.join(temp_dir, "cache.sqlite3"), ttl=1)
+        cache.put("github", "user/repo", "sha1", ["text", 1, 0, 0])
+        cache._db.execute("UPDATE scan_results SET scanned_at = ?", (time.time() - 10,))
+        assert cache.get("github", "user/repo", "sha1") is None
+        cache.close()
+
+    def test_persists_across_instances(self, temp_dir):
+        """Test results survive closing and reopening the cache."""
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        cache = ScanCache(path)
+        cache.put("gitlab", "user/repo", "2024-01-01", ["text", 0, 1, 0])
+        cache.close()
+        cache = ScanCache(path)
+        assert cache.get("gitlab", "user/repo", "2024-01-01") == ["text", 0, 1, 0]
+        cache.close()
+
+    def test_miss_on_other_strategy(self, temp_dir):
+        """Test a result found by one detection strategy is not reused by another."""
+        cache = ScanCache(os.path.join(temp_dir, "cache.sqlite3"))
+        cache.put("github", "user/repo", "sha1", ["text", 0, 1, 0], "probe")
+        assert cache.get("github", "user/repo", "sha1", "listing") is None
+        assert cache.get("github", "user/repo", "sha1", "probe") == ["text", 0, 1, 0]
+        cache.close()
+
+    def test_entries_without_strategy_are_misses(self, temp_dir):
+        """Test a cache file of an older version is upgraded and its entries rescanned."""
+        import sqlite3
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE scan_results (namespace TEXT NOT NULL, full_name TEXT NOT NULL,"
+                   " revision TEXT NOT NULL, result TEXT NOT NULL, scanned_at REAL NOT NULL,"
+                   " PRIMARY KEY (namespace, full_name))")
+        db.execute("INSERT INTO scan_results VALUES ('github', 'user/repo', 'sha1', '[]', ?)", (time.time(),))
+        db.commit()
+        db.close()
+
+        cache = ScanCache(path)
+        assert cache.get("github", "user/repo", "sha1") is None
+        cache.put("github", "user/repo", "sha1", ["text"])
+        assert cache.get("github", "user/repo", "sha1") == ["text"]
+        cache.close()
+
+    def test_invalidate_by_owner(self, temp_dir):
+        """Test invalidation is limited to the given provider and owner."""
+        cache = ScanCache(os.path.join(temp_dir, "cache.sqlite3"))
+        cache.put("github", "alice/a", "1", [])
+        cache.put("github", "alice/b", "1", [])
+        cache.put("github", "bob/a", "1", [])
+        cache.put("gitlab", "alice/a", "1", [])
+        assert cache.invalidate("github", "alice") == 2
+        assert cache.stats()["entries"] == 2
+        cache.close()
+
+
+class TestValidatorCache:
+    """Tests for ValidatorCache."""
+
+    def test_store_and_conditional_headers(self, temp_dir):
+        """Test stored validators become conditional request headers."""
+        import http.client
+        from ghlicense.cache import ValidatorCache
+
+        validators = ValidatorCache(os.path.join(temp_dir, "cache.sqlite3"))
+        headers = http.client.HTTPMessage()
+        headers["ETag"] = '"abc"'
+        headers["Last-Modified"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+        key = validators.request_key("GET", "https://api.github.com/x")
+        validators.store(key, 200, headers, b"{}")
+
+        assert validators.conditional_headers(key) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+        status, stored_headers, body = validators.load(key)
+        assert (status, body) == (200, b"{}")
+        assert stored_headers["ETag"] == '"abc"'
+        validators.close()
+
+    def test_responses_without_validators_are_skipped(self, temp_dir):
+        """Test responses lacking ETag and Last-Modified are not stored."""
+        import http.client
+        from ghlicense.cache import ValidatorCache
+
+        validators = ValidatorCache(os.path.join(temp_dir, "cache.sqlite3"))
+        key = validators.request_key("HEAD", "https://x/LICENSE")
+        validators.store(key, 200, http.client.HTTPMessage(), b"")
+        assert validators.conditional_headers(key) == {}
+        assert validators.load(key) is None
+        validators.close()
+
+    def test_listing_headers_are_kept(self, temp_dir):
+        """Test a replayed listing page still gives the page count."""
+        import http.client
+        from ghlicense.cache import ValidatorCache
+
+        validators = ValidatorCache(os.path.join(temp_dir, "cache.sqlite3"))
+        headers = http.client.HTTPMessage()
+        headers["ETag"] = '"p1"'
+        headers["Link"] = '<https://x/projects?page=2>; rel="next"'
+        headers["X-Total-Pages"] = "7"
+        headers["Set-Cookie"] = "session=1"
+        key = validators.request_key("GET", "https://x/projects?page=1")
+        validators.store(key, 200, headers, b"[]")
+
+        _, stored_headers, _ = validators.load(key)
+        assert stored_headers["X-Total-Pages"] == "7"
+        assert stored_headers["Link"] == headers["Link"]
+        assert stored_headers.get("Set-Cookie") is None
+        validators.close()
+
+    def test_prune_drops_old_responses(self, temp_dir):
+        """Test responses stored before the cutoff are dropped."""
+        import http.client
+        from ghlicense.cache import ValidatorCache
+
+        validators = ValidatorCache(os.path.join(temp_dir, "cache.sqlite3"))
+        headers = http.client.HTTPMessage()
+        headers["ETag"] = '"v"'
+        old = validators.request_key("GET", "https://x/old")
+        new = validators.request_key("GET", "https://x/new")
+        with patch("time.time", return_value=time.time() - 7200):
+            validators.store(old, 200, headers, b"")
+        validators.store(new, 200, headers, b"")
+
+        assert validators.prune(3600) == 1
+        assert validators.load(old) is None
+        assert validators.load(new) is not None
+        validators.close()
+
+    def test_clear_cache_drops_stored_responses(self, temp_dir):
+        """Test --clear-cache also empties the validators of the scan."""
+        import argparse
+        import functools
+        import http.client
+        from ghlicense.cache import ValidatorCache
+        from ghlicense.scanner.repo_scan import open_scan_resources
+
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        validators = ValidatorCache(path)
+        headers = http.client.HTTPMessage()
+        headers["ETag"] = '"v"'
+        key = validators.request_key("GET", "https://x/r")
+        validators.store(key, 200, headers, b"")
+        validators.close()
+
+        ARGS = argparse.Namespace(cache=True, clear_cache=True)
+        with patch("ghlicense.scanner.repo_scan.ScanCache", functools.partial(ScanCache, path)):
+            _, cache, validators, _ = open_scan_resources(ARGS)
+        assert validators.load(key) is None
+        cache.close()
+        validators.close()
+
+    def test_range_requests_have_their_own_key(self):
+        """Test a ranged GET does not share validators with a full GET."""
+        from ghlicense.cache import ValidatorCache
+        full = ValidatorCache.request_key("GET", "https://x/LICENSE")
+        ranged = ValidatorCache.request_key("GET", "https://x/LICENSE", {"Range": "bytes=0-0"})
+        assert full != ranged
+
+
+class TestSharedCacheFile:
+    """Tests for the scan cache and the validators sharing one database file."""
+
+    def test_interleaved_writes_do_not_lock(self, temp_dir):
+        """Test puts and stores alternating on two connections never wait on each other."""
+        import http.client
+        from ghlicense.cache import ValidatorCache
+
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        # A write lock held across writes would fail fast instead of hanging
+        with patch("ghlicense.cache.scan_cache.BUSY_TIMEOUT", 0.1):
+            cache = ScanCache(path)
+            validators = ValidatorCache(path)
+        headers = http.client.HTTPMessage()
+        headers["ETag"] = '"v"'
+        for i in range(250):
+            cache.put("github", f"alice/r{i}", "sha", {"status": "licensed"})
+            validators.store(validators.request_key("GET", f"https://x/r{i}"), 200, headers, b"")
+
+        reader = ScanCache(path)
+        assert reader.stats()["entries"] == 250
+        assert validators.conditional_headers(validators.request_key("GET", "https://x/r249"))
+        for db in (reader, cache, validators):
+            db.close()
@@ -50,6 +50,54 @@ class TestCLIParser:
         args = parser.PARSER.parse_args(["--scan", "user"])
         assert args.show == "all"
 
+    def test_parser_batch_option(self):
+        """Test --batch and --concurrency options."""
+        args = parser.PARSER.parse_args(["--batch", "accounts.txt", "--concurrency", "16"])
+        assert args.batch == "accounts.txt"
+        assert args.concurrency == 16
+
+    def test_parser_adaptive_concurrency_options(self):
+        """Test the adaptive concurrency options."""
+        args = parser.PARSER.parse_args(["--scan", "user", "--concurrency-mode", "adaptive",
+                                         "--max-concurrency", "64", "--target-latency", "0.5"])
+        assert args.concurrency_mode == "adaptive"
+        assert args.max_concurrency == 64
+        assert args.target_latency == 0.5
+
+    def test_parser_resume_option(self):
+        """Test the --resume flag defaults to off."""
+        assert parser.PARSER.parse_args(["--scan", "user", "--resume"]).resume is True
+        assert parser.PARSER.parse_args(["--scan", "user"]).resume is False
+
+    def test_parser_format_option(self):
+        """Test the --format option defaults to Markdown."""
+        assert parser.PARSER.parse_args(["--scan", "user", "--format", "jsonl"]).format == "jsonl"
+        assert parser.PARSER.parse_args(["--scan", "user"]).format == "md"
+
+    def test_parser_workers_option(self):
+        """Test --workers takes a number of processes and defaults to one."""
+        assert parser.PARSER.parse_args(["--scan", "user", "--workers", "4"]).workers == 4
+        assert parser.PARSER.parse_args(["--scan", "user"]).workers == 1
+
+    def test_parser_queue_options(self):
+        """Test the work queue options and their defaults."""
+        args = parser.PARSER.parse_args(["--scan", "user", "--queue", "q.sqlite3", "--role", "worker"])
+        assert (args.queue, args.role, args.lease_timeout) == ("q.sqlite3", "worker", 300.0)
+        assert parser.PARSER.parse_args(["--scan", "user"]).role == "coordinator"
+
+    def test_parser_listing_filters(self):
+        """Test the listing filters are off by default."""
+        args = parser.PARSER.parse_args(["--scan", "user", "--skip-archived", "--visibility", "public"])
+        assert (args.skip_archived, args.visibility) == (True, "public")
+        args = parser.PARSER.parse_args(["--scan", "user"])
+        assert (args.skip_archived, args.visibility) == (False, None)
+
+    def test_parser_base_url_option(self):
+        """Test --base-url defaults to the public host."""
+        args = parser.PARSER.parse_args(["--scan", "user", "--base-url", "https://git.example.com"])
+        assert args.base_url == "https://git.example.com"
+        assert parser.PARSER.parse_args(["--scan", "user"]).base_url is None
+
 
 class TestCLIParserHelp:
     """Tests for CLI help messages."""
@@ -0,0 +1,62 @@
+"""Tests for the adaptive concurrency limiter."""
+from unittest.mock import patch
+
+from ghlicense.utils.concurrency import AdaptiveLimiter
+from ghlicense.scanner.scheduler import FairScheduler
+
+
+class TestAdaptiveLimiter:
+    """Tests for AdaptiveLimiter."""
+
+    def test_healthy_responses_grow_the_window(self):
+        """Test additive increase of about one slot per window of successes."""
+        limiter = AdaptiveLimiter(initial=4, maximum=8, target_latency=1.0)
+        for _ in range(6):
+            limiter.record(0.1, 200)
+        assert limiter.limit == 5
+        for _ in range(100):
+            limiter.record(0.1, 200)
+        assert limiter.limit == 8
+        assert limiter.peak == 8
+
+    def test_429_halves_the_window(self):
+        """Test multiplicative decrease on Too Many Requests."""
+        limiter = AdaptiveLimiter(initial=16, maximum=32)
+        limiter.record(0.1, 429)
+        assert limiter.limit == 8
+
+    def test_burst_of_errors_halves_once(self):
+        """Test decreases within the cooldown are ignored."""
+        limiter = AdaptiveLimiter(initial=16, maximum=32)
+        for _ in range(5):
+            limiter.record(0.1, 429)
+        assert limiter.limit == 8
+
+    def test_slow_responses_back_off(self):
+        """Test responses slower than the target latency shrink the window."""
+        limiter = AdaptiveLimiter(initial=8, target_latency=1.0)
+        limiter.record(3.0, 200)
+        assert limiter.limit == 4
+
+    def test_low_quota_backs_off_before_exhaustion(self):
+        """Test the window shrinks when the remaining quota drops below the floor."""
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.record(0.1, 200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4000"})
+        assert limiter.limit == 8
+        limiter.record(0.1, 200, {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "100"})
+        assert limiter.limit == 4
+
+    def test_window_never_drops_below_minimum(self):
+        """Test the window is clamped to the minimum."""
+        limiter = AdaptiveLimiter(initial=2, minimum=2)
+        with patch("ghlicense.utils.concurrency.DECREASE_COOLDOWN", 0):
+            for _ in range(5):
+                limiter.record(0.1, 503)
+        assert limiter.limit == 2
+
+    def test_scheduler_budget_follows_the_window(self):
+        """Test FairScheduler uses the limiter window as its budget."""
+        limiter = AdaptiveLimiter(initial=4)
+        scheduler = FairScheduler(4, limiter)
+        limiter.record(0.1, 429)
+        assert scheduler.budget == 2
@@ -169,6 +169,53 @@ class TestPickLicenseFromLastUsed:
         assert result == "abc"
 
 
+class TestLoadTokens:
+    """Tests for load_tokens."""
+
+    def test_environment_tokens(self, temp_dir, monkeypatch):
+        """Test the single and the comma-separated variables are combined."""
+        monkeypatch.setenv("HOME", temp_dir)
+        monkeypatch.setenv("GITHUB_TOKEN", "t1")
+        monkeypatch.setenv("GITHUB_TOKENS", "t2, t1,,t3")
+        assert storage.load_tokens("github") == ["t1", "t2", "t3"]
+
+    def test_config_tokens(self, temp_dir, monkeypatch):
+        """Test tokens from the [tokens] section follow the environment's."""
+        monkeypatch.setenv("HOME", temp_dir)
+        monkeypatch.setenv("GITLAB_TOKEN", "env")
+        monkeypatch.delenv("GITLAB_TOKENS", raising=False)
+        os.makedirs(os.path.join(temp_dir, ".gh-license"))
+        with open(os.path.join(temp_dir, ".gh-license", "config.ini"), "w") as f:
+            f.write("[tokens]\ngitlab = c1,c2\ngithub = other\n")
+        assert storage.load_tokens("gitlab") == ["env", "c1", "c2"]
+
+    def test_instance_tokens(self, temp_dir, monkeypatch):
+        """Test a self-hosted instance reads its own key first and never the public host's."""
+        monkeypatch.setenv("HOME", temp_dir)
+        monkeypatch.delenv("GITLAB_TOKEN", raising=False)
+        monkeypatch.delenv("GITLAB_TOKENS", raising=False)
+        os.makedirs(os.path.join(temp_dir, ".gh-license"))
+        with open(os.path.join(temp_dir, ".gh-license", "config.ini"), "w") as f:
+            f.write("[tokens]\ngitlab = public\ngitlab@git.example.com:8443 = internal\n")
+        assert storage.load_tokens("gitlab", "gitlab@git.example.com:8443") == ["internal"]
+        assert storage.load_tokens("gitlab", "gitlab") == ["public"]
+
+    def test_instance_ignores_public_environment(self, temp_dir, monkeypatch):
+        """Test the public host's variables are not sent to a self-hosted instance."""
+        monkeypatch.setenv("HOME", temp_dir)
+        monkeypatch.setenv("GITLAB_TOKEN", "public")
+        monkeypatch.setenv("GITLAB_TOKENS", "public2")
+        assert storage.load_tokens("gitlab", "gitlab@git.example.com") == []
+        assert storage.load_tokens("gitlab", "gitlab") == ["public", "public2"]
+
+    def test_no_tokens(self, temp_dir, monkeypatch):
+        """Test an unconfigured provider has no tokens."""
+        monkeypatch.setenv("HOME", temp_dir)
+        monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+        monkeypatch.delenv("GITHUB_TOKENS", raising=False)
+        assert storage.load_tokens("github") == []
+
+
 class TestConfigStorageEdgeCases:
     """Edge case tests for config storage."""
 
@@ -4,6 +4,7 @@ import pytest
 import asyncio
 
 from ghlicense import functions
+from ghlicense.scanner.result import ScanResult, ScanStatus
 
 
 class TestPrintLicenseStatus:
@@ -183,7 +184,7 @@ class TestLoopRepoScan:
     """Tests for loop_repo_scan function."""
 
     def test_loop_repo_scan_returns_tuple(self, mock_repo):
-        """Test that loop_repo_scan returns (str, int, int, int)."""
+        """Test that loop_repo_scan returns a ScanResult."""
         license_files = ["LICENSE", "LICENSE.md", "LICENSE.txt"]
 
         async def run_async():
@@ -191,12 +192,10 @@ class TestLoopRepoScan:
         
         result = asyncio.run(run_async())
 
-        assert isinstance(result, tuple)
-        assert len(result) == 4
-        assert isinstance(result[0], str)
-        assert isinstance(result[1], int)
-        assert isinstance(result[2], int)
-        assert isinstance(result[3], int)
+        assert isinstance(result, ScanResult)
+        assert result.repo == mock_repo.full_name
+        assert isinstance(result.status, ScanStatus)
+        assert isinstance(result.latency, float)
 
 
 class TestArgsScan:
@@ -0,0 +1,218 @@
+"""Tests for the pooled HTTP client."""
+import asyncio
+import gzip
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ghlicense.utils.http import HTTPPool, HTTPResponse
+from ghlicense.utils.tokens import TokenPool
+
+
+# Seconds the /slow path takes to answer
+SLOW_DELAY = 0.2
+
+
+class _Server(ThreadingHTTPServer):
+    """Threaded server accepting a burst of concurrent connections."""
+
+    request_queue_size = 64
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Tiny keep-alive handler: /LICENSE exists, /moved redirects, /etag revalidates,
+    /slow answers after SLOW_DELAY seconds, anything else is 404."""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    not_modified = 0
+
+    def do_GET(self):
+        self.connections.add(self.client_address)
+        if self.path == "/slow":
+            time.sleep(SLOW_DELAY)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                type(self).not_modified += 1
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"tree")
+            return
+        if self.path == "/gzip":
+            body = gzip.compress(b"compressed") if "gzip" in self.headers.get("Accept-Encoding", "") else b"plain"
+            self.send_response(200)
+            if body != b"plain":
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == "/auth":
+            body = self.headers.get("Authorization", "").encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == "/moved":
+            self.send_response(302)
+            self.send_header("Location", "/LICENSE")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b"MIT License" if self.path == "/LICENSE" else b""
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    """Run a local HTTP/1.1 server for the duration of a test."""
+    _Handler.connections = set()
+    _Handler.not_modified = 0
+    server = _Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTTPPool:
+    """Tests for HTTPPool."""
+
+    def test_request_returns_response(self, http_server):
+        """Test a GET returns status and body."""
+        async def run():
+            async with HTTPPool() as pool:
+                return await pool.request("GET", http_server + "/LICENSE")
+
+        response = asyncio.run(run())
+        assert isinstance(response, HTTPResponse)
+        assert response.status == 200
+        assert response.body == b"MIT License"
+
+    def test_missing_file_is_404(self, http_server):
+        """Test a missing path returns 404 without raising."""
+        async def run():
+            async with HTTPPool() as pool:
+                return await pool.request("GET", http_server + "/nope")
+
+        assert asyncio.run(run()).status == 404
+
+    def test_connection_is_reused(self, http_server):
+        """Test sequential requests to the same host share one connection."""
+        async def run():
+            async with HTTPPool(max_connections_per_host=1) as pool:
+                for _ in range(5):
+                    await pool.request("GET", http_server + "/nope")
+
+        asyncio.run(run())
+        assert len(_Handler.connections) == 1
+
+    def test_stats_count_opened_and_reused(self, http_server):
+        """Test the pool counts opened and reused connections."""
+        async def run():
+            async with HTTPPool(max_connections_per_host=1) as pool:
+                for _ in range(3):
+                    await pool.request("GET", http_server + "/nope")
+                return pool.stats()
+
+        assert asyncio.run(run()) == {"opened": 1, "reused": 2, "requests": 3}
+
+    def test_credentials_authenticate_request(self, http_server):
+        """Test a TokenPool adds its token, and no header is sent without one."""
+        async def run():
+            async with HTTPPool() as pool:
+                authenticated = await pool.request("GET", http_server + "/auth", credentials=TokenPool(["t1"]))
+                anonymous = await pool.request("GET", http_server + "/auth", credentials=TokenPool())
+                return authenticated.body, anonymous.body
+
+        assert asyncio.run(run()) == (b"Bearer t1", b"")
+
+    def test_gzip_body_is_decompressed(self, http_server):
+        """Test full GETs ask for gzip and ranged GETs do not."""
+        async def run():
+            async with HTTPPool() as pool:
+                full = await pool.request("GET", http_server + "/gzip")
+                ranged = await pool.request("GET", http_server + "/gzip", headers={"Range": "bytes=0-0"})
+                return full.body, ranged.body
+
+        assert asyncio.run(run()) == (b"compressed", b"plain")
+
+    def test_redirects_are_followed(self, http_server):
+        """Test 3xx responses are followed to the final URL."""
+        async def run():
+            async with HTTPPool() as pool:
+                return await pool.request("GET", http_server + "/moved")
+
+        response = asyncio.run(run())
+        assert response.status == 200
+        assert response.url.endswith("/LICENSE")
+
+    def test_conditional_request_replays_cached_response(self, http_server, temp_dir):
+        """Test a stored ETag is revalidated and a 304 replays the stored body."""
+        import os
+        from ghlicense.cache import ValidatorCache
+
+        validators = ValidatorCache(os.path.join(temp_dir, "cache.sqlite3"))
+
+        async def run():
+            async with HTTPPool(validators=validators) as pool:
+                first = await pool.request("GET", http_server + "/etag")
+                second = await pool.request("GET", http_server + "/etag")
+            return first, second
+
+        first, second = asyncio.run(run())
+        validators.close()
+        assert first.status == second.status == 200
+        assert second.body == b"tree"
+        assert _Handler.not_modified == 1
+        assert validators.revalidated == 1
+
+    def test_connections_are_not_capped_by_default_executor(self, http_server):
+        """Test every allowed connection is busy at once, whatever the loop's default executor."""
+        async def run():
+            # A tiny default executor would serialise the requests
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+            async with HTTPPool(max_connections_per_host=16) as pool:
+                started = time.monotonic()
+                await asyncio.gather(*(pool.request("GET", http_server + "/slow") for _ in range(16)))
+                return time.monotonic() - started
+
+        assert asyncio.run(run()) < SLOW_DELAY * 4
+
+    def test_latency_excludes_thread_wait(self, http_server):
+        """Test the limiter gets the server's latency, not the wait for a free thread."""
+        from unittest.mock import MagicMock
+
+        limiter = MagicMock()
+
+        async def run():
+            async with HTTPPool(max_connections_per_host=8, limiter=limiter) as pool:
+                # One thread: the requests queue up for it
+                pool._executor = ThreadPoolExecutor(1)
+                await asyncio.gather(*(pool.request("GET", http_server + "/slow") for _ in range(4)))
+
+        asyncio.run(run())
+        latencies = [call.args[0] for call in limiter.record.call_args_list]
+        assert len(latencies) == 4
+        assert max(latencies) < SLOW_DELAY * 2
@@ -0,0 +1,67 @@
+"""Tests for the scan checkpoint journal."""
+import os
+
+from ghlicense.scanner.journal import ScanJournal, journal_path
+from ghlicense.scanner.result import ScanResult, ScanStatus
+
+
+def _result(name, status=ScanStatus.LICENSED):
+    """Return a ScanResult for repo u/<name>."""
+    return ScanResult(f"u/{name}", f"https://x/u/{name}", status, scanned_at=0.0)
+
+
+class TestScanJournal:
+    """Tests for ScanJournal."""
+
+    def test_journal_path_follows_report(self):
+        """Test the journal is kept next to the report."""
+        assert journal_path("out/user-github-license-report.md") == "out/user-github-license-report.journal.jsonl"
+
+    def test_results_are_read_back(self, temp_dir):
+        """Test recorded results are streamed back from the file."""
+        journal = ScanJournal(os.path.join(temp_dir, "j.jsonl"), "github:u")
+        journal.record(_result("a"))
+        journal.record(_result("b", ScanStatus.UNLICENSED))
+        assert list(journal.results()) == [_result("a"), _result("b", ScanStatus.UNLICENSED)]
+        journal.close()
+
+    def test_resume_keeps_complete_results(self, temp_dir):
+        """Test a resumed journal skips complete repos and redoes unknown ones."""
+        path = os.path.join(temp_dir, "j.jsonl")
+        journal = ScanJournal(path, "github:u")
+        journal.record(_result("a"))
+        journal.record(_result("b", ScanStatus.UNKNOWN))
+        journal.close()
+        # A killed scan may leave a cut line behind
+        with open(path, "a", encoding="UTF-8") as journal_file:
+            journal_file.write('{"repo": "u/c", "res')
+
+        resumed = ScanJournal(path, "github:u", resume=True)
+        assert resumed.is_done("u/a")
+        assert not resumed.is_done("u/b")
+        assert not resumed.is_done("u/c")
+        assert list(resumed.results()) == [_result("a")]
+        resumed.close(remove=True)
+        assert not os.path.exists(path)
+
+    def test_resume_ignores_other_account(self, temp_dir):
+        """Test the journal of another account is not reused."""
+        path = os.path.join(temp_dir, "j.jsonl")
+        journal = ScanJournal(path, "github:u")
+        journal.record(_result("a"))
+        journal.close()
+
+        other = ScanJournal(path, "gitlab:u", resume=True)
+        assert not other.is_done("u/a")
+        other.close()
+
+    def test_without_resume_starts_over(self, temp_dir):
+        """Test a new scan truncates the previous journal."""
+        path = os.path.join(temp_dir, "j.jsonl")
+        journal = ScanJournal(path, "github:u")
+        journal.record(_result("a"))
+        journal.close()
+
+        fresh = ScanJournal(path, "github:u")
+        assert list(fresh.results()) == []
+        fresh.close()
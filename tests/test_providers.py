@@ -101,6 +101,12 @@ class TestProviderPluginLoaded:
         """Test PROVIDER_PLUGIN_LOADED is a boolean."""
         assert isinstance(gitlab.PROVIDER_PLUGIN_LOADED, bool)
 
+    def test_http_providers_always_load(self):
+        """Test the GitHub and GitLab providers need no client library to register."""
+        good, _ = repobase.get_providers()
+        assert github.PROVIDER_PLUGIN_LOADED and gitlab.PROVIDER_PLUGIN_LOADED
+        assert "github" in good and "gitlab" in good
+
     @pytest.mark.skipif(not HAS_BITBUCKET, reason="bitbucket module not available")
     def test_bitbucket_provider_plugin_loaded_is_bool(self):
         """Test PROVIDER_PLUGIN_LOADED is a boolean."""
@@ -112,41 +118,53 @@ class TestGitHubProviderFunctional:
 
     def test_github_get_repos_returns_list(self, mock_github_provider):
         """Test get_repos returns a list of repos."""
+        mock_github_provider.session = TestStreamingRepos._session(
+            [{"full_name": "testuser/testrepo", "default_branch": "main"}])
         repos = mock_github_provider.get_repos()
         assert isinstance(repos, list)
+        assert [repo.full_name for repo in repos] == ["testuser/testrepo"]
 
     def test_github_get_license_info_success(self, mock_github_provider):
         """Test get_license_info returns license info on success."""
-        # Mock the github.get_repo and license response
-        mock_repo = mock_github_provider._github_mock.get_repo.return_value
-        mock_license = MagicMock()
-        mock_license.name = "MIT License"
-        mock_license.spdx_id = "MIT"
-        mock_license.key = "mit"
-        mock_repo.get_license.return_value = mock_license
-        
+        mock_github_provider.session = TestStreamingRepos._session(
+            {"name": "LICENSE", "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT"}})
+
         result = mock_github_provider.get_license_info("testuser/testrepo")
-        
-        assert result is not None
-        assert result["name"] == "MIT License"
-        assert result["spdx_id"] == "MIT"
+
+        assert result == {"name": "MIT License", "spdx_id": "MIT", "key": "mit"}
+        url = mock_github_provider.session.request.call_args[0][1]
+        assert url == "https://api.github.com/repos/testuser/testrepo/license"
 
     def test_github_get_license_info_returns_none_on_error(self, mock_github_provider):
         """Test get_license_info returns None on error."""
-        mock_github_provider._github_mock.get_repo.side_effect = Exception("API Error")
-        
+        from unittest.mock import AsyncMock
+        mock_github_provider.session = MagicMock()
+        mock_github_provider.session.request = AsyncMock(side_effect=Exception("API Error"))
+
         result = mock_github_provider.get_license_info("testuser/testrepo")
-        
+
         assert result is None
 
+    def test_github_get_license_info_returns_none_without_license(self, mock_github_provider):
+        """Test a repo without a license (404) has no license info."""
+        from unittest.mock import AsyncMock
+        response = MagicMock(status=404, reason="Not Found", headers={})
+        mock_github_provider.session = MagicMock()
+        mock_github_provider.session.request = AsyncMock(return_value=response)
+
+        assert mock_github_provider.get_license_info("testuser/testrepo") is None
+
 
 class TestGitLabProviderFunctional:
     """Functional tests for GitLab provider with mocks."""
 
     def test_gitlab_get_repos_returns_list(self, mock_gitlab_provider):
         """Test get_repos returns a list of repos."""
+        mock_gitlab_provider.session = TestStreamingRepos._session(
+            [{"path_with_namespace": "testuser/testrepo", "default_branch": "main"}])
         repos = mock_gitlab_provider.get_repos()
         assert isinstance(repos, list)
+        assert [repo.full_name for repo in repos] == ["testuser/testrepo"]
 
 
 class TestBitbucketProviderFunctional:
@@ -156,4 +174,459 @@ class TestBitbucketProviderFunctional:
     def test_bitbucket_provider_instantiation(self):
         """Test BitBucketProvider can be instantiated."""
         # Test the provider class exists and can be accessed
-        assert hasattr(bitbucket, 'BitBucketProvider')
\ No newline at end of file
+        assert hasattr(bitbucket, 'BitBucketProvider')
+
+class TestRootListing:
+    """Tests for the providers' root listings."""
+
+    @staticmethod
+    def _pool(status, payload):
+        import json
+        from unittest.mock import AsyncMock
+        response = MagicMock()
+        response.status = status
+        response.headers = {}
+        response.body = json.dumps(payload).encode()
+        pool = MagicMock()
+        pool.request = AsyncMock(return_value=response)
+        return pool
+
+    def test_github_list_root_files(self, mock_github_provider, mock_repo):
+        """Test GitHub root listing uses the git trees API."""
+        import asyncio
+        pool = self._pool(200, {"tree": [{"path": "LICENSE", "type": "blob"},
+                                         {"path": "src", "type": "tree"}]})
+        names = asyncio.run(mock_github_provider.list_root_files(mock_repo, pool))
+        assert names == ["LICENSE", "src"]
+        url = pool.request.call_args[0][1]
+        assert url == "https://api.github.com/repos/testuser/testrepo/git/trees/main"
+
+    def test_github_empty_repo_lists_nothing(self, mock_github_provider, mock_repo):
+        """Test an empty GitHub repo (409) has no root files."""
+        import asyncio
+        pool = self._pool(409, {"message": "Git Repository is empty."})
+        assert asyncio.run(mock_github_provider.list_root_files(mock_repo, pool)) == []
+
+    def test_gitlab_list_root_files(self, mock_gitlab_provider, mock_repo):
+        """Test GitLab root listing uses the repository tree API."""
+        import asyncio
+        pool = self._pool(200, [{"name": "COPYING", "type": "blob"}])
+        names = asyncio.run(mock_gitlab_provider.list_root_files(mock_repo, pool))
+        assert names == ["COPYING"]
+        url = pool.request.call_args[0][1]
+        assert url.startswith("https://gitlab.com/api/v4/projects/testuser%2Ftestrepo/repository/tree")
+        assert "ref=main" in url
+
+    def test_gitlab_root_listing_follows_pages(self, mock_gitlab_provider, mock_repo):
+        """Test a GitLab root spanning two pages is listed completely."""
+        import asyncio
+        first = self._pool(200, [{"name": f"file{i}", "type": "blob"} for i in range(gitlab.PAGE_SIZE)])
+        second = self._pool(200, [{"name": "LICENSE", "type": "blob"}])
+        page_2 = "https://gitlab.com/api/v4/projects/1/repository/tree?page_token=abc&per_page=100"
+        first.request.return_value.headers = {"Link": f'<{page_2}>; rel="next"'}
+        first.request.side_effect = [first.request.return_value, second.request.return_value]
+
+        names = asyncio.run(mock_gitlab_provider.list_root_files(mock_repo, first))
+        assert len(names) == gitlab.PAGE_SIZE + 1 and names[-1] == "LICENSE"
+        assert first.request.call_args[0][1] == page_2
+
+
+class TestGitHubGraphQL:
+    """Tests for the batched GraphQL license lookup against a fake endpoint."""
+
+    @staticmethod
+    def _page(nodes, has_next, cursor=None):
+        import json
+        response = MagicMock()
+        response.status = 200
+        response.headers = {}
+        response.body = json.dumps({"data": {"repositoryOwner": {"repositories": {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+            "nodes": nodes,
+        }}}}).encode()
+        return response
+
+    @staticmethod
+    def _node(name, fork=False, spdx=None, entries=("README.md",), archived=False, visibility="PUBLIC"):
+        return {
+            "nameWithOwner": name,
+            "isFork": fork,
+            "isArchived": archived,
+            "visibility": visibility,
+            "licenseInfo": {"key": spdx.lower(), "name": spdx, "spdxId": spdx} if spdx else None,
+            "defaultBranchRef": {"name": "main"},
+            "object": {"entries": [{"name": entry} for entry in entries]},
+        }
+
+    def test_paginates_and_builds_repos(self, mock_github_provider):
+        """Test cursor pagination and Repo construction from GraphQL nodes."""
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock
+
+        pool = MagicMock()
+        pool.request = AsyncMock(side_effect=[
+            self._page([self._node("testuser/a", spdx="MIT", entries=("LICENSE",))], True, "c1"),
+            self._page([self._node("testuser/b", fork=True)], False),
+        ])
+        mock_github_provider.token = "secret"
+        mock_github_provider.graphql_url = "http://fake/graphql"
+
+        async def collect():
+            return [repo async for repo in mock_github_provider.iter_repos_graphql(pool, page_size=1)]
+
+        repos = asyncio.run(collect())
+
+        assert [repo.full_name for repo in repos] == ["testuser/a", "testuser/b"]
+        assert repos[0].license_spdx == "MIT"
+        assert repos[0].root_files == ["LICENSE"]
+        assert repos[1].fork is True
+        assert pool.request.call_count == 2
+        second_query = json.loads(pool.request.call_args[1]["body"])
+        assert second_query["variables"]["after"] == "c1"
+        assert pool.request.call_args[0][1] == "http://fake/graphql"
+
+    def test_filters_match_rest_listing(self, mock_github_provider):
+        """Test the GraphQL and REST listings skip the same archived and non-public repos."""
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock
+
+        listing = [("testuser/live", False, "public"), ("testuser/old", True, "public"),
+                   ("testuser/secret", False, "private"), ("testuser/corp", False, "internal")]
+        pool = MagicMock()
+        pool.request = AsyncMock(return_value=self._page(
+            [self._node(name, archived=archived, visibility=visibility.upper())
+             for name, archived, visibility in listing], False))
+        mock_github_provider.session = TestStreamingRepos._session(
+            [{"full_name": name, "archived": archived, "visibility": visibility}
+             for name, archived, visibility in listing])
+        mock_github_provider.token = "secret"
+        mock_github_provider.skip_archived = True
+        mock_github_provider.visibility = "public"
+
+        async def collect():
+            graphql = [repo.full_name async for repo in mock_github_provider.iter_repos_graphql(pool)]
+            rest = [repo.full_name async for repo in mock_github_provider.iter_repos()]
+            return graphql, rest
+
+        graphql, rest = asyncio.run(collect())
+        assert graphql == rest == ["testuser/live"]
+        assert "isFork: false" in json.loads(pool.request.call_args[1]["body"])["query"]
+
+    def test_requires_token(self, mock_github_provider):
+        """Test GraphQL is reported unavailable without a token."""
+        import asyncio
+        mock_github_provider.token = None
+        with pytest.raises(github.GraphQLError):
+            asyncio.run(mock_github_provider.iter_repos_graphql(MagicMock()).__anext__())
+
+    def test_graphql_errors_raise(self, mock_github_provider):
+        """Test GraphQL error payloads raise GraphQLError."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        response = MagicMock()
+        response.status = 200
+        response.headers = {}
+        response.body = b'{"errors": [{"message": "Something went wrong"}]}'
+        pool = MagicMock()
+        pool.request = AsyncMock(return_value=response)
+        mock_github_provider.token = "secret"
+        with pytest.raises(github.GraphQLError):
+            asyncio.run(mock_github_provider.iter_repos_graphql(pool).__anext__())
+
+
+class TestStreamingRepos:
+    """Tests for page-by-page repository enumeration."""
+
+    @staticmethod
+    def _session(*pages):
+        """A fake session answering each listing request with the next JSON page."""
+        import json
+        from unittest.mock import AsyncMock
+        responses = []
+        for page in pages:
+            response = MagicMock()
+            response.status = 200
+            response.headers = {}
+            response.body = json.dumps(page).encode()
+            responses.append(response)
+        session = MagicMock()
+        session.request = AsyncMock(side_effect=responses)
+        return session
+
+    def test_github_iter_repos_yields_pages(self, mock_github_provider):
+        """Test GitHub repos are yielded page by page until a short page."""
+        import asyncio
+        repo = {"full_name": "testuser/testrepo", "default_branch": "main", "fork": False,
+                "pushed_at": "2024-01-01T00:00:00Z"}
+        mock_github_provider.session = self._session([repo] * github.PAGE_SIZE, [repo])
+
+        async def collect():
+            return [r async for r in mock_github_provider.iter_repos()]
+
+        repos = asyncio.run(collect())
+        assert len(repos) == github.PAGE_SIZE + 1
+        assert repos[0].revision == "2024-01-01T00:00:00Z"
+        calls = mock_github_provider.session.request.call_args_list
+        assert len(calls) == 2
+        assert calls[1][0][1].endswith("/users/testuser/repos?type=source&per_page=100&page=2")
+
+    def test_github_listing_rate_limit_is_retried(self, mock_github_provider):
+        """Test an exhausted quota on a listing page is retried."""
+        import asyncio
+        from unittest.mock import patch
+        session = self._session([], [])
+        limited = session.request.side_effect
+        first = MagicMock(status=403, headers={"X-RateLimit-Remaining": "0", "Retry-After": "0"})
+        session.request.side_effect = [first, *limited]
+        mock_github_provider.session = session
+
+        async def collect():
+            return [r async for r in mock_github_provider.iter_repos()]
+
+        with patch("asyncio.sleep"):
+            assert asyncio.run(collect()) == []
+        assert session.request.call_count == 2
+
+    def test_gitlab_iter_repos_skips_forks(self, mock_gitlab_provider):
+        """Test GitLab streaming drops forked projects."""
+        import asyncio
+        source = {"path_with_namespace": "testuser/a", "default_branch": "main"}
+        fork = {"path_with_namespace": "testuser/b", "default_branch": "main", "forked_from_project": {"id": 1}}
+        mock_gitlab_provider.session = self._session([source, fork])
+
+        async def collect():
+            return [r async for r in mock_gitlab_provider.iter_repos()]
+
+        assert [r.full_name for r in asyncio.run(collect())] == ["testuser/a"]
+        url = mock_gitlab_provider.session.request.call_args[0][1]
+        assert "/users/testuser/projects?" in url
+        assert "owned=true" in url and "pagination=keyset" in url and "order_by=id" in url
+
+    def test_provider_session_is_shared(self, mock_github_provider):
+        """Test a provider creates its own pool only when none was assigned."""
+        from ghlicense.utils.http import HTTPPool
+        pool = HTTPPool()
+        mock_github_provider.session = pool
+        assert mock_github_provider.session is pool
+
+
+class TestParallelListing:
+    """Tests for listing the pages of a large account concurrently."""
+
+    @staticmethod
+    def _paged_session(pages, first_headers):
+        """A fake session answering each page=N request with pages[N - 1], counting requests in flight."""
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock
+        from urllib.parse import parse_qs, urlsplit
+
+        state = {"in_flight": 0, "peak": 0}
+
+        async def request(method, url, **kwargs):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0)
+            state["in_flight"] -= 1
+            page = int(parse_qs(urlsplit(url).query).get("page", ["1"])[0])
+            return MagicMock(status=200, headers=first_headers if page == 1 else {},
+                             body=json.dumps(pages[page - 1]).encode())
+
+        session = MagicMock()
+        session.request = AsyncMock(side_effect=request)
+        session.state = state
+        return session
+
+    def test_link_header_pages_are_fetched_concurrently(self, mock_github_provider):
+        """Test GitHub pages after the first are requested together and yielded in order."""
+        pages = [[{"full_name": f"testuser/r{page}-{i}", "default_branch": "main"} for i in range(github.PAGE_SIZE)]
+                 for page in range(1, 5)]
+        link = ('<https://api.github.com/user/1/repos?page=2>; rel="next", '
+                '<https://api.github.com/user/1/repos?page=4>; rel="last"')
+        mock_github_provider.session = self._paged_session(pages, {"Link": link})
+
+        repos = mock_github_provider.get_repos()
+        assert [repo.full_name for repo in repos] == [data["full_name"] for page in pages for data in page]
+        assert mock_github_provider.session.request.call_count == 4
+        assert mock_github_provider.session.state["peak"] == 3
+
+    def test_gitlab_total_pages_header(self, mock_gitlab_provider):
+        """Test GitLab's X-Total-Pages bounds the listing without a trailing empty page."""
+        import asyncio
+        pages = [[{"path_with_namespace": f"testuser/r{page}-{i}", "default_branch": "main"}
+                  for i in range(gitlab.PAGE_SIZE)] for page in range(1, 3)]
+        mock_gitlab_provider.session = self._paged_session(pages, {"X-Total-Pages": "2"})
+
+        async def collect():
+            return [r async for r in mock_gitlab_provider.iter_repos()]
+
+        assert len(asyncio.run(collect())) == 2 * gitlab.PAGE_SIZE
+        assert mock_gitlab_provider.session.request.call_count == 2
+
+    def test_last_page_parsing(self):
+        """Test the page count is read from either header."""
+        from ghlicense.utils.pagination import last_page, parse_link_header
+        link = '<https://x/?per_page=100&page=2>; rel="next", <https://x/?per_page=100&page=81>; rel="last"'
+        assert parse_link_header(link)["next"] == "https://x/?per_page=100&page=2"
+        assert last_page({"Link": link}) == 81
+        assert last_page({"X-Total-Pages": "7"}) == 7
+        assert last_page({}) is None
+
+
+class TestGitLabListing:
+    """Tests for the GitLab keyset listing, filters and group scanning."""
+
+    @staticmethod
+    def _response(status, body=(), headers=None):
+        import json
+        return MagicMock(status=status, reason="", headers=headers or {}, body=json.dumps(list(body)).encode())
+
+    @staticmethod
+    def _collect(provider):
+        import asyncio
+
+        async def collect():
+            return [r async for r in provider.iter_repos()]
+
+        return asyncio.run(collect())
+
+    def test_keyset_pages_follow_next_link(self, mock_gitlab_provider):
+        """Test keyset pages are walked through the Link rel="next" header."""
+        from unittest.mock import AsyncMock
+        next_url = "https://gitlab.com/api/v4/users/testuser/projects?id_after=1&pagination=keyset"
+        session = MagicMock()
+        session.request = AsyncMock(side_effect=[
+            self._response(200, [{"path_with_namespace": "testuser/a"}], {"Link": f'<{next_url}>; rel="next"'}),
+            self._response(200, [{"path_with_namespace": "testuser/b"}]),
+        ])
+        mock_gitlab_provider.session = session
+
+        assert [r.full_name for r in self._collect(mock_gitlab_provider)] == ["testuser/a", "testuser/b"]
+        assert session.request.call_args_list[1][0][1] == next_url
+
+    def test_unknown_user_is_scanned_as_group(self, mock_gitlab_provider):
+        """Test a name that is not a user lists the group with its subgroups."""
+        from unittest.mock import AsyncMock
+        session = MagicMock()
+        session.request = AsyncMock(side_effect=[
+            self._response(404),
+            self._response(200, [{"path_with_namespace": "testuser/sub/a"}]),
+        ])
+        mock_gitlab_provider.session = session
+
+        assert [r.full_name for r in self._collect(mock_gitlab_provider)] == ["testuser/sub/a"]
+        url = session.request.call_args_list[1][0][1]
+        assert "/groups/testuser/projects?" in url and "include_subgroups=true" in url
+
+    def test_subgroup_path_and_filters(self, mock_gitlab_provider):
+        """Test a subgroup path goes straight to the group listing, with the filters in the query."""
+        from unittest.mock import AsyncMock
+        session = MagicMock()
+        session.request = AsyncMock(return_value=self._response(200))
+        mock_gitlab_provider.session = session
+        mock_gitlab_provider.username = "org/sub"
+        mock_gitlab_provider.skip_archived = True
+        mock_gitlab_provider.visibility = "internal"
+
+        assert self._collect(mock_gitlab_provider) == []
+        url = session.request.call_args[0][1]
+        assert "/groups/org%2Fsub/projects?" in url
+        assert "archived=false" in url and "visibility=internal" in url
+
+    def test_github_filters_archived(self, mock_github_provider):
+        """Test GitHub drops archived repos client-side when asked to."""
+        mock_github_provider.session = TestStreamingRepos._session(
+            [{"full_name": "testuser/a", "archived": True}, {"full_name": "testuser/b", "archived": False}])
+        mock_github_provider.skip_archived = True
+        assert [r.full_name for r in self._collect(mock_github_provider)] == ["testuser/b"]
+
+    def test_listing_carries_detected_license(self, mock_gitlab_provider):
+        """Test license=true is requested and the detected license lands on the Repo."""
+        from unittest.mock import AsyncMock
+        session = MagicMock()
+        session.request = AsyncMock(return_value=self._response(200, [
+            {"path_with_namespace": "testuser/a", "default_branch": "main",
+             "license_url": "https://gitlab.com/testuser/a/-/blob/main/LICENSE.md",
+             "license": {"key": "apache-2.0", "name": "Apache License 2.0"}},
+            {"path_with_namespace": "testuser/b", "default_branch": "main", "license_url": None, "license": None},
+        ]))
+        mock_gitlab_provider.session = session
+
+        licensed, unknown = self._collect(mock_gitlab_provider)
+        assert "license=true" in session.request.call_args[0][1]
+        assert (licensed.license_spdx, licensed.license_file) == ("Apache-2.0", "LICENSE.md")
+        assert (unknown.license_spdx, unknown.license_file) == (None, None)
+
+    def test_license_key_to_spdx(self):
+        """Test GitLab license keys map to SPDX identifiers."""
+        assert gitlab.license_spdx("mit") == "MIT"
+        assert gitlab.license_spdx("gpl-3.0") == "GPL-3.0"
+        assert gitlab.license_spdx("bsd-3-clause") == "BSD-3-Clause"
+        assert gitlab.license_spdx(None) is None
+
+
+class TestSelfHostedInstances:
+    """Tests for providers on GitHub Enterprise and self-hosted GitLab."""
+
+    def test_github_enterprise_urls(self):
+        """Test a GHE base URL drives the API, GraphQL and repo URLs."""
+        provider = github.GitHubProvider("u", base_url="https://ghe.example.com/")
+        assert provider.api_url == "https://ghe.example.com/api/v3"
+        assert provider.graphql_url == "https://ghe.example.com/api/graphql"
+        repo = provider._repo_from_rest({"full_name": "u/r", "default_branch": "main"})
+        assert repo.repo_url == "https://ghe.example.com/u/r"
+
+    def test_gitlab_instance_urls(self):
+        """Test a self-hosted GitLab base URL drives the API and repo URLs."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        provider = gitlab.GitLabProvider("u", base_url="https://git.example.com")
+        session = MagicMock()
+        session.request = AsyncMock(return_value=TestGitLabListing._response(
+            200, [{"path_with_namespace": "u/r", "default_branch": "main"}]))
+        provider.session = session
+
+        async def collect():
+            return [r async for r in provider.iter_repos()]
+
+        repos = asyncio.run(collect())
+        assert session.request.call_args[0][1].startswith("https://git.example.com/api/v4/users/u/projects?")
+        assert repos[0].repo_url == "https://git.example.com/u/r"
+
+
+class TestRawContentURLs:
+    """Tests for the raw content URLs the probes are sent to."""
+
+    def test_github_raw_urls(self, mock_github_provider):
+        """Test github.com files come from raw.githubusercontent.com."""
+        assert (mock_github_provider.raw_content_url("u/r", "main", "LICENSE")
+                == "https://raw.githubusercontent.com/u/r/main/LICENSE")
+        assert (mock_github_provider.raw_content_url("u/r", "release/1.0")
+                == "https://raw.githubusercontent.com/u/r/release/1.0/")
+        repo = mock_github_provider._repo_from_rest({"full_name": "u/r", "default_branch": "dev"})
+        assert repo.raw_url("LICENSE.md") == "https://raw.githubusercontent.com/u/r/dev/LICENSE.md"
+        assert repo.repo_url == "https://github.com/u/r"
+
+    def test_github_enterprise_raw_urls(self):
+        """Test GitHub Enterprise files come from the instance's /raw/ path."""
+        provider = github.GitHubProvider("u", base_url="https://ghe.example.com")
+        assert (provider.raw_content_url("u/r", "main", "LICENSE")
+                == "https://ghe.example.com/u/r/raw/main/LICENSE")
+
+    def test_github_graphql_repo_raw_url(self, mock_github_provider):
+        """Test repos listed through GraphQL get the raw base URL too."""
+        repo = mock_github_provider._repo_from_graphql({"nameWithOwner": "u/r", "isFork": False,
+                                                        "defaultBranchRef": {"name": "main"}})
+        assert repo.raw_base_url == "https://raw.githubusercontent.com/u/r/main/"
+
+    def test_gitlab_raw_urls(self, mock_gitlab_provider):
+        """Test GitLab files come from /-/raw/, on gitlab.com and self-hosted."""
+        assert (mock_gitlab_provider.raw_content_url("group/sub/r", "main", "LICENSE")
+                == "https://gitlab.com/group/sub/r/-/raw/main/LICENSE")
+        repo = mock_gitlab_provider._repo_from_rest({"path_with_namespace": "u/r", "default_branch": "main"})
+        assert repo.raw_url("COPYING") == "https://gitlab.com/u/r/-/raw/main/COPYING"
+        provider = gitlab.GitLabProvider("u", base_url="https://git.example.com/")
+        assert (provider.raw_content_url("u/r", "main", "LICENSE")
+                == "https://git.example.com/u/r/-/raw/main/LICENSE")
@@ -0,0 +1,150 @@
+"""Tests for the shared rate limit budgets."""
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from ghlicense.utils.ratelimit import RateLimitBudget, budget_key, get_budget
+from ghlicense.utils.retry import RateLimitError, RetryPolicy
+from ghlicense.utils.tokens import TokenPool
+
+
+class TestRateLimitBudget:
+    """Tests for RateLimitBudget."""
+
+    def test_unseeded_budget_never_waits(self):
+        """Test requests pass freely until a quota has been seen."""
+        budget = RateLimitBudget("api.example.com")
+        with patch("asyncio.sleep") as sleep:
+            asyncio.run(budget.acquire())
+        sleep.assert_not_called()
+        assert budget.remaining is None
+
+    def test_update_reads_github_headers(self):
+        """Test X-RateLimit-* headers seed the bucket."""
+        budget = RateLimitBudget("api.github.com")
+        budget.update({"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "4990",
+                       "X-RateLimit-Reset": "1700000000"})
+        assert (budget.limit, budget.remaining, budget.reset_at) == (5000, 4990, 1700000000.0)
+
+    def test_update_reads_gitlab_headers(self):
+        """Test RateLimit-* headers seed the bucket."""
+        budget = RateLimitBudget("gitlab.com")
+        budget.update({"RateLimit-Limit": "2000", "RateLimit-Remaining": "12",
+                       "RateLimit-Reset": "1700000000"})
+        assert (budget.limit, budget.remaining) == (2000, 12)
+
+    def test_acquire_draws_from_bucket(self):
+        """Test each request takes one token while the quota is ample."""
+        budget = RateLimitBudget("api.github.com")
+        budget.set_quota(5000, 4000, time.time() + 3600)
+        with patch("asyncio.sleep") as sleep:
+            asyncio.run(budget.acquire())
+        sleep.assert_not_called()
+        assert budget.remaining == 3999
+
+    def test_exhausted_budget_waits_for_reset(self):
+        """Test an empty bucket waits until the quota resets."""
+        budget = RateLimitBudget("api.github.com")
+        budget.set_quota(5000, 0, time.time() + 30)
+
+        async def fake_sleep(delay):
+            budget.reset_at = time.time()
+
+        with patch("asyncio.sleep", side_effect=fake_sleep) as sleep:
+            asyncio.run(budget.acquire())
+        assert 29 < sleep.call_args[0][0] <= 30
+        assert budget.remaining == 4999
+
+    def test_low_budget_is_paced_until_reset(self):
+        """Test requests below the pacing threshold are spread evenly."""
+        budget = RateLimitBudget("api.github.com")
+        budget.set_quota(100, 10, time.time() + 100)
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        async def run():
+            for _ in range(3):
+                await budget.acquire()
+
+        with patch("asyncio.sleep", side_effect=fake_sleep):
+            asyncio.run(run())
+        # The first request goes out at once, the next ones about 10s apart
+        # (the sleeps are measured from the start since no time passes here)
+        assert len(delays) == 2
+        assert 9 < delays[0] <= 10
+        assert 9 < delays[1] - delays[0] <= 12
+
+
+class TestBudgetRegistry:
+    """Tests for the shared budget registry."""
+
+    def test_budget_is_shared_per_host(self):
+        """Test URLs of the same host draw from the same budget."""
+        assert get_budget("https://api.github.com/repos/a/b") is get_budget("https://api.github.com/users/a")
+
+    def test_graphql_has_its_own_budget(self):
+        """Test GitHub GraphQL is metered apart from REST."""
+        assert budget_key("https://api.github.com/graphql") == "api.github.com/graphql"
+        assert budget_key("https://api.github.com/repos/a/b") == "api.github.com"
+
+
+class TestTokenPool:
+    """Tests for spreading requests over several tokens."""
+
+    URL = "https://api.github.com/repos/a/b"
+
+    def test_tokens_are_deduplicated(self):
+        """Test empty and repeated tokens are dropped."""
+        tokens = TokenPool(["a", "", "b", "a"])
+        assert tokens.tokens == ["a", "b"] and len(tokens) == 2
+        assert tokens.first() == "a"
+        assert TokenPool().first() is None
+
+    def test_pick_prefers_most_remaining(self):
+        """Test the token with the most quota left is used."""
+        tokens = TokenPool(["a", "b"])
+        reset_at = time.time() + 3600
+        tokens.budget("a", self.URL).set_quota(5000, 10, reset_at)
+        tokens.budget("b", self.URL).set_quota(5000, 4000, reset_at)
+        assert tokens.pick(self.URL) == "b"
+
+    def test_unseen_and_reset_tokens_are_preferred(self):
+        """Test a token without a known quota, or whose window reset, counts as full."""
+        tokens = TokenPool(["a", "b"])
+        tokens.budget("a", self.URL).set_quota(5000, 4000, time.time() + 3600)
+        assert tokens.pick(self.URL) == "b"
+        tokens.budget("b", self.URL).set_quota(5000, 0, time.time() - 1)
+        assert tokens.pick(self.URL) == "b"
+
+    def test_budgets_are_per_token_and_quota(self):
+        """Test each token meters REST and GraphQL apart, and apart from the host budget."""
+        tokens = TokenPool(["a"])
+        rest = tokens.budget("a", self.URL)
+        assert tokens.budget("a", "https://api.github.com/graphql") is not rest
+        assert rest is not get_budget(self.URL)
+
+    def test_acquire_returns_token_and_budget(self):
+        """Test acquire hands out the picked token with its budget."""
+        tokens = TokenPool(["a"])
+        token, budget = asyncio.run(tokens.acquire(self.URL))
+        assert token == "a" and budget is tokens.budget("a", self.URL)
+        assert TokenPool.auth_headers("a") == {"Authorization": "Bearer a"}
+
+
+class TestQuotaAwareRetry:
+    """Tests for the quota reset in the retry delay."""
+
+    def test_delay_waits_for_quota_reset(self):
+        """Test an exhausted quota delays the retry until the reset."""
+        response = MagicMock()
+        response.headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 20)}
+        delay = RetryPolicy().next_delay(RateLimitError("403", response=response), 0, 0.0)
+        assert 19 < delay <= 20
+
+    def test_delay_falls_back_to_backoff(self):
+        """Test a quota that is not exhausted keeps the exponential backoff."""
+        response = MagicMock()
+        response.headers = {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(time.time() + 20)}
+        assert RetryPolicy().next_delay(RateLimitError("429", response=response), 2, 0.0) == 4.0
@@ -37,6 +37,12 @@ class TestRepo:
         assert repo.default_branch == "master"
         assert repo.fork is False
 
+    def test_raw_url_quotes_path(self):
+        """Test raw_url appends the URL-quoted file path to the raw base URL."""
+        repo = repobase.Repo("u/r", "https://raw.example.com/u/r/main/", "https://example.com/u/r")
+        assert repo.raw_url("LICENSE") == "https://raw.example.com/u/r/main/LICENSE"
+        assert repo.raw_url("LICENSE FILE.md") == "https://raw.example.com/u/r/main/LICENSE%20FILE.md"
+
 
 class TestProvider:
     """Tests for Provider abstract class."""
@@ -153,6 +159,30 @@ class TestGetProvider:
         assert exc_info.value.code == 1
 
 
+class TestProviderInstances:
+    """Tests for create_provider and instance_name."""
+
+    def test_instance_name(self):
+        """Test the public host is named after the provider and instances after their host."""
+        assert repobase.instance_name("gitlab") == "gitlab"
+        assert repobase.instance_name("gitlab", "https://Git.Example.com/") == "gitlab@git.example.com"
+        assert repobase.instance_name("gitlab", "https://example.com:8443/gitlab") == "gitlab@example.com:8443/gitlab"
+
+    def test_create_provider_passes_base_url(self):
+        """Test the base URL is only passed for a self-hosted instance."""
+        class DummyProvider(repobase.Provider):
+            def __init__(self, username, base_url=None):
+                super().__init__(username)
+                self.base_url = base_url
+
+            def get_repos(self):
+                return []
+
+        repobase.register_provider("test_instance", DummyProvider, loaded=True)
+        assert repobase.create_provider("test_instance", "u").base_url is None
+        assert repobase.create_provider("test_instance", "u", "https://x").base_url == "https://x"
+
+
 class TestGetProviders:
     """Tests for get_providers function."""
 
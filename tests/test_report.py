@@ -0,0 +1,131 @@
+"""Tests for the streaming report writers."""
+import os
+import csv
+import json
+
+from ghlicense.scanner.report import (
+    REPORT_FIELDS,
+    MarkdownReport,
+    open_report,
+    render_markdown,
+)
+from ghlicense.scanner.result import ScanResult, ScanStatus
+
+LICENSED = ScanResult("u/a", "https://x/u/a", ScanStatus.LICENSED, license_file="LICENSE",
+                      license_url="https://x/u/a/blob/main/LICENSE")
+UNLICENSED = ScanResult("u/b", "https://x/u/b", ScanStatus.UNLICENSED, fork=True)
+UNKNOWN = ScanResult("u/c", "https://x/u/c", ScanStatus.UNKNOWN, detail="HTTP 403")
+
+
+def _write(temp_dir, show_filter, extra_stats=()):
+    """Write a report of three repos and return its text and counts."""
+    path = os.path.join(temp_dir, "report.md")
+    with MarkdownReport(path, "u", "github", show_filter) as report:
+        report.add_all([LICENSED, UNLICENSED, UNKNOWN])
+        counts = report.finish(extra_stats)
+    with open(path, encoding="UTF-8") as report_file:
+        return report_file.read(), counts
+
+
+class TestRendering:
+    """Tests for rendering results as Markdown."""
+
+    def test_licensed_block_links_the_file(self):
+        """Test a licensed repo shows the matched file URL."""
+        assert "✓ Found: https://x/u/a/blob/main/LICENSE" in render_markdown(LICENSED)
+
+    def test_provider_detected_license(self):
+        """Test a license detected by the provider shows its SPDX id."""
+        result = ScanResult("u/d", "https://x/u/d", ScanStatus.LICENSED, spdx_id="MIT")
+        assert "MIT license detected by the provider" in render_markdown(result)
+
+    def test_unlicensed_fork_is_flagged(self):
+        """Test an unlicensed fork gets the fork note."""
+        text = render_markdown(UNLICENSED)
+        assert "proprietary" in text
+        assert "Is a fork" in text
+
+    def test_unknown_shows_reason(self):
+        """Test an unknown result says why."""
+        assert "HTTP 403" in render_markdown(UNKNOWN)
+
+
+class TestMarkdownReport:
+    """Tests for MarkdownReport."""
+
+    def test_all_filter_writes_every_repo(self, temp_dir):
+        """Test every repo block and the statistics are written."""
+        text, counts = _write(temp_dir, "all")
+        assert "## All Repositories" in text
+        assert "u/a" in text and "u/b" in text and "u/c" in text
+        assert "| Repos with Unknown Status | 1 |" in text
+        assert counts == {"licensed": 1, "unlicensed": 1, "forked": 1, "unknown": 1, "total": 3}
+
+    def test_unlicensed_filter(self, temp_dir):
+        """Test the unlicensed filter keeps only unlicensed blocks but counts all repos."""
+        text, counts = _write(temp_dir, "unlicensed")
+        section = text.split("## Statistics")[0]
+        assert "Repo: u/b" in section
+        assert "Repo: u/a" not in section and "Repo: u/c" not in section
+        assert "| Total Repos | 3 |" in text
+
+    def test_unlicensed_links_follow_statistics(self, temp_dir):
+        """Test the spooled links of unlicensed repos are written after the statistics."""
+        text, _ = _write(temp_dir, "licensed", [("Concurrency Window", 8)])
+        stats, links = text.split("## Unlicensed Repositories (Click to Visit)")
+        assert "| Concurrency Window | 8 |" in stats
+        assert links.strip() == "- [https://x/u/b](https://x/u/b)"
+
+
+def _write_format(temp_dir, report_format, show_filter="all"):
+    """Write a report of three repos in a format and return its path."""
+    path = os.path.join(temp_dir, f"report.{report_format}")
+    with open_report(report_format, path, "u", "github", show_filter) as report:
+        report.add_all([LICENSED, UNLICENSED, UNKNOWN])
+        report.finish([("Concurrency Window", 8)])
+    return path
+
+
+class TestMachineReadableReports:
+    """Tests for the JSON, JSON Lines and CSV reports."""
+
+    def test_jsonl_has_one_record_per_repo(self, temp_dir):
+        """Test every line is a record with exactly the schema fields."""
+        with open(_write_format(temp_dir, "jsonl"), encoding="UTF-8") as report_file:
+            records = [json.loads(line) for line in report_file]
+        assert [record["repo"] for record in records] == ["u/a", "u/b", "u/c"]
+        assert all(tuple(record) == REPORT_FIELDS for record in records)
+        assert records[0]["license_file"] == "LICENSE"
+        assert records[1]["status"] == "unlicensed" and records[1]["fork"] is True
+        assert records[2]["scanned_at"].endswith("+00:00")
+
+    def test_jsonl_applies_filter(self, temp_dir):
+        """Test the --show filter drops records."""
+        with open(_write_format(temp_dir, "jsonl", "licensed"), encoding="UTF-8") as report_file:
+            assert [json.loads(line)["repo"] for line in report_file] == ["u/a"]
+
+    def test_json_document(self, temp_dir):
+        """Test the JSON report is one valid document with the statistics."""
+        with open(_write_format(temp_dir, "json"), encoding="UTF-8") as report_file:
+            document = json.load(report_file)
+        assert document["account"] == "u" and document["provider"] == "github"
+        assert len(document["results"]) == 3
+        assert document["statistics"]["unknown"] == 1
+        assert document["statistics"]["Concurrency Window"] == 8
+
+    def test_empty_json_document(self, temp_dir):
+        """Test a report without results is still valid JSON."""
+        path = os.path.join(temp_dir, "empty.json")
+        with open_report("json", path, "u", "github") as report:
+            report.finish()
+        with open(path, encoding="UTF-8") as report_file:
+            assert json.load(report_file)["results"] == []
+
+    def test_csv_header_and_rows(self, temp_dir):
+        """Test the CSV report has the schema as header and a row per repo."""
+        with open(_write_format(temp_dir, "csv"), encoding="UTF-8", newline="") as report_file:
+            reader = csv.DictReader(report_file)
+            rows = list(reader)
+        assert tuple(reader.fieldnames) == REPORT_FIELDS
+        assert [row["status"] for row in rows] == ["licensed", "unlicensed", "unknown"]
+        assert rows[1]["fork"] == "True"
@@ -3,7 +3,9 @@ import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from ghlicense.utils.retry import async_retry, RateLimitError
+from ghlicense.utils.retry import (
+    async_retry, RateLimitError, TransientError, CircuitOpenError, RetryPolicy, RetryBudget, CircuitBreaker,
+)
 
 
 class TestRateLimitError:
@@ -205,4 +207,115 @@ class TestSyncFunctionRetry:
 
         result = await wrapper()
         assert result == "success"
-        assert call_count == 3
\ No newline at end of file
+        assert call_count == 3
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy with async_retry."""
+
+    def test_default_policy_is_plain_backoff(self):
+        """Test no jitter keeps the 1s, 2s, 4s backoff."""
+        policy = RetryPolicy()
+        assert [policy.next_delay(RateLimitError("429"), n, 0) for n in range(3)] == [1, 2, 4]
+
+    def test_full_jitter_stays_below_backoff(self):
+        """Test full jitter draws between zero and the backoff."""
+        policy = RetryPolicy(jitter="full")
+        delays = [policy.next_delay(RateLimitError("429"), 3, 0) for _ in range(50)]
+        assert all(0 <= delay <= 8 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_decorrelated_jitter_is_capped(self):
+        """Test decorrelated jitter grows from the previous delay up to the cap."""
+        policy = RetryPolicy(jitter="decorrelated", base_delay=1, max_delay=10)
+        delay = policy.next_delay(RateLimitError("429"), 0, 0)
+        assert 1 <= delay <= 3
+        assert policy.next_delay(RateLimitError("429"), 5, 100) <= 10
+
+    def test_unknown_jitter_mode_is_rejected(self):
+        """Test an unknown jitter mode raises ValueError."""
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter="random")
+
+    @pytest.mark.asyncio
+    async def test_policy_retries_transient_errors(self):
+        """Test a policy retries transient errors the default decorator does not."""
+        mock_func = AsyncMock(side_effect=[TransientError("503"), TimeoutError(), "success"])
+
+        @async_retry(policy=RetryPolicy(base_delay=0.01))
+        async def func():
+            return await mock_func()
+
+        assert await func() == "success"
+        assert mock_func.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_deadline_fails_fast(self):
+        """Test a retry that would overrun the deadline is not attempted."""
+        mock_func = AsyncMock(side_effect=RateLimitError("429"))
+
+        @async_retry(policy=RetryPolicy(base_delay=1, deadline=0.5))
+        async def func():
+            return await mock_func()
+
+        with pytest.raises(RateLimitError):
+            await func()
+        assert mock_func.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_budget_is_shared(self):
+        """Test operations stop retrying once the scan's budget is spent."""
+        budget = RetryBudget(2)
+        mock_func = AsyncMock(side_effect=RateLimitError("429"))
+
+        @async_retry(policy=RetryPolicy(base_delay=0.01, budget=budget))
+        async def func():
+            return await mock_func()
+
+        with pytest.raises(RateLimitError):
+            await func()
+        with pytest.raises(RateLimitError):
+            await func()
+        assert budget.spent == 2
+        assert mock_func.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_for_failing_host(self):
+        """Test calls to a host fail fast once its circuit is open."""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        mock_func = AsyncMock(side_effect=RateLimitError("429"))
+
+        @async_retry(policy=RetryPolicy(base_delay=0.01, breaker=breaker), host=lambda url: url.split("/")[2])
+        async def fetch(url):
+            return await mock_func(url)
+
+        with pytest.raises(RateLimitError):
+            await fetch("https://flaky.example/a")
+        assert mock_func.call_count == 2
+        with pytest.raises(CircuitOpenError):
+            await fetch("https://flaky.example/b")
+        assert mock_func.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_file_answers_keep_circuit_closed(self):
+        """Test a 404 after a 503 resets the host's consecutive failures."""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        mock_func = AsyncMock(side_effect=[TransientError("503"), FileNotFoundError("404")] * 3)
+
+        @async_retry(policy=RetryPolicy(base_delay=0.01, breaker=breaker), host=lambda url: url.split("/")[2])
+        async def fetch(url):
+            return await mock_func(url)
+
+        for _ in range(3):
+            with pytest.raises(FileNotFoundError):
+                await fetch("https://flaky.example/LICENSE")
+        assert not breaker.is_open("flaky.example")
+        assert mock_func.call_count == 6
+
+    def test_circuit_closes_after_success(self):
+        """Test a successful trial call after the cooldown closes the circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+        breaker.record_failure("host")
+        assert breaker.is_open("host")
+        assert breaker.allow("host")
+        breaker.record_success("host")
+        assert not breaker.is_open("host")
@@ -1,5 +1,9 @@
 """Tests for ghlicense.scanner module."""
+import pytest
+
 from ghlicense.scanner import repo_scan
+from ghlicense.scanner.result import ScanResult, ScanStatus
+from ghlicense.utils.retry import RetryPolicy
 
 
 class TestRepoScanModuleImports:
@@ -87,12 +91,10 @@ class TestLoopRepoScanLogic:
             
             result = asyncio.run(run_test())
             
-            assert isinstance(result, tuple)
-            assert len(result) == 4
-            to_print, count_license, count_no_license, count_forked = result
-            assert count_license == 1
-            assert count_no_license == 0
-            assert "LICENSE" in to_print
+            assert isinstance(result, ScanResult)
+            assert result.status is ScanStatus.LICENSED
+            assert result.license_file == "LICENSE"
+            assert result.license_url.endswith("LICENSE")
 
     def test_loop_repo_scan_license_missing(self, mock_repo):
         """Test loop_repo_scan when license is missing."""
@@ -113,11 +115,10 @@ class TestLoopRepoScanLogic:
             
             result = asyncio.run(run_test())
             
-            assert isinstance(result, tuple)
-            to_print, count_license, count_no_license, count_forked = result
-            assert count_no_license == 1
-            assert count_license == 0
-            assert "proprietary" in to_print
+            assert isinstance(result, ScanResult)
+            assert result.status is ScanStatus.UNLICENSED
+            assert result.license_file is None
+            assert result.http_status == 404
 
     def test_loop_repo_scan_forked_repo(self, mock_repo):
         """Test loop_repo_scan with a forked repository."""
@@ -146,9 +147,8 @@ class TestLoopRepoScanLogic:
             
             result = asyncio.run(run_test())
             
-            to_print, count_license, count_no_license, count_forked = result
-            assert count_forked == 1
-            assert "fork" in to_print.lower()
+            assert result.status is ScanStatus.UNLICENSED
+            assert result.fork is True
 
     def test_loop_repo_scan_connection_error(self, mock_repo):
         """Test loop_repo_scan handles connection errors."""
@@ -161,14 +161,14 @@ class TestLoopRepoScanLogic:
             mock_fetch.side_effect = ConnectionError("Connection failed")
             
             async def run_test():
-                return await repo_scan.loop_repo_scan(mock_repo, license_files)
+                return await repo_scan.loop_repo_scan(mock_repo, license_files,
+                                                      retry_policy=RetryPolicy(base_delay=0.01))
             
             result = asyncio.run(run_test())
             
-            assert isinstance(result, tuple)
-            to_print, count_license, count_no_license, count_forked = result
-            # Connection error should be treated as missing license
-            assert count_no_license == 1
+            # A connection error that outlasts the retries leaves the repo unknown, not missing
+            assert result.status is ScanStatus.UNKNOWN
+            assert "Connection failed" in result.detail
 
 
 
@@ -185,34 +185,515 @@ class TestArgsScanFunction:
         # Just verify function exists
         assert callable(repo_scan.args_scan)
 
-    def test_args_scan_with_custom_report(self, monkeypatch):
+    def test_args_scan_with_custom_report(self, temp_dir):
         """Test args_scan with custom report file."""
         import asyncio
+        import os
         from unittest.mock import patch, MagicMock, AsyncMock
-        
+
         class MockArgs:
             scan = "testuser"
             provider = "github"
-            report = "my-report.txt"
+            report = os.path.join(temp_dir, "my-report.txt")
             show = "all"
-        
-        # Mock provider
-        mock_provider = MagicMock()
+
+        # Mock provider listing one repo
+        repo = repo_scan.repobase.Repo("testuser/testrepo", "https://raw.githubusercontent.com/testuser/testrepo/main/",
+                                       "https://github.com/testuser/testrepo", "main")
         mock_user = MagicMock()
-        mock_repo = MagicMock()
-        mock_repo.full_name = "testuser/testrepo"
-        mock_repo.default_branch = "main"
-        mock_repo.fork = False
-        mock_repo.repo_url = "https://github.com/testuser/testrepo"
-        mock_user.get_repos.return_value = [mock_repo]
-        mock_provider.return_value = mock_user
-        
+
+        async def iter_repos():
+            yield repo
+
+        mock_user.iter_repos = iter_repos
+        mock_provider = MagicMock(return_value=mock_user)
+
         with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=mock_provider):
             with patch('ghlicense.scanner.repo_scan.loop_repo_scan', new_callable=AsyncMock) as mock_loop:
-                mock_loop.return_value = ("URL: https://github.com/testuser/testrepo\n", 0, 1, 0)
-                
+                mock_loop.return_value = ScanResult("testuser/testrepo", "https://github.com/testuser/testrepo",
+                                                    ScanStatus.UNLICENSED)
+
                 async def run():
                     return await repo_scan.args_scan(MockArgs())
-                
-                # Should not raise
-                asyncio.run(run())
\ No newline at end of file
+
+                asyncio.run(run())
+
+        mock_loop.assert_awaited_once()
+        assert mock_loop.call_args[0][0] is repo
+        with open(MockArgs.report, encoding="UTF-8") as report:
+            assert "testuser/testrepo" in report.read()
+
+
+class TestFetchLicenseFileProbeModes:
+    """Tests for HEAD / ranged GET license probes."""
+
+    @staticmethod
+    def _pool(*statuses):
+        from unittest.mock import AsyncMock, MagicMock
+        responses = []
+        for status in statuses:
+            response = MagicMock()
+            response.status = status
+            response.reason = ""
+            response.headers = {}
+            responses.append(response)
+        pool = MagicMock()
+        pool.request = AsyncMock(side_effect=responses)
+        return pool
+
+    def test_head_probe_found(self):
+        """Test a 200 HEAD response means the file exists."""
+        import asyncio
+        pool = self._pool(200)
+        asyncio.run(repo_scan._fetch_license_file("https://x/LICENSE", pool, "head"))
+        pool.request.assert_called_once_with("HEAD", "https://x/LICENSE")
+
+    def test_head_blocked_falls_back_to_range(self):
+        """Test a host refusing HEAD is probed with a one-byte ranged GET."""
+        import asyncio
+        pool = self._pool(405, 206)
+        asyncio.run(repo_scan._fetch_license_file("https://x/LICENSE", pool, "head"))
+        assert pool.request.call_count == 2
+        pool.request.assert_called_with("GET", "https://x/LICENSE", headers={"Range": "bytes=0-0"})
+
+    def test_range_probe_missing_raises_404(self):
+        """Test a 404 on a ranged GET raises HTTPError."""
+        import asyncio
+        import urllib.error
+        import pytest
+        pool = self._pool(404)
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            asyncio.run(repo_scan._fetch_license_file("https://x/LICENSE", pool, "range"))
+        assert exc_info.value.code == 404
+
+
+class TestProbeClassification:
+    """Tests for retrying and classifying probe failures."""
+
+    def _response(self, status):
+        from unittest.mock import MagicMock
+        response = MagicMock()
+        response.status = status
+        response.reason = ""
+        response.headers = {}
+        return response
+
+    def test_rate_limited_probe_is_retried(self, mock_repo):
+        """Test a 429 followed by a 200 reports the license as found."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        pool = MagicMock()
+        pool.request = AsyncMock(side_effect=[self._response(429), self._response(200)])
+        result = asyncio.run(repo_scan.loop_repo_scan(
+            mock_repo, ["LICENSE"], pool=pool, retry_policy=RetryPolicy(base_delay=0.01)))
+        assert result.status is ScanStatus.LICENSED
+        assert result.http_status == 200
+        assert pool.request.call_count == 2
+
+    def test_server_errors_leave_repo_unknown(self, mock_repo):
+        """Test persistent 5xx responses give an unknown result, not a missing one."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        pool = MagicMock()
+        pool.request = AsyncMock(return_value=self._response(503))
+        result = asyncio.run(repo_scan.loop_repo_scan(
+            mock_repo, ["LICENSE"], pool=pool, retry_policy=RetryPolicy(max_retries=2, base_delay=0.01)))
+        assert result.status is ScanStatus.UNKNOWN
+        assert result.http_status == 503
+        assert pool.request.call_count == 2
+
+    def test_unexpected_status_is_not_retried(self, mock_repo):
+        """Test a 403 is not retried and leaves the repo unknown."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        pool = MagicMock()
+        pool.request = AsyncMock(side_effect=[self._response(403), self._response(403)])
+        result = asyncio.run(repo_scan.loop_repo_scan(
+            mock_repo, ["LICENSE"], pool=pool, probe_mode="range", retry_policy=RetryPolicy(base_delay=0.01)))
+        assert result.status is ScanStatus.UNKNOWN
+        assert result.detail == "HTTP 403"
+        assert pool.request.call_count == 1
+
+    def test_unknown_results_are_not_cached(self, temp_dir):
+        """Test a rescan retries only the repos whose status was unknown."""
+        import asyncio
+        import os
+        from unittest.mock import patch
+        from ghlicense.cache import ScanCache
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                yield repo_scan.repobase.Repo("u/known", "https://x/", "https://x", revision="a")
+                yield repo_scan.repobase.Repo("u/unknown", "https://y/", "https://y", revision="b")
+
+        async def fake_scan(repo, *args, **kwargs):
+            if repo.full_name == "u/unknown":
+                return ScanResult(repo.full_name, repo.repo_url, ScanStatus.UNKNOWN)
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        class MockArgs:
+            scan = "u"
+            provider = "github"
+            report = os.path.join(temp_dir, "report.md")
+            show = "all"
+            cache = True
+
+        cache_path = os.path.join(temp_dir, "cache.sqlite3")
+        with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.ScanCache',
+                      side_effect=lambda ttl: ScanCache(cache_path, ttl)), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan) as mock_loop:
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            scanned = [call.args[0].full_name for call in mock_loop.call_args_list]
+        assert scanned.count("u/known") == 1
+        assert scanned.count("u/unknown") == 2
+
+        with open(MockArgs.report, encoding="UTF-8") as report:
+            assert "| Repos with Unknown Status | 1 |" in report.read()
+
+
+    def test_cached_results_are_per_strategy(self, temp_dir):
+        """Test a result of the probe strategy is not reused by a listing scan."""
+        import asyncio
+        import os
+        from unittest.mock import patch
+        from ghlicense.cache import ScanCache
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                yield repo_scan.repobase.Repo("u/r", "https://x/", "https://x", revision="a")
+
+        async def fake_scan(repo, *args, **kwargs):
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.UNLICENSED)
+
+        class MockArgs:
+            scan = "u"
+            provider = "github"
+            report = os.path.join(temp_dir, "report.md")
+            show = "all"
+            cache = True
+            strategy = "probe"
+
+        cache_path = os.path.join(temp_dir, "cache.sqlite3")
+        with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.ScanCache',
+                      side_effect=lambda ttl: ScanCache(cache_path, ttl)), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan) as mock_loop:
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            MockArgs.strategy = "listing"
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            strategies = [call.kwargs["strategy"] for call in mock_loop.call_args_list]
+        assert strategies == ["probe", "listing"]
+
+class TestResumableScan:
+    """Tests for resuming an interrupted scan from its journal."""
+
+    def test_resume_scans_only_missing_repos(self, temp_dir):
+        """Test an interrupted scan keeps its journal and a resumed one finishes it."""
+        import asyncio
+        import os
+        from unittest.mock import patch
+        from ghlicense.scanner.journal import journal_path
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                for name in ("u/a", "u/b"):
+                    yield repo_scan.repobase.Repo(name, "https://x/", "https://x/" + name)
+
+        scanned = []
+
+        async def interrupted_scan(repo, *args, **kwargs):
+            if repo.full_name == "u/b":
+                raise KeyboardInterrupt
+            scanned.append(repo.full_name)
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        async def fake_scan(repo, *args, **kwargs):
+            scanned.append(repo.full_name)
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.UNLICENSED)
+
+        class MockArgs:
+            scan = "u"
+            provider = "github"
+            report = os.path.join(temp_dir, "report.md")
+            show = "all"
+            resume = True
+
+        with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider):
+            with patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=interrupted_scan):
+                with pytest.raises(KeyboardInterrupt):
+                    asyncio.run(repo_scan.args_scan(MockArgs()))
+            assert os.path.exists(journal_path(MockArgs.report))
+            with patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+                asyncio.run(repo_scan.args_scan(MockArgs()))
+
+        assert scanned == ["u/a", "u/b"]
+        assert not os.path.exists(journal_path(MockArgs.report))
+        with open(MockArgs.report, encoding="UTF-8") as report:
+            text = report.read()
+        assert "| Repos with License | 1 |" in text
+        assert "| Repos without License | 1 |" in text
+
+
+class TestScanResult:
+    """Tests for the ScanResult record."""
+
+    def test_round_trips_through_dict(self):
+        """Test a result survives to_dict/from_dict, as used by the journal and cache."""
+        result = ScanResult("u/a", "https://x/u/a", ScanStatus.LICENSED, license_file="LICENSE",
+                            http_status=200, latency=0.5)
+        data = result.to_dict()
+        assert data["status"] == "licensed"
+        assert ScanResult.from_dict(data) == result
+
+    def test_old_payload_is_rejected(self):
+        """Test a tuple-style payload of an older version raises ValueError."""
+        with pytest.raises(ValueError):
+            ScanResult.from_dict(["text", 1, 0, 0, 0])
+        with pytest.raises(ValueError):
+            ScanResult.from_dict({"repo": "u/a"})
+
+    def test_result_has_slots(self):
+        """Test results are compact slotted records."""
+        assert not hasattr(ScanResult("u/a", "https://x", ScanStatus.UNKNOWN), "__dict__")
+
+
+class TestLicenseNameDetection:
+    """Tests for license file name matching in root listings."""
+
+    def test_common_license_names_match(self):
+        """Test license-like names are recognised case-insensitively."""
+        from ghlicense.scanner import is_license_file
+        for name in ["LICENSE", "license.md", "LICENCE", "UNLICENSE", "COPYING",
+                     "COPYING.LESSER", "LICENSE-MIT", "License.txt", "LICENSE-APACHE-2.0",
+                     "LICENSE_MIT.md", "COPYING.LIB", "license.rst"]:
+            assert is_license_file(name), name
+
+    def test_other_names_do_not_match(self):
+        """Test unrelated names and the REUSE LICENSES directory are ignored."""
+        from ghlicense.scanner import is_license_file
+        for name in ["README.md", "LICENSES", "licensed.py", "setup.py", "license.go", "License.php",
+                     "license_test.py", "copying.c", "license-checker.js", "LICENSE.html"]:
+            assert not is_license_file(name), name
+
+    def test_find_license_file_prefers_candidates(self):
+        """Test the preferred candidate order wins over other matches."""
+        from ghlicense.scanner import find_license_file
+        names = ["COPYING", "README.md", "LICENSE.md"]
+        assert find_license_file(names, ["LICENSE", "LICENSE.md"]) == "LICENSE.md"
+        assert find_license_file(["COPYING", "src"], ["LICENSE"]) == "COPYING"
+        assert find_license_file(["README.md"], ["LICENSE"]) is None
+
+
+class TestListingStrategy:
+    """Tests for the single-listing detection strategy."""
+
+    def test_listing_found_skips_probes(self, mock_repo):
+        """Test a license in the root listing is reported without probing."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        provider = MagicMock()
+        provider.list_root_files = AsyncMock(return_value=["README.md", "LICENCE"])
+        with patch.object(repo_scan, '_fetch_license_file') as mock_fetch:
+            result = asyncio.run(repo_scan.loop_repo_scan(
+                mock_repo, ["LICENSE"], provider, pool=MagicMock(), strategy="listing"))
+            assert not mock_fetch.called
+        assert result.status is ScanStatus.LICENSED
+        assert result.license_file == "LICENCE"
+
+    def test_listing_without_license_is_missing(self, mock_repo):
+        """Test a root listing without license names means missing."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock
+
+        provider = MagicMock()
+        provider.list_root_files = AsyncMock(return_value=["README.md"])
+        result = asyncio.run(repo_scan.loop_repo_scan(
+            mock_repo, ["LICENSE"], provider, pool=MagicMock(), strategy="listing"))
+        assert result.status is ScanStatus.UNLICENSED
+
+    def test_listing_error_falls_back_to_probes(self, mock_repo):
+        """Test a failing listing call falls back to probing candidates."""
+        import asyncio
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        provider = MagicMock()
+        provider.list_root_files = AsyncMock(side_effect=ConnectionError("down"))
+        with patch.object(repo_scan, '_fetch_license_file') as mock_fetch:
+            result = asyncio.run(repo_scan.loop_repo_scan(
+                mock_repo, ["LICENSE"], provider, pool=MagicMock(), strategy="listing"))
+            assert mock_fetch.called
+        assert result.status is ScanStatus.LICENSED
+
+
+class TestPrefetchedRootFiles:
+    """Tests for repos whose root listing was prefetched by the provider."""
+
+    def test_prefetched_listing_needs_no_request(self):
+        """Test prefetched root files and provider licenses skip all requests."""
+        import asyncio
+        from unittest.mock import MagicMock, patch
+
+        licensed = repo_scan.repobase.Repo("u/a", "https://x/", "https://x", root_files=["COPYING"])
+        detected = repo_scan.repobase.Repo("u/b", "https://x/", "https://x", root_files=[],
+                                           license_spdx="MIT")
+        unlicensed = repo_scan.repobase.Repo("u/c", "https://x/", "https://x", root_files=["README"])
+        with patch.object(repo_scan, '_fetch_license_file') as mock_fetch:
+            results = [asyncio.run(repo_scan.loop_repo_scan(repo, ["LICENSE"], pool=MagicMock()))
+                       for repo in (licensed, detected, unlicensed)]
+            assert not mock_fetch.called
+        assert [result.status for result in results] == [ScanStatus.LICENSED, ScanStatus.LICENSED,
+                                                          ScanStatus.UNLICENSED]
+        assert results[0].license_file == "COPYING"
+        assert results[1].spdx_id == "MIT"
+
+    def test_detected_license_without_listing_needs_no_request(self):
+        """Test a license detected while listing (GitLab license=true) skips the probes."""
+        import asyncio
+        from unittest.mock import MagicMock, patch
+
+        repo = repo_scan.repobase.Repo("u/a", "https://x/", "https://x", license_spdx="Apache-2.0",
+                                       license_file="LICENSE.txt")
+        with patch.object(repo_scan, '_fetch_license_file') as mock_fetch:
+            result = asyncio.run(repo_scan.loop_repo_scan(repo, ["LICENSE"], pool=MagicMock()))
+            assert not mock_fetch.called
+        assert result.status is ScanStatus.LICENSED
+        assert (result.spdx_id, result.license_file) == ("Apache-2.0", "LICENSE.txt")
+        assert result.license_url == "https://x/LICENSE.txt"
+
+
+class TestStreamingEnumeration:
+    """Tests for scanning repos while the provider is still listing them."""
+
+    def test_scan_starts_before_listing_finishes(self, temp_dir):
+        """Test the first page is scanned before the second page is listed."""
+        import asyncio
+        import os
+        from unittest.mock import patch
+
+        events = []
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                for page in range(2):
+                    events.append(f"page{page}")
+                    yield repo_scan.repobase.Repo(f"u/r{page}", "https://x/", "https://x")
+                    # Let the scan of this page's repo run before the next page
+                    await asyncio.sleep(0.01)
+
+        async def fake_scan(repo, *args, **kwargs):
+            events.append(f"scan {repo.full_name}")
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        class MockArgs:
+            scan = "u"
+            provider = "github"
+            report = os.path.join(temp_dir, "report.md")
+            show = "all"
+
+        with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider):
+            with patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+                asyncio.run(repo_scan.args_scan(MockArgs()))
+
+        assert events.index("scan u/r0") < events.index("page1")
+        with open(MockArgs.report, encoding="UTF-8") as report:
+            assert "| Repos with License | 2 |" in report.read()
+
+    def test_pending_scans_are_bounded(self, temp_dir):
+        """Test the listing waits once MAX_PENDING_SCANS scans are in flight."""
+        import asyncio
+        import os
+        from unittest.mock import patch
+
+        in_flight = {"now": 0, "peak": 0}
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                for i in range(6):
+                    yield repo_scan.repobase.Repo(f"u/r{i}", "https://x/", f"https://x/{i}")
+
+        async def fake_scan(repo, *args, **kwargs):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        class MockArgs:
+            scan = "u"
+            provider = "github"
+            report = os.path.join(temp_dir, "report.md")
+            show = "all"
+            concurrency = 8
+
+        with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan), \
+                patch.object(repo_scan, 'MAX_PENDING_SCANS', 2):
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+
+        assert in_flight["peak"] <= 2
+        with open(MockArgs.report, encoding="UTF-8") as report:
+            assert "| Repos with License | 6 |" in report.read()
+
+    def test_indeterminate_progress_bar(self):
+        """Test the progress bar accepts an unknown total."""
+        repo_scan.update_progress_bar(3, None)
+
+
+class TestScanCacheIntegration:
+    """Tests for reusing cached results in args_scan."""
+
+    def test_unchanged_repo_is_not_rescanned(self, temp_dir):
+        """Test a second scan reuses the cached result of an unchanged repo."""
+        import asyncio
+        import os
+        from unittest.mock import AsyncMock, patch
+        from ghlicense.cache import ScanCache
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                yield repo_scan.repobase.Repo("u/r", "https://x/", "https://x", revision="sha1")
+
+        class MockArgs:
+            scan = "u"
+            provider = "github"
+            report = os.path.join(temp_dir, "report.md")
+            show = "all"
+            cache = True
+
+        cache_path = os.path.join(temp_dir, "cache.sqlite3")
+        with patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.ScanCache',
+                      side_effect=lambda ttl: ScanCache(cache_path, ttl)), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', new_callable=AsyncMock) as mock_loop:
+            mock_loop.return_value = ScanResult("u/r", "https://x", ScanStatus.LICENSED)
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            asyncio.run(repo_scan.args_scan(MockArgs()))
+            assert mock_loop.call_count == 1
+
+        with open(MockArgs.report, encoding="UTF-8") as report:
+            assert "| Repos with License | 1 |" in report.read()
@@ -0,0 +1,172 @@
+"""Tests for scanning an account across worker processes."""
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import queue
+from multiprocessing.dummy import DummyProcess
+from unittest.mock import patch
+
+import pytest
+
+from ghlicense.cache import ScanCache, ValidatorCache
+from ghlicense.scanner import repo_scan, shard
+from ghlicense.scanner.result import ScanResult, ScanStatus
+
+
+class FakeProvider:
+    def __init__(self, username):
+        self.username = username
+
+    async def iter_repos(self):
+        for i in range(20):
+            yield repo_scan.repobase.Repo(f"{self.username}/r{i}", "https://x/", "https://x")
+
+
+class RevisionProvider(FakeProvider):
+    """Provider whose repos have a revision, so their results are cached."""
+
+    async def iter_repos(self):
+        for i in range(60):
+            yield repo_scan.repobase.Repo(f"{self.username}/r{i}", "https://x/", "https://x", revision="sha")
+
+
+def _write_cache(path, worker):
+    """Write scan results and validators the way a shard worker does."""
+    import http.client
+    headers = http.client.HTTPMessage()
+    headers["ETag"] = '"v"'
+    cache, validators = ScanCache(path), ValidatorCache(path)
+    for i in range(150):
+        cache.put("github", f"u/w{worker}-r{i}", "sha", {"status": "licensed"})
+        validators.store(validators.request_key("GET", f"https://x/w{worker}/r{i}"), 200, headers, b"")
+    cache.close()
+    validators.close()
+
+
+class ThreadContext:
+    """Multiprocessing context running the workers as threads."""
+
+    Queue = queue.Queue
+
+    class Process(DummyProcess):
+        def terminate(self):
+            # Every worker of these tests ends on its own
+            pass
+
+
+def _args(temp_dir, workers):
+    class MockArgs:
+        scan = "u"
+        provider = "github"
+        report = os.path.join(temp_dir, "report.jsonl")
+        format = "jsonl"
+        show = "all"
+
+    MockArgs.workers = workers
+    return MockArgs()
+
+
+class TestShardOf:
+    """Tests for shard_of."""
+
+    def test_shard_is_stable_and_in_range(self):
+        """Test a repo always maps to the same worker."""
+        assert shard.shard_of("u/r1", 4) == shard.shard_of("u/r1", 4)
+        assert all(0 <= shard.shard_of(f"u/r{i}", 4) < 4 for i in range(100))
+
+    def test_repos_are_spread(self):
+        """Test every worker gets a share of the repos."""
+        assert {shard.shard_of(f"u/r{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+
+class TestShardedScan:
+    """Tests for scan_sharded, with threads standing in for the worker processes."""
+
+    def test_results_are_merged_into_one_report(self, temp_dir):
+        """Test every repo is scanned once and the report has correct totals."""
+        scanned = []
+
+        async def fake_scan(repo, *args, **kwargs):
+            scanned.append(repo.full_name)
+            licensed = int(repo.full_name.split("/r")[1]) % 2 == 0
+            return ScanResult(repo.full_name, repo.repo_url,
+                              ScanStatus.LICENSED if licensed else ScanStatus.UNLICENSED)
+
+        args = _args(temp_dir, 3)
+        with patch('ghlicense.scanner.shard._context', return_value=ThreadContext), \
+                patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+            asyncio.run(repo_scan.args_scan(args))
+
+        assert sorted(scanned) == sorted(f"u/r{i}" for i in range(20))
+        with open(args.report, encoding="UTF-8") as report_file:
+            records = [json.loads(line) for line in report_file]
+        assert len(records) == 20
+        assert sum(record["status"] == "licensed" for record in records) == 10
+
+    def test_worker_failure_aborts_the_scan(self, temp_dir):
+        """Test an error in a worker fails the scan instead of hanging it."""
+
+        async def failing_scan(repo, *args, **kwargs):
+            raise ValueError("boom")
+
+        with patch('ghlicense.scanner.shard._context', return_value=ThreadContext), \
+                patch('ghlicense.scanner.shard.QUEUE_POLL_INTERVAL', 0.05), \
+                patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=failing_scan):
+            with pytest.raises(RuntimeError, match="boom"):
+                asyncio.run(repo_scan.args_scan(_args(temp_dir, 2)))
+
+    def test_workers_share_the_scan_cache(self, temp_dir):
+        """Test workers writing to one cache file do not lock each other out."""
+        async def fake_scan(repo, *args, **kwargs):
+            await asyncio.sleep(0)
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        args = _args(temp_dir, 3)
+        args.cache = True
+        with patch('ghlicense.scanner.shard._context', return_value=ThreadContext), \
+                patch('ghlicense.scanner.repo_scan.ScanCache', functools.partial(ScanCache, path)), \
+                patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=RevisionProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+            asyncio.run(repo_scan.args_scan(args))
+
+        cache = ScanCache(path)
+        assert cache.stats()["entries"] == 60
+        cache.close()
+
+    def test_cache_is_cleared_once(self, temp_dir):
+        """Test --clear-cache clears the shared cache in the parent only, not in every worker."""
+        async def fake_scan(repo, *args, **kwargs):
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        args = _args(temp_dir, 3)
+        args.cache = True
+        args.clear_cache = True
+        with patch('ghlicense.scanner.shard._context', return_value=ThreadContext), \
+                patch('ghlicense.scanner.repo_scan.ScanCache', functools.partial(ScanCache, path)), \
+                patch.object(ValidatorCache, 'clear', autospec=True) as clear, \
+                patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=RevisionProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+            asyncio.run(repo_scan.args_scan(args))
+
+        assert clear.call_count == 1
+        assert args.clear_cache
+
+    def test_processes_share_the_scan_cache(self, temp_dir):
+        """Test worker processes writing to one cache file at once all succeed."""
+        path = os.path.join(temp_dir, "cache.sqlite3")
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_write_cache, args=(path, worker)) for worker in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+        assert [process.exitcode for process in processes] == [0, 0, 0]
+        cache = ScanCache(path)
+        assert cache.stats()["entries"] == 450
+        cache.close()
@@ -0,0 +1,291 @@
+"""Tests for the work queues of distributed scans."""
+import asyncio
+import os
+from unittest.mock import patch
+
+import pytest
+
+from ghlicense.scanner import repo_scan
+from ghlicense.scanner.result import ScanResult, ScanStatus
+from ghlicense.workqueue import RedisWorkQueue, SQLiteWorkQueue, open_work_queue
+from ghlicense.workqueue.redis import CLAIM_SCRIPT, COMPLETE_SCRIPT, PUSH_SCRIPT
+
+try:
+    # fakeredis runs the queue's Lua scripts when installed with its lua extra
+    import fakeredis
+    import lupa  # noqa: F401
+    HAS_REDIS_LUA = True
+except ImportError:
+    HAS_REDIS_LUA = False
+
+
+class FakeRedis:
+    """In-process stand-in for the Redis commands and scripts the queue uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.scripts_run = 0
+
+    def hmget(self, name, keys):
+        return [self.data.get(name, {}).get(key) for key in keys]
+
+    def hlen(self, name):
+        return len(self.data.get(name, {}))
+
+    def lrange(self, name, start, end):
+        values = self.data.get(name, [])
+        return values[start:] if end == -1 else values[start:end + 1]
+
+    def scard(self, name):
+        return len(self.data.get(name, set()))
+
+    def set(self, name, value):
+        self.data[name] = value
+
+    def get(self, name):
+        return self.data.get(name)
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def close(self):
+        pass
+
+    def register_script(self, script):
+        """Return a script of the queue, run in one step like Redis runs a script."""
+        run = {PUSH_SCRIPT: self._push, CLAIM_SCRIPT: self._claim, COMPLETE_SCRIPT: self._complete}[script]
+
+        def call(keys, args):
+            self.scripts_run += 1
+            return run(*keys, *args)
+
+        return call
+
+    def _push(self, items, pending, *args):
+        stored = self.data.setdefault(items, {})
+        for key, payload in zip(args[::2], args[1::2]):
+            if key not in stored:
+                stored[key] = payload
+                self.data.setdefault(pending, []).append(key)
+
+    def _claim(self, pending, leases, done, now, expiry, count):
+        queued = self.data.setdefault(pending, [])
+        leased = self.data.setdefault(leases, {})
+        for key, score in sorted(leased.items(), key=lambda item: item[1]):
+            if score <= now:
+                del leased[key]
+                queued.append(key)
+        claimed = []
+        while queued and len(claimed) < count:
+            key = queued.pop(0)
+            if key not in self.data.get(done, set()):
+                leased[key] = expiry
+                claimed.append(key)
+        return claimed
+
+    def _complete(self, done, results, leases, key, result):
+        finished = self.data.setdefault(done, set())
+        first = key not in finished
+        if first:
+            finished.add(key)
+            self.data.setdefault(results, []).append(result)
+        self.data.get(leases, {}).pop(key, None)
+        return int(first)
+
+
+@pytest.fixture(params=["sqlite", "redis", "redis-lua"])
+def work_queue(request, temp_dir):
+    """A work queue of each backend; redis-lua runs the real scripts."""
+    if request.param == "sqlite":
+        queue = SQLiteWorkQueue(os.path.join(temp_dir, "queue.sqlite3"), "github:u")
+    elif request.param == "redis":
+        queue = RedisWorkQueue(FakeRedis(), "github:u")
+    else:
+        if not HAS_REDIS_LUA:
+            pytest.skip("fakeredis[lua] not installed")
+        queue = RedisWorkQueue(fakeredis.FakeRedis(decode_responses=True), "github:u")
+    yield queue
+    queue.close()
+
+
+class TestWorkQueue:
+    """Tests for the work queue contract, run against every backend."""
+
+    def test_claim_hands_out_each_item_once(self, work_queue):
+        """Test two workers never get the same item."""
+        work_queue.push([("u/a", {"n": 1}), ("u/b", {"n": 2}), ("u/c", {"n": 3})])
+        first = work_queue.claim("w1", 2)
+        second = work_queue.claim("w2", 2)
+        assert first == [("u/a", {"n": 1}), ("u/b", {"n": 2})]
+        assert second == [("u/c", {"n": 3})]
+        assert work_queue.claim("w3", 2) == []
+
+    def test_duplicate_push_is_ignored(self, work_queue):
+        """Test a repo queued twice is scanned once."""
+        work_queue.push([("u/a", {})])
+        work_queue.push([("u/a", {})])
+        assert len(work_queue.claim("w1", 10)) == 1
+        assert work_queue.outstanding() == 1
+
+    def test_expired_lease_is_claimed_again(self, work_queue):
+        """Test the repos of a crashed worker go to the next worker."""
+        work_queue.push([("u/a", {})])
+        assert work_queue.claim("crashed", 1, lease=-1)
+        assert work_queue.claim("w2", 1) == [("u/a", {})]
+
+    def test_live_lease_is_kept(self, work_queue):
+        """Test a repo under a valid lease is not handed out."""
+        work_queue.push([("u/a", {})])
+        work_queue.claim("w1", 1, lease=60)
+        assert work_queue.claim("w2", 1) == []
+
+    def test_results_and_outstanding(self, work_queue):
+        """Test completed results are read back from a position."""
+        work_queue.push([("u/a", {}), ("u/b", {})])
+        work_queue.claim("w1", 2)
+        assert work_queue.complete("u/a", {"repo": "u/a"})
+        rows = work_queue.results()
+        assert [result for _, result in rows] == [{"repo": "u/a"}]
+        assert work_queue.outstanding() == 1
+        work_queue.complete("u/b", {"repo": "u/b"})
+        assert [result for _, result in work_queue.results(rows[-1][0])] == [{"repo": "u/b"}]
+        assert work_queue.outstanding() == 0
+
+    def test_late_completion_keeps_first_result(self, work_queue):
+        """Test a repo completed by two workers after a lease expiry is reported once."""
+        work_queue.push([("u/a", {})])
+        work_queue.claim("slow", 1, lease=-1)
+        work_queue.claim("w2", 1)
+        assert work_queue.complete("u/a", {"by": "w2"})
+        assert not work_queue.complete("u/a", {"by": "slow"})
+        assert [result for _, result in work_queue.results()] == [{"by": "w2"}]
+
+    def test_seal_and_clear(self, work_queue):
+        """Test sealing is recorded and clearing empties the queue."""
+        work_queue.push([("u/a", {})])
+        assert not work_queue.sealed()
+        work_queue.seal()
+        assert work_queue.sealed()
+        work_queue.clear()
+        assert not work_queue.sealed()
+        assert work_queue.outstanding() == 0
+
+
+class TestRedisWorkQueue:
+    """Tests specific to the Redis work queue."""
+
+    def test_writes_are_one_script_call_each(self):
+        """Test a push, a claim and a completion each run as a single atomic script."""
+        client = FakeRedis()
+        queue = RedisWorkQueue(client, "github:u")
+        queue.push([("u/a", {}), ("u/b", {}), ("u/c", {})])
+        queue.claim("w1", 2, lease=-1)
+        assert [key for key, _ in queue.claim("w2", 3)] == ["u/c", "u/a", "u/b"]
+        assert queue.complete("u/a", {})
+        assert client.scripts_run == 4
+
+
+class TestOpenWorkQueue:
+    """Tests for open_work_queue."""
+
+    def test_file_path_is_sqlite(self, temp_dir):
+        """Test a path and an sqlite:// URL open an SQLite queue."""
+        path = os.path.join(temp_dir, "queue.sqlite3")
+        for url in (path, "sqlite://" + path):
+            queue = open_work_queue(url, "github:u")
+            assert isinstance(queue, SQLiteWorkQueue) and queue.path == path
+            queue.close()
+
+
+class TestDistributedScan:
+    """Tests for a coordinator and workers sharing a queue."""
+
+    def test_coordinator_and_workers_scan_every_repo(self, temp_dir):
+        """Test the workers scan the queued repos and the coordinator reports them all."""
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                for i in range(30):
+                    yield repo_scan.repobase.Repo(f"u/r{i}", "https://x/", "https://x", fork=i == 3)
+
+        scanned = []
+
+        async def fake_scan(repo, *args, **kwargs):
+            scanned.append(repo.full_name)
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.UNLICENSED, fork=repo.fork)
+
+        queue_path = os.path.join(temp_dir, "queue.sqlite3")
+
+        def make_args(role):
+            class MockArgs:
+                scan = "u"
+                provider = "github"
+                report = os.path.join(temp_dir, "report.md")
+                show = "all"
+                queue = queue_path
+
+            MockArgs.role = role
+            return MockArgs()
+
+        async def run():
+            await asyncio.gather(repo_scan.args_scan(make_args("coordinator")),
+                                 repo_scan.args_scan(make_args("worker")),
+                                 repo_scan.args_scan(make_args("worker")))
+
+        with patch('ghlicense.scanner.distributed.QUEUE_POLL_INTERVAL', 0.01), \
+                patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+            asyncio.run(run())
+
+        assert sorted(scanned) == sorted(f"u/r{i}" for i in range(30))
+        with open(os.path.join(temp_dir, "report.md"), encoding="UTF-8") as report_file:
+            text = report_file.read()
+        assert "| Total Repos | 30 |" in text
+        assert "| Forked without License | 1 |" in text
+
+    def test_only_the_coordinator_clears_the_cache(self, temp_dir):
+        """Test workers started with --clear-cache leave the shared cache to the coordinator."""
+        import functools
+        from ghlicense.cache import ScanCache, ValidatorCache
+
+        class FakeProvider:
+            def __init__(self, username):
+                pass
+
+            async def iter_repos(self):
+                for i in range(5):
+                    yield repo_scan.repobase.Repo(f"u/r{i}", "https://x/", "https://x", revision="sha")
+
+        async def fake_scan(repo, *args, **kwargs):
+            return ScanResult(repo.full_name, repo.repo_url, ScanStatus.LICENSED)
+
+        def make_args(role):
+            class MockArgs:
+                scan = "u"
+                provider = "github"
+                report = os.path.join(temp_dir, "report.md")
+                show = "all"
+                queue = os.path.join(temp_dir, "queue.sqlite3")
+                cache = True
+                clear_cache = True
+
+            MockArgs.role = role
+            return MockArgs()
+
+        async def run():
+            await asyncio.gather(repo_scan.args_scan(make_args("coordinator")),
+                                 repo_scan.args_scan(make_args("worker")),
+                                 repo_scan.args_scan(make_args("worker")))
+
+        cache_path = os.path.join(temp_dir, "cache.sqlite3")
+        with patch('ghlicense.scanner.distributed.QUEUE_POLL_INTERVAL', 0.01), \
+                patch('ghlicense.scanner.repo_scan.ScanCache', functools.partial(ScanCache, cache_path)), \
+                patch.object(ValidatorCache, 'clear', autospec=True) as clear, \
+                patch('ghlicense.scanner.repo_scan.repobase.get_provider', return_value=FakeProvider), \
+                patch('ghlicense.scanner.repo_scan.loop_repo_scan', side_effect=fake_scan):
+            asyncio.run(run())
+
+        assert clear.call_count == 1